@@ -6,6 +6,8 @@ from . import core
 from . import cluster
 from . import graph
 from . import naive_bayes
+from . import preprocessing
 from . import regression
+from . import sparse
 from . import spatial
 from . import utils
@@ -1,4 +1,8 @@
+import torch
+
 import heat as ht
+from heat.core._operations import _searchsorted
+from heat.core.communication import _alltoallv, _exchange
 
 
 class KNN(ht.ClassificationMixin, ht.BaseEstimator):
@@ -22,13 +26,18 @@ class KNN(ht.ClassificationMixin, ht.BaseEstimator):
         Number of neighbours to consider when choosing label
     is_one_hot: bool
         Whether y is a label array or in one-hot-encoding
+    index: ht.spatial.NearestNeighbors or ht.spatial.LSHIndex, optional
+        Unfitted index used to find the neighbours, e.g. an LSHIndex for approximate predictions.
+        Defaults to an exact NearestNeighbors index.
+    batch_size: int, optional
+        Number of local queries predicted at once, bounds the memory of the neighbours and votes. Default: 1024
     References
     --------
     [1] T. Cover and P. Hart, "Nearest neighbor pattern classification," in IEEE Transactions on Information Theory,
         vol. 13, no. 1, pp. 21-27, January 1967, doi: 10.1109/TIT.1967.1053964.
     """
 
-    def __init__(self, x, y, num_neighbours, is_one_hot=False):
+    def __init__(self, x, y, num_neighbours, is_one_hot=False, index=None, batch_size=1024):
 
         if x.shape[0] != y.shape[0]:
             raise ValueError(
@@ -49,6 +58,10 @@ class KNN(ht.ClassificationMixin, ht.BaseEstimator):
                 )
             )
         self.num_neighbours = num_neighbours
+        self.index = ht.spatial.NearestNeighbors(num_neighbours) if index is None else index
+        self.batch_size = batch_size
+        self._fitted = False
+        self._labels = None
 
     def fit(self, X, Y):
         """
@@ -69,6 +82,8 @@ class KNN(ht.ClassificationMixin, ht.BaseEstimator):
             )
 
         self.x = X
+        self._fitted = False
+        self._labels = None
         if len(Y.shape) == 1:
             self.y = self.label_to_one_hot(Y)
         elif len(Y.shape) == 2:
@@ -82,30 +97,102 @@ class KNN(ht.ClassificationMixin, ht.BaseEstimator):
 
     def predict(self, X) -> ht.dndarray:
         """
+        Predicts the labels of X in batches of the local queries. The neighbours of a batch are found with the
+        distributed index, their labels are requested from the processes holding them and the votes are
+        counted locally, the labels of the training data are never gathered.
+
         Parameters
         ----------
         X : ht.DNDarray
             Input data to be predicted
         """
+        if not isinstance(self.batch_size, int) or self.batch_size < 1:
+            raise ValueError(
+                "batch_size needs to be a positive int, but was {}".format(self.batch_size)
+            )
 
-        distances = ht.spatial.cdist(X, self.x)
-        _, indices = ht.topk(distances, self.num_neighbours, largest=False)
+        # the neighbours are found with a distributed index, built on the first prediction
+        if not self._fitted:
+            self.index.fit(self.x)
+            self._labels = self.__local_labels()
+            self._fitted = True
+
+        comm = X.comm
+        queries = X._DNDarray__array
+        n_classes = self.y.shape[1]
+        n_batches = (queries.shape[0] + self.batch_size - 1) // self.batch_size
+        if X.split is not None and comm.is_distributed():
+            # the queries are collective, processes with fewer queries query empty batches
+            n_batches = comm.allreduce(n_batches, ht.communication.MPI.MAX)
+
+        predictions = torch.empty(queries.shape[0], dtype=torch.int64, device=queries.device)
+        for start in range(0, n_batches * self.batch_size, self.batch_size):
+            batch = queries[start : start + self.batch_size]
+            batch = ht.array(batch, is_split=X.split, device=X.device, comm=comm)
+            indices = self.index.kneighbors(batch, self.num_neighbours, return_distance=False)
+            indices = indices._DNDarray__array
+
+            # approximate indices may miss neighbours, marked by -1, which do not vote
+            found = indices >= 0
+            labels = torch.zeros_like(indices)
+            labels[found] = self.__lookup(indices[found])
+            votes = torch.zeros(
+                (indices.shape[0], n_classes), dtype=torch.int64, device=indices.device
+            )
+            votes.scatter_add_(1, labels, found.long())
+            predictions[start : start + indices.shape[0]] = votes.argmax(dim=1)
 
-        labels = self.y[indices.flatten()]
-        labels.balance_()
-        labels = ht.reshape(labels, (indices.gshape + (self.y.gshape[1],)))
-        labels = ht.sum(labels, axis=1)
-        maximums = ht.argmax(labels, axis=1)
+        return ht.array(predictions, is_split=X.split, device=X.device, comm=comm)
 
-        return maximums
+    def __local_labels(self):
+        """
+        Class indices of the local training samples, distributed like the rows of x.
+        """
+        y = self.y
+        if self.x.split is None:
+            if y.split is not None:
+                y = ht.resplit(y, axis=None)
+        else:
+            counts = self.x.create_lshape_map()[:, :1]
+            if y.split is None:
+                offset = counts[: self.x.comm.rank].sum().item()
+                return y._DNDarray__array[offset : offset + self.x.lshape[0]].argmax(dim=1)
+            if y.split != 0:
+                y = ht.resplit(y, axis=0)
+            lshape_map = y.create_lshape_map()
+            if not torch.equal(lshape_map[:, :1], counts):
+                y = y.copy()
+                target_map = torch.cat((counts, lshape_map[:, 1:]), dim=1)
+                y.redistribute_(lshape_map=lshape_map, target_map=target_map)
+        return y._DNDarray__array.argmax(dim=1)
+
+    def __lookup(self, indices):
+        """
+        Class indices of the training samples at the given global indices, requested from the processes holding
+        them.
+        """
+        comm = self.x.comm
+        if self.x.split is None or not comm.is_distributed():
+            return self._labels[indices]
+
+        bounds = self.x.create_lshape_map()[:, 0].to(indices.device).long().cumsum(0)
+        owners = _searchsorted(bounds, indices, right=True)
+        (requested,), order, send_counts, recv_counts = _exchange(comm, owners, indices)
+        requested -= bounds[comm.rank] - self.x.lshape[0]
+        # the labels arrive in the order the requests were sent
+        reply = _alltoallv(comm, self._labels[requested], recv_counts, send_counts)
+        labels = torch.empty_like(reply)
+        labels[order] = reply
+        return labels
 
     @staticmethod
     def label_to_one_hot(a):
-        max_label = ht.max(a)
-        a = a.expand_dims(1)
-
-        items = ht.arange(0, max_label.item() + 1)
-        one_hot = ht.stack([items for i in range(a.shape[0])], axis=0)
-        one_hot = ht.where(one_hot == a, 1, 0)
+        """
+        One-hot encoding of the label array a with the classes 0 to max(a), distributed like a.
+        """
+        n_classes = ht.max(a).item() + 1
+        labels = a._DNDarray__array.long()
+        one_hot = torch.zeros((labels.shape[0], n_classes), dtype=torch.int64, device=labels.device)
+        one_hot.scatter_(1, labels.unsqueeze(1), 1)
 
-        return one_hot
+        return ht.array(one_hot, is_split=a.split, device=a.device, comm=a.comm)
@@ -116,3 +116,45 @@ class TestKNN(TestCase):
         self.assertTrue(ht.is_classifier(knn))
         self.assertIsInstance(result, ht.DNDarray)
         self.assertEqual(result.shape, labels.shape)
+
+    def test_approximate(self,):
+        X = ht.load_hdf5("heat/datasets/data/iris.h5", dataset="data", split=0)
+        Y = ht.array([0] * 50 + [1] * 50 + [2] * 50, split=0)
+
+        # the hyperplanes of the index are drawn from the global random state
+        ht.random.seed(1)
+        index = ht.spatial.LSHIndex(n_tables=8, n_bits=3, n_probes=1)
+        knn = KNN(X, Y, 5, index=index)
+        self.assertIs(knn.index, index)
+
+        result = knn.predict(X)
+
+        self.assertIsInstance(result, ht.DNDarray)
+        self.assertEqual(result.shape, Y.shape)
+        self.assertGreater((result == Y).sum().item(), 120)
+
+    def test_batches(self,):
+        X = ht.load_hdf5("heat/datasets/data/iris.h5", dataset="data", split=0)
+        Y = ht.array([0] * 50 + [1] * 50 + [2] * 50, split=0)
+
+        knn = KNN(X, Y, 5)
+        result = knn.predict(X)
+        self.assertEqual(result.split, 0)
+        self.assertGreater((result == Y).sum().item(), 140)
+
+        # the prediction does not depend on the batch size or the distribution of the labels
+        knn = KNN(X, ht.resplit(Y, None), 5, batch_size=7)
+        self.assertTrue(ht.equal(knn.predict(X), result))
+        self.assertTrue(ht.equal(knn.predict(ht.resplit(X, None)), ht.resplit(result, None)))
+
+        with self.assertRaises(ValueError):
+            KNN(X, Y, 5, batch_size=0).predict(X)
+
+    def test_one_hot_split(self,):
+        a = ht.array([2, 0, 1, 2, 0], split=0)
+        one_hot = KNN.label_to_one_hot(a)
+
+        self.assertEqual(one_hot.shape, (5, 3))
+        self.assertEqual(one_hot.split, 0)
+        self.assertTrue(ht.equal(ht.argmax(one_hot, axis=1), a))
+        self.assertTrue((one_hot.sum(axis=1) == 1).all())
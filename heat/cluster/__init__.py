@@ -3,3 +3,5 @@ from .kmeans import *
 from .kmedians import *
 from .kmedoids import *
 from .spectral import *
+from .dbscan import *
+from .minibatchkmeans import *
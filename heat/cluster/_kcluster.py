@@ -1,4 +1,8 @@
+import math
+import torch
+
 import heat as ht
+from heat.core._operations import _searchsorted
 
 
 class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
@@ -8,13 +12,14 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
 
     Parameters
     ----------
-    metric : function
-        One of the distance metrics in ht.spatial.distance. Needs to be passed as lambda function to take only two arrays as input
+    metric : str or function
+        Distance metric passed to ht.spatial.pairwise_reduce, one of "euclidean", "sqeuclidean" or "manhattan", or a
+        function computing the distance matrix of two 2D torch tensors
     n_clusters : int
         The number of clusters to form as well as the number of centroids to generate.
     init : str or DNDarray
         Method for initialization, defaults to ‘random’:
-            - ‘probability_based’ : selects initial cluster centers for the clustering in a smart way to speed up convergence (k-means++) \n
+            - ‘probability_based’ : selects initial cluster centers for the clustering in a smart way to speed up convergence (k-means||) \n
             - ‘random’: choose k observations (rows) at random from data for the initial centroids. \n
             - ``DNDarray``: gives the initial centers, should be of Shape = (n_clusters, n_features)
     max_iter : int
@@ -67,7 +72,7 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
         """
         return self._n_iter
 
-    def _initialize_cluster_centers(self, X):
+    def _initialize_cluster_centers(self, X, reseed=True):
         """
         Initializes the K-Means centroids.
 
@@ -75,9 +80,12 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
         ----------
         X : DNDarray,
             The data to initialize the clusters for. Shape = (n_point, n_features)
+        reseed : bool, optional
+            Whether to seed the random number generator with random_state, successive initializations
+            without reseeding differ from each other
         """
         # always initialize the random state
-        if self.random_state is not None:
+        if reseed and self.random_state is not None:
             ht.random.seed(self.random_state)
 
         # initialize the centroids by randomly picking some of the points
@@ -127,59 +135,35 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
                 raise ValueError("passed centroids do not match cluster count or data shape")
             self._cluster_centers = self.init.resplit(None)
 
-        # smart centroid guessing, random sampling with probability weight proportional to distance to existing centroids
+        # smart centroid guessing with k-means||, oversampling proportional to the squared distance
+        # to the existing candidates followed by a weighted k-means++ on the candidates
         elif self.init == "probability_based":
-            datatype = ht.promote_types(X.dtype, ht.float32)
-            if X.split is None or X.split == 0:
-                centroids = ht.zeros(
-                    (self.n_clusters, X.shape[1]),
-                    split=None,
-                    dtype=datatype,
-                    device=X.device,
-                    comm=X.comm,
-                )
-                sample = ht.random.randint(0, X.shape[0] - 1).item()
-                _, displ, _ = X.comm.counts_displs_shape(shape=X.shape, axis=0)
-                proc = 0
-                for p in range(X.comm.size):
-                    if displ[p] > sample:
-                        break
-                    proc = p
-                x0 = ht.zeros(X.shape[1], dtype=X.dtype, device=X.device, comm=X.comm)
-                if X.comm.rank == proc:
-                    idx = sample - displ[proc]
-                    x0 = ht.array(X.lloc[idx, :], device=X.device, comm=X.comm)
-                x0.comm.Bcast(x0, root=proc)
-                centroids[0, :] = x0
-                for i in range(1, self.n_clusters):
-                    distances = self._metric(X, centroids)
-                    D2 = distances.min(axis=1)
-                    D2.resplit_(axis=None)
-                    prob = D2 / D2.sum()
-                    x = ht.random.rand().item()
-                    sample = 0
-                    sum = 0
-                    for j in range(len(prob)):
-                        if sum > x:
-                            break
-                        sum += prob[j].item()
-                        sample = j
-                    proc = 0
-                    for p in range(X.comm.size):
-                        if displ[p] > sample:
-                            break
-                        proc = p
-                    xi = ht.zeros(X.shape[1], dtype=X.dtype)
-                    if X.comm.rank == proc:
-                        idx = sample - displ[proc]
-                        xi = ht.array(X.lloc[idx, :], device=X.device, comm=X.comm)
-                    xi.comm.Bcast(xi, root=proc)
-                    centroids[i, :] = xi
-
-            else:
+            if X.split is not None and X.split != 0:
                 raise NotImplementedError("Not implemented for other splitting-axes")
-
-            self._cluster_centers = centroids
+            datatype = ht.promote_types(X.dtype, ht.float32)
+            points = X._DNDarray__array.to(datatype.torch_type())
+
+            # the first candidate is drawn uniformly, every round draws 2 * k more
+            candidates = _weighted_samples(X, points, torch.ones_like(points[:, 0]), 1)
+            distances = self.__squared_distances(X, candidates)
+            for _ in range(math.ceil(math.log2(self.n_clusters)) + 1):
+                drawn = _weighted_samples(X, points, distances, 2 * self.n_clusters)
+                if drawn.shape[0] == 0:
+                    break
+                candidates = torch.cat((candidates, drawn))
+                distances = torch.min(distances, self.__squared_distances(X, drawn))
+
+            # every candidate is weighted by the number of points closest to it
+            closest = ht.spatial.pairwise_reduce(
+                X, ht.array(candidates, device=X.device, comm=X.comm), self._metric, "argmin"
+            )._DNDarray__array
+            weights = torch.bincount(closest, minlength=candidates.shape[0]).to(candidates.dtype)
+            if X.split == 0 and X.comm.is_distributed():
+                X.comm.Allreduce(ht.MPI.IN_PLACE, weights, ht.MPI.SUM)
+
+            self._cluster_centers = ht.array(
+                self.__recluster(candidates, weights), device=X.device, comm=X.comm
+            )
 
         else:
             raise ValueError(
@@ -188,6 +172,35 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
                 )
             )
 
+    def __squared_distances(self, X, candidates):
+        """
+        Squared distances of the local data points to their closest candidate.
+        """
+        candidates = ht.array(candidates, device=X.device, comm=X.comm)
+        return ht.spatial.pairwise_reduce(X, candidates, self._metric, "min")._DNDarray__array ** 2
+
+    def __recluster(self, candidates, weights):
+        """
+        Selects n_clusters of the weighted candidates with k-means++. The candidates and random
+        numbers are identical on all processes, so are the selected centroids.
+        """
+        uniform = ht.random.rand(self.n_clusters, dtype=ht.float64)._DNDarray__array
+        candidates_ht = ht.array(candidates)
+        distances = torch.ones_like(weights)
+        chosen = []
+        for i in range(self.n_clusters):
+            cumulative = (weights * distances).double().cumsum(0)
+            threshold = uniform[i : i + 1].to(cumulative.device) * cumulative[-1]
+            index = _searchsorted(cumulative, threshold, right=True)
+            index = index.clamp(max=candidates.shape[0] - 1).item()
+            chosen.append(index)
+            distance = ht.spatial.pairwise_reduce(
+                candidates_ht, candidates_ht[index : index + 1], self._metric, "min"
+            )._DNDarray__array
+            distances = distance ** 2 if i == 0 else torch.min(distances, distance ** 2)
+
+        return candidates[chosen]
+
     def _assign_to_cluster(self, X):
         """
         Assigns the passed data points to the centroids based on the respective metric
@@ -197,11 +210,137 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
         X : DNDarray
             Data points, Shape = (n_samples, n_features)
         """
-        # calculate the distance matrix and determine the closest centroid
-        distances = self._metric(X, self._cluster_centers)
-        matching_centroids = distances.argmin(axis=1, keepdim=True)
+        # determine the closest centroid without materializing the distance matrix
+        matching_centroids = ht.spatial.pairwise_reduce(
+            X, self._cluster_centers, self._metric, reduction="argmin"
+        )
+
+        return matching_centroids.expand_dims(1)
+
+    def _accumulate_centroids(self, X, matching_centroids, sample_weight=None):
+        """
+        Sums the (weighted) data points assigned to each centroid and their total weight. The local
+        points are accumulated with a single scatter-add, the partial sums of all processes are
+        combined with a single Allreduce.
+
+        Parameters
+        ----------
+        X : DNDarray
+            Data points, Shape = (n_samples, n_features)
+        matching_centroids : DNDarray
+            Index array of assigned centroids, distributed like X
+        sample_weight : DNDarray, optional
+            Weight of each data point, Shape = (n_samples,), distributed like X, defaults to 1
+
+        Returns
+        -------
+        sums : torch.Tensor
+            Shape = (n_clusters, n_features + 1), the weighted sums of the assigned points followed
+            by their total weight, identical on all processes
+        """
+        datatype = ht.promote_types(X.dtype, ht.float32).torch_type()
+        points = X._DNDarray__array.to(datatype)
+        weighted = torch.cat(
+            (points, torch.ones((points.shape[0], 1), dtype=datatype, device=points.device)), dim=1
+        )
+        if sample_weight is not None:
+            weighted *= sample_weight._DNDarray__array.to(datatype).reshape(-1, 1)
+
+        sums = torch.zeros((self.n_clusters, X.shape[1] + 1), dtype=datatype, device=points.device)
+        sums.index_add_(0, matching_centroids._DNDarray__array.reshape(-1).long(), weighted)
+        if X.split == 0 and X.comm.is_distributed():
+            X.comm.Allreduce(ht.MPI.IN_PLACE, sums, ht.MPI.SUM)
+
+        return sums
+
+    def _grouped_median(self, X, matching_centroids):
+        """
+        Medians of the features of the data points assigned to each centroid, selected for all
+        centroids and features at once. Every round, each process proposes the local median of the
+        values still in question, the weighted median of all proposals becomes the pivot and the
+        global rank of the pivot narrows down the values in question. A round costs one Allgather and
+        one Allreduce independent of the number of clusters, the number of rounds is logarithmic in
+        the number of points.
+
+        Parameters
+        ----------
+        X : DNDarray
+            Data points, Shape = (n_samples, n_features)
+        matching_centroids : DNDarray
+            Index array of assigned centroids, distributed like X
+
+        Returns
+        -------
+        medians : torch.Tensor
+            Shape = (n_clusters, n_features), the mean of the two middle values for even counts,
+            identical on all processes
+        counts : torch.Tensor
+            Shape = (n_clusters,), the number of points assigned to each centroid
+        """
+        datatype = ht.promote_types(X.dtype, ht.float32).torch_type()
+        points = X._DNDarray__array.to(datatype)
+        labels = matching_centroids._DNDarray__array.reshape(-1).long()
+        n, k = points.shape[0], self.n_clusters
+        distributed = X.split == 0 and X.comm.is_distributed()
+
+        local_counts = torch.bincount(labels, minlength=k)
+        counts = local_counts.clone()
+        if distributed:
+            X.comm.Allreduce(ht.MPI.IN_PLACE, counts, ht.MPI.SUM)
+
+        # the local values of each cluster form a contiguous segment, sorted per feature
+        values, order = points.sort(dim=0)
+        positions = torch.arange(n, device=order.device).unsqueeze(1)
+        _, grouping = (labels[order] * n + positions).sort(dim=0)
+        values = values.gather(0, grouping)
+        starts = (local_counts.cumsum(0) - local_counts).view(1, k, 1)
+
+        def below(bounds, inclusive):
+            # number of local values of each cluster and feature below the bounds
+            bounds = bounds[:, labels]
+            compare = points <= bounds if inclusive else points < bounds
+            result = torch.zeros(bounds.shape[:1] + (k,) + bounds.shape[2:], dtype=torch.int64)
+            return result.to(points.device).index_add_(1, labels, compare.long())
+
+        # the lower and upper middle rank of every cluster and feature
+        ranks = torch.stack(((counts - 1) // 2, counts // 2)).unsqueeze(2)
+        ranks = ranks.expand(2, k, X.shape[1])
+        lower = torch.full(ranks.shape, -float("inf"), dtype=datatype, device=points.device)
+        upper = torch.full_like(lower, float("inf"))
+        selected = torch.zeros_like(lower)
+        done = (counts == 0).view(1, k, 1).expand_as(lower).clone()
+        while not done.all():
+            first, last = below(lower, True), below(upper, False)
+            weights = torch.where(done, torch.zeros_like(first), last - first)
+            middle = (starts + (first + last) // 2).clamp(0, max(0, n - 1))
+            proposals = torch.zeros_like(lower)
+            if n > 0:
+                proposals = values.gather(0, middle.reshape(2 * k, -1)).reshape(lower.shape)
+            packed = torch.stack((proposals.double(), weights.double()))
+            if distributed:
+                gathered = torch.empty(
+                    (X.comm.size,) + packed.shape, dtype=packed.dtype, device=packed.device
+                )
+                X.comm.Allgather(packed, gathered)
+            else:
+                gathered = packed.unsqueeze(0)
+
+            # weighted median of the proposals
+            proposals, order = gathered[:, 0].sort(dim=0)
+            weights = gathered[:, 1].gather(0, order).cumsum(0)
+            pick = (weights < weights[-1:] / 2).sum(dim=0, keepdim=True)
+            pivot = proposals.gather(0, pick.clamp(max=gathered.shape[0] - 1))[0].to(datatype)
 
-        return matching_centroids
+            ranked = torch.stack((below(pivot, False), below(pivot, True)))
+            if distributed:
+                X.comm.Allreduce(ht.MPI.IN_PLACE, ranked, ht.MPI.SUM)
+            found = ~done & (ranked[0] <= ranks) & (ranks < ranked[1])
+            selected = torch.where(found, pivot, selected)
+            upper = torch.where(~done & (ranks < ranked[0]), pivot, upper)
+            lower = torch.where(~done & (ranks >= ranked[1]), pivot, lower)
+            done = done | found
+
+        return selected.mean(dim=0), counts
 
     def _update_centroids(self, X, matching_centroids):
         """
@@ -219,7 +358,7 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
 
     def fit(self, X):
         """
-       Computes the centroid of the clustering algorithm to fit the data X. The full pipeline is algorithm specific.
+        Computes the centroid of the clustering algorithm to fit the data X. The full pipeline is algorithm specific.
 
         Parameters
         ----------
@@ -240,10 +379,47 @@ class _KCluster(ht.ClusteringMixin, ht.BaseEstimator):
         ----------
         X : DNDarray
             New data to predict. Shape = (n_samples, n_features)
-       """
+        """
         # input sanitation
         if not isinstance(X, ht.DNDarray):
             raise ValueError("input needs to be a ht.DNDarray, but was {}".format(type(X)))
 
         # determine the centroids
         return self._assign_to_cluster(X)
+
+
+def _weighted_samples(X, points, weights, n):
+    """
+    Draws n of the local points with replacement and probabilities proportional to their weights
+    across all processes. Each process locates the random thresholds falling into its share of the
+    global prefix sum of the weights, the drawn points are gathered on all processes.
+    """
+    comm = X.comm
+    cumulative = weights.double().cumsum(0)
+    local = cumulative[-1:].cpu() if cumulative.numel() else torch.zeros(1, dtype=torch.float64)
+    offset = torch.zeros(1, dtype=torch.float64)
+    total = local.clone()
+    distributed = X.split == 0 and comm.is_distributed()
+    if distributed:
+        comm.Exscan(local, offset, ht.MPI.SUM)
+        if comm.rank == 0:
+            offset.zero_()
+        comm.Allreduce(ht.MPI.IN_PLACE, total, ht.MPI.SUM)
+
+    # the thresholds are identical on all processes
+    thresholds = ht.random.rand(n, dtype=ht.float64)._DNDarray__array.cpu() * total - offset
+    thresholds = thresholds[(thresholds >= 0) & (thresholds < local)].to(cumulative.device)
+    rows = _searchsorted(cumulative, thresholds, right=True)
+    drawn = points[rows.clamp(max=max(0, points.shape[0] - 1))]
+    if not distributed:
+        return drawn
+
+    counts = torch.tensor([drawn.shape[0]])
+    all_counts = torch.empty(comm.size, dtype=counts.dtype)
+    comm.Allgather(counts, all_counts)
+    counts = all_counts.tolist()
+    displs = [sum(counts[:i]) for i in range(len(counts))]
+    gathered = torch.empty((sum(counts), points.shape[1]), dtype=points.dtype, device=points.device)
+    comm.Allgatherv(drawn.contiguous(), (gathered, counts, displs), recv_axis=0)
+
+    return gathered
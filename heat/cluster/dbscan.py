@@ -0,0 +1,372 @@
+import itertools
+import torch
+
+import heat as ht
+from heat.core._operations import _searchsorted
+from heat.core.communication import _alltoallv, _exchange
+from heat.spatial.distance import _METRICS
+
+__all__ = ["DBSCAN"]
+
+
+class DBSCAN(ht.ClusteringMixin, ht.BaseEstimator):
+    """
+    Density-based spatial clustering of applications with noise (DBSCAN) [1] of low-dimensional data. Points with at
+    least min_samples points within the distance eps, including themselves, are core points. Core points within eps
+    of each other belong to the same cluster, the other points within eps of a core point are border points of its
+    cluster, all remaining points are noise.
+
+    The space is partitioned by a grid with cells of side length eps, such that the neighbours of a point lie in its
+    own or an adjacent cell. The points are distributed with a sample sort on their cell ids, every process owns a
+    contiguous range of cells and receives the points of the adjacent cells of other processes as halo. The
+    neighbours are found cell by cell with the distance kernels of ht.spatial, the clusters are expanded locally with
+    a union-find over the core points and their ids are merged across the processes sharing halo points.
+
+    Parameters
+    ----------
+    eps : float, optional
+        The maximal distance of two points in each others neighbourhood, default: 0.5
+    min_samples : int, optional
+        The number of points in the neighbourhood of a core point, including itself, default: 5
+    metric : str, optional
+        "euclidean" or "manhattan", default: "euclidean"
+    block_size : int, optional
+        Number of points whose neighbours are searched at once, default: 1024
+
+    Attributes
+    ----------
+    labels_ : ht.DNDarray, shape (n_samples,)
+        Cluster of each point, distributed like the points, noise is labeled -1. The clusters are numbered in the
+        order of their first core point.
+    core_sample_indices_ : ht.DNDarray
+        Sorted indices of the core points
+
+    References
+    ----------
+    [1] Ester, M., Kriegel, H.-P., Sander, J., and Xu, X., "A density-based algorithm for discovering clusters in
+        large spatial databases with noise", Proceedings of the Second International Conference on Knowledge
+        Discovery and Data Mining, pp. 226-231, 1996.
+
+    Examples
+    --------
+    >>> X = ht.array([[1.0, 2.0], [2.0, 2.0], [2.0, 3.0], [8.0, 7.0], [8.0, 8.0], [25.0, 80.0]], split=0)
+    >>> ht.cluster.DBSCAN(eps=3, min_samples=2).fit(X).labels_
+    tensor([ 0,  0,  0,  1,  1, -1])
+    """
+
+    def __init__(self, eps=0.5, min_samples=5, metric="euclidean", block_size=1024):
+        self.eps = eps
+        self.min_samples = min_samples
+        self.metric = metric
+        self.block_size = block_size
+
+        # in-place properties
+        self._labels = None
+        self._core_sample_indices = None
+
+    @property
+    def labels_(self):
+        """
+        Returns the cluster of each point, -1 for noise.
+        """
+        return self._labels
+
+    @property
+    def core_sample_indices_(self):
+        """
+        Returns the indices of the core points.
+        """
+        return self._core_sample_indices
+
+    def fit(self, X):
+        """
+        Clusters the points of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray
+            Points of shape (n_samples, n_features), X.split can be None or 0
+
+        Returns
+        -------
+        self : DBSCAN
+        """
+        if not isinstance(X, ht.DNDarray):
+            raise ValueError("input needs to be a ht.DNDarray, but was {}".format(type(X)))
+        if X.ndim != 2:
+            raise ValueError("X needs to be 2D, but has the shape {}".format(X.shape))
+        if not self.eps > 0:
+            raise ValueError("eps needs to be positive, but was {}".format(self.eps))
+        if not isinstance(self.min_samples, int) or self.min_samples < 1:
+            raise ValueError(
+                "min_samples needs to be a positive int, but was {}".format(self.min_samples)
+            )
+        if self.metric not in ["euclidean", "manhattan"]:
+            raise ValueError(
+                'metric needs to be "euclidean" or "manhattan", but was {}'.format(self.metric)
+            )
+        if not isinstance(self.block_size, int) or self.block_size < 1:
+            raise ValueError(
+                "block_size needs to be a positive int, but was {}".format(self.block_size)
+            )
+        if X.split is not None and X.split != 0:
+            X = ht.resplit(X, 0)
+
+        comm = X.comm
+        distributed = X.split == 0 and comm.is_distributed()
+        dtype = ht.promote_types(X.dtype, ht.float32).torch_type()
+        points = X._DNDarray__array.to(dtype)
+        device = points.device
+        offset = 0
+        if distributed:
+            # exclusive upper bounds of the indices of the points of every process
+            bounds = X.create_lshape_map()[:, 0].to(device).long().cumsum(0)
+            offset = bounds[comm.rank].item() - points.shape[0]
+        index = torch.arange(offset, offset + points.shape[0], device=device)
+        ids, deltas = self.__grid(points, comm if distributed else None)
+
+        n_own, sends = points.shape[0], None
+        if distributed:
+            # sample sort on the cell ids, every process owns a contiguous range of cells
+            splitters = _splitters(ids, comm)
+            owners = _searchsorted(splitters, ids, right=True)
+            (points, index, ids), _, _, _ = _exchange(comm, owners, points, index, ids)
+            n_own = points.shape[0]
+
+            # the points are sent to the processes owning adjacent cells as halo
+            neighbours = _searchsorted(splitters, ids.unsqueeze(1) + deltas, right=True)
+            pairs = torch.arange(n_own, device=device).unsqueeze(1) * comm.size + neighbours
+            pairs = torch.unique(pairs[neighbours != comm.rank])
+            sources, owners = pairs // comm.size, pairs % comm.size
+            (halo, halo_index, halo_ids), order, send_counts, recv_counts = _exchange(
+                comm, owners, points[sources], index[sources], ids[sources]
+            )
+            # owned point of every halo copy in the order they were sent
+            sends = (sources[order], send_counts, recv_counts)
+            points = torch.cat((points, halo))
+            index = torch.cat((index, halo_index))
+            ids = torch.cat((ids, halo_ids))
+
+        sorted_ids, perm = ids.sort()
+        neighbourhoods = (points, sorted_ids, perm, deltas)
+
+        # core points, the flags of the halo copies are sent by their owners
+        counts = torch.zeros(n_own, dtype=torch.int64, device=device)
+        for start, _, within, _ in self.__neighbours(neighbourhoods, ids, n_own):
+            counts[start : start + within.shape[0]] += within.sum(dim=1)
+        core = counts >= self.min_samples
+        if sends is not None:
+            core = torch.cat((core, _forward(comm, core.long(), sends).bool()))
+
+        # union of the core points within eps, border points join the cluster of their closest core point
+        parent = torch.arange(points.shape[0], device=device)
+        closest = torch.full((n_own,), -1, dtype=torch.int64, device=device)
+        closest_distance = torch.full((n_own,), float("inf"), dtype=dtype, device=device)
+        for start, candidates, within, distances in self.__neighbours(neighbourhoods, ids, n_own):
+            rows = torch.arange(start, start + within.shape[0], device=device)
+            within &= core[candidates]
+            distances = distances.masked_fill(~within, float("inf"))
+            nearest, position = distances.min(dim=1)
+            update = nearest < closest_distance[rows]
+            closest_distance[rows[update]] = nearest[update]
+            closest[rows[update]] = candidates[rows[update] - start, position[update]]
+
+            edges = within & core[rows].unsqueeze(1)
+            _union(parent, rows.unsqueeze(1).expand_as(candidates)[edges], candidates[edges])
+        roots = _find(parent, torch.arange(points.shape[0], device=device))
+
+        # every cluster is identified by the smallest index of its core points
+        cluster = torch.full_like(roots, torch.iinfo(torch.int64).max)
+        _scatter_min(cluster, roots[core], index[core])
+        while sends is not None:
+            previous = cluster.clone()
+            # the owners collect the clusters of the halo copies and send the smallest back
+            reported = _backward(comm, cluster[roots[n_own:]], sends)
+            _scatter_min(cluster, roots[sends[0]], reported)
+            returned = _forward(comm, cluster[roots[:n_own]], sends)
+            _scatter_min(cluster, roots[n_own:], returned)
+            changed = int((cluster != previous).any())
+            if comm.allreduce(changed, ht.communication.MPI.MAX) == 0:
+                break
+
+        labels = torch.full((n_own,), -1, dtype=torch.int64, device=device)
+        assigned = closest >= 0
+        labels[assigned] = cluster[roots[closest[assigned]]]
+        core, index = core[:n_own], index[:n_own]
+
+        # consecutive cluster ids in the order of the first core point
+        clusters = torch.unique(labels[assigned])
+        if distributed:
+            clusters = set(itertools.chain(*comm.allgather(clusters.tolist())))
+            clusters = torch.tensor(sorted(clusters), dtype=torch.int64, device=device)
+        labels[assigned] = _searchsorted(clusters, labels[assigned])
+
+        if distributed:
+            # the labels are returned to the processes holding the points
+            owners = _searchsorted(bounds, index, right=True)
+            (index, labels, core), _, _, _ = _exchange(comm, owners, index, labels, core)
+            order = index.argsort()
+            index, labels, core = index[order], labels[order], core[order]
+
+        self._labels = ht.array(labels, is_split=X.split, device=X.device, comm=comm)
+        self._core_sample_indices = ht.array(
+            index[core], is_split=X.split, device=X.device, comm=comm
+        )
+        return self
+
+    def fit_predict(self, X):
+        """
+        Clusters the points of X and returns their labels.
+
+        Parameters
+        ----------
+        X : ht.DNDarray
+            Points of shape (n_samples, n_features), X.split can be None or 0
+
+        Returns
+        -------
+        labels : ht.DNDarray, shape (n_samples,)
+            Cluster of each point, -1 for noise
+        """
+        return self.fit(X).labels_
+
+    def __grid(self, points, comm):
+        """
+        Ids of the grid cells of the points and the differences of the ids of adjacent cells. The cells are numbered
+        row-major over the bounding box of all points, padded by one cell on each side.
+        """
+        n_features = points.shape[1]
+        bounds = torch.full(
+            (2, n_features), float("inf"), dtype=torch.float64, device=points.device
+        )
+        if points.shape[0] > 0:
+            bounds[0] = points.min(dim=0)[0]
+            bounds[1] = -points.max(dim=0)[0]
+        if comm is not None:
+            comm.Allreduce(ht.communication.MPI.IN_PLACE, bounds, ht.communication.MPI.MIN)
+        lower, upper = bounds[0], -bounds[1]
+
+        # the extents are python ints, they must not overflow for small eps
+        extents = [int(extent) + 3 for extent in ((upper - lower) / self.eps).floor().tolist()]
+        strides, size = [], 1
+        for extent in reversed(extents):
+            strides.insert(0, size)
+            size *= extent
+        if size >= 2 ** 62:
+            raise ValueError(
+                "the grid of {} cells is too large, eps needs to be larger than {}".format(
+                    size, self.eps
+                )
+            )
+        strides = torch.tensor(strides, dtype=torch.int64, device=points.device)
+        cells = ((points.double() - lower) / self.eps).floor().long() + 1
+        ids = (cells * strides).sum(dim=1)
+
+        offsets = torch.tensor(
+            list(itertools.product((-1, 0, 1), repeat=n_features)),
+            dtype=torch.int64,
+            device=points.device,
+        )
+        return ids, (offsets * strides).sum(dim=1)
+
+    def __neighbours(self, neighbourhoods, ids, n_queries):
+        """
+        Yields the neighbours of the first n_queries points in blocks of queries and adjacent cells: the index of the
+        first query of the block, the candidate points in the cell padded to the size of the largest cell, whether
+        they are within eps and their distances.
+        """
+        points, sorted_ids, perm, deltas = neighbourhoods
+        kernel = _METRICS[self.metric]
+        for start in range(0, n_queries, self.block_size):
+            end = min(start + self.block_size, n_queries)
+            queries = points[start:end].unsqueeze(1)
+            for delta in deltas:
+                target = ids[start:end] + delta
+                first = _searchsorted(sorted_ids, target)
+                last = _searchsorted(sorted_ids, target, right=True)
+                width = (last - first).max().item()
+                if width == 0:
+                    continue
+                positions = first.unsqueeze(1) + torch.arange(width, device=first.device)
+                valid = positions < last.unsqueeze(1)
+                candidates = perm[positions.clamp(max=perm.shape[0] - 1)]
+                distances = kernel(queries, points[candidates]).squeeze(1)
+                yield start, candidates, valid & (distances <= self.eps), distances
+
+
+def _splitters(ids, comm):
+    """
+    Cell ids splitting the sorted ids of all processes into ranges of similar size, sampled regularly from the
+    sorted local ids.
+    """
+    local = ids.sort()[0]
+    if local.shape[0] > 0:
+        local = local[(torch.arange(comm.size, device=ids.device) * local.shape[0]) // comm.size]
+    samples = sorted(itertools.chain(*comm.allgather(local.tolist())))
+    if not samples:
+        return torch.zeros(comm.size - 1, dtype=torch.int64, device=ids.device)
+    positions = [(i * len(samples)) // comm.size for i in range(1, comm.size)]
+    return torch.tensor([samples[i] for i in positions], dtype=torch.int64, device=ids.device)
+
+
+def _forward(comm, values, sends):
+    """
+    Values of the owned points sent to their halo copies, received in the order of the halo points.
+    """
+    sources, send_counts, recv_counts = sends
+    return _alltoallv(comm, values[sources], send_counts, recv_counts)
+
+
+def _backward(comm, values, sends):
+    """
+    Values of the halo points sent back to the owners, received in the order of sends[0].
+    """
+    _, send_counts, recv_counts = sends
+    return _alltoallv(comm, values, recv_counts, send_counts)
+
+
+def _scatter_min(target, index, values):
+    """
+    target[index] = min(target[index], values) in-place, repeated indices receive the smallest of their values.
+    """
+    if index.shape[0] == 0:
+        return
+    # sorting by index and value moves the smallest value of every index to the front of its group
+    order = values.argsort()
+    ranks = torch.empty_like(order)
+    ranks[order] = torch.arange(order.shape[0], device=order.device)
+    order = (index * order.shape[0] + ranks).argsort()
+    index, values = index[order], values[order]
+    first = torch.ones_like(index, dtype=torch.bool)
+    first[1:] = index[1:] != index[:-1]
+    index, values = index[first], values[first]
+    target[index] = torch.min(target[index], values)
+
+
+def _find(parent, nodes):
+    """
+    Roots of the trees of the nodes, the paths of the nodes are compressed.
+    """
+    roots = parent[nodes]
+    while True:
+        grand = parent[roots]
+        if torch.equal(grand, roots):
+            break
+        roots = grand
+    parent[nodes] = roots
+    return roots
+
+
+def _union(parent, src, dst):
+    """
+    Merges the trees of the endpoints of the edges. The larger root of an edge is hooked onto the smaller one,
+    the hooking and path compression are repeated until both endpoints of every edge share a root.
+    """
+    while src.shape[0] > 0:
+        a, b = _find(parent, src), _find(parent, dst)
+        differ = a != b
+        if not differ.any():
+            break
+        a, b = a[differ], b[differ]
+        _scatter_min(parent, torch.max(a, b), torch.min(a, b))
+        src, dst = src[differ], dst[differ]
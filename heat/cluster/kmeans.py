@@ -1,9 +1,20 @@
+import torch
+
 import heat as ht
 from heat.cluster._kcluster import _KCluster
 
 
 class KMeans(_KCluster):
-    def __init__(self, n_clusters=8, init="random", max_iter=300, tol=1e-4, random_state=None):
+    def __init__(
+        self,
+        n_clusters=8,
+        init="random",
+        max_iter=300,
+        tol=1e-4,
+        random_state=None,
+        algorithm="lloyd",
+        n_init=1,
+    ):
         """
         K-Means clustering algorithm. An implementation of Lloyd's algorithm [1].
         Uses the Euclidean (:math:`L_2`) metric for distance calculations
@@ -24,6 +35,16 @@ class KMeans(_KCluster):
             Relative tolerance with regards to inertia to declare convergence.
         random_state : int
             Determines random number generation for centroid initialization.
+        algorithm : str, default: "lloyd"
+            "lloyd" computes all distances in every iteration. "hamerly" [3] and "elkan" [4] keep bounds on the
+            distances of every point to its own and the other centroids and only compute the distances of points whose
+            bounds do not exclude a reassignment. "hamerly" keeps a single lower bound per point, "elkan" one per point
+            and centroid, which prunes more distances at the cost of O(n*k) memory.
+        n_init : int, default: 1
+            Number of initializations. All of them are iterated together with Lloyd's algorithm, stacked into a single
+            (n_init * n_clusters, n_features) matrix, so that an epoch takes one pass over the data and one Allreduce
+            for all of them. The run with the smallest sum of squared distances of the samples to its centroids is
+            kept. Only supported with algorithm "lloyd". Ignored if init is a DNDarray.
 
         Notes
         -----
@@ -42,18 +63,24 @@ class KMeans(_KCluster):
         [2] Arthur, D., Vassilvitskii, S., "k-means++: The Advantages of Careful Seeding", Proceedings of the Eighteenth
             Annual ACM-SIAM Symposium on Discrete Algorithms, Society for Industrial and Applied Mathematics
             Philadelphia, PA, USA. pp. 1027–1035, 2007.
+        [3] Hamerly, G., "Making k-means even faster", Proceedings of the 2010 SIAM International Conference on Data
+            Mining, pp. 130–140, 2010.
+        [4] Elkan, C., "Using the triangle inequality to accelerate k-means", Proceedings of the Twentieth International
+            Conference on Machine Learning, pp. 147–153, 2003.
         """
         if init == "kmeans++":
             init = "probability_based"
 
         super().__init__(
-            metric=lambda x, y: ht.spatial.distance.cdist(x, y, quadratic_expansion=True),
+            metric="euclidean",
             n_clusters=n_clusters,
             init=init,
             max_iter=max_iter,
             tol=tol,
             random_state=random_state,
         )
+        self.algorithm = algorithm
+        self.n_init = n_init
 
     def _update_centroids(self, X, matching_centroids):
         """
@@ -66,22 +93,14 @@ class KMeans(_KCluster):
             Array filled with indeces ``i`` indicating to which cluster ``ci`` each sample point in X is assigned
 
         """
-        new_cluster_centers = self._cluster_centers.copy()
-        for i in range(self.n_clusters):
-            # points in current cluster
-            selection = (matching_centroids == i).astype(ht.int64)
-            # accumulate points and total number of points in cluster
-            assigned_points = X * selection
-            points_in_cluster = selection.sum(axis=0, keepdim=True).clip(
-                1.0, ht.iinfo(ht.int64).max
-            )
+        sums = self._accumulate_centroids(X, matching_centroids)
+        counts = sums[:, -1:]
 
-            # compute the new centroids
-            new_cluster_centers[i : i + 1, :] = (assigned_points / points_in_cluster).sum(
-                axis=0, keepdim=True
-            )
+        # empty clusters keep their previous centroid
+        centers = self._cluster_centers._DNDarray__array.to(sums.dtype)
+        centers = torch.where(counts > 0, sums[:, :-1] / counts.clamp(min=1), centers)
 
-        return new_cluster_centers
+        return ht.array(centers, device=X.device, comm=X.comm)
 
     def fit(self, X):
         """
@@ -95,10 +114,29 @@ class KMeans(_KCluster):
         # input sanitation
         if not isinstance(X, ht.DNDarray):
             raise ValueError("input needs to be a ht.DNDarray, but was {}".format(type(X)))
+        if self.algorithm not in ["lloyd", "hamerly", "elkan"]:
+            raise ValueError(
+                'algorithm needs to be one of "lloyd", "hamerly" or "elkan", but was {}'.format(
+                    self.algorithm
+                )
+            )
+        if not isinstance(self.n_init, int) or self.n_init < 1:
+            raise ValueError("n_init needs to be a positive int, but was {}".format(self.n_init))
+
+        if self.n_init > 1 and not isinstance(self.init, ht.DNDarray):
+            if self.algorithm != "lloyd":
+                raise ValueError(
+                    'n_init > 1 is only supported with algorithm "lloyd", but algorithm was {}'.format(
+                        self.algorithm
+                    )
+                )
+            return self.__fit_restarts(X)
 
         # initialize the clustering
         self._initialize_cluster_centers(X)
         self._n_iter = 0
+        if self.algorithm != "lloyd":
+            return self.__fit_bounded(X)
         matching_centroids = ht.zeros((X.shape[0]), split=X.split, device=X.device, comm=X.comm)
 
         # iteratively fit the points to the centroids
@@ -119,3 +157,186 @@ class KMeans(_KCluster):
         self._labels = matching_centroids
 
         return self
+
+    def __fit_restarts(self, X):
+        """
+        Lloyd's iteration for n_init stacked sets of centroids. Every epoch computes the distances
+        to all centroids in one kernel, takes the minimum per set and combines the sums, counts and
+        sums of squared distances of all sets in a single Allreduce. As in the other fits, inertia_
+        is the squared shift of the kept centroids in the last epoch.
+        """
+        if X.split is not None and X.split != 0:
+            raise NotImplementedError("Not implemented for other splitting-axes")
+        restarts, k = self.n_init, self.n_clusters
+
+        # independent initializations from one seeding of the random number generator
+        if self.random_state is not None:
+            ht.random.seed(self.random_state)
+        stacked = []
+        for _ in range(restarts):
+            self._initialize_cluster_centers(X, reseed=False)
+            stacked.append(self._cluster_centers._DNDarray__array)
+        datatype = ht.promote_types(X.dtype, ht.float32).torch_type()
+        centers = torch.cat(stacked).to(datatype)
+        points = X._DNDarray__array.to(datatype)
+        weighted = torch.cat((points, torch.ones_like(points[:, :1])), dim=1)
+        labels = torch.zeros((points.shape[0], restarts), dtype=torch.int64, device=points.device)
+        step = max(1, 2 ** 24 // (restarts * k))
+
+        self._n_iter = 0
+        for epoch in range(self.max_iter):
+            self._n_iter += 1
+
+            # segmented argmin of the distances to the stacked centroids
+            sse = torch.zeros((restarts, X.shape[1] + 1), dtype=datatype, device=points.device)
+            for start in range(0, points.shape[0], step):
+                distances = torch.cdist(points[start : start + step], centers) ** 2
+                distances, labels[start : start + step] = distances.view(-1, restarts, k).min(dim=2)
+                sse[:, 0] += distances.sum(dim=0)
+
+            # sums and counts of all sets and their sums of squared distances in one buffer
+            sums = torch.zeros((restarts * k, X.shape[1] + 1), dtype=datatype, device=points.device)
+            for restart in range(restarts):
+                sums[restart * k : (restart + 1) * k].index_add_(0, labels[:, restart], weighted)
+            sums = torch.cat((sums, sse))
+            if X.split == 0 and X.comm.is_distributed():
+                X.comm.Allreduce(ht.MPI.IN_PLACE, sums, ht.MPI.SUM)
+            sums, sse = sums[: restarts * k], sums[restarts * k :, 0]
+
+            # empty clusters keep their previous centroid
+            counts = sums[:, -1:]
+            new_centers = torch.where(counts > 0, sums[:, :-1] / counts.clamp(min=1), centers)
+            shift = ((new_centers - centers) ** 2).view(restarts, -1).sum(dim=1)
+            centers = new_centers
+            if self.tol is not None and (shift <= self.tol).all():
+                break
+
+        # the set with the smallest sum of squared distances wins
+        best = sse.argmin().item()
+        self._cluster_centers = ht.array(
+            centers[best * k : (best + 1) * k], device=X.device, comm=X.comm
+        )
+        self._labels = ht.array(
+            labels[:, best : best + 1].contiguous(), is_split=X.split, device=X.device, comm=X.comm
+        )
+        self._inertia = ht.array(shift[best], device=X.device, comm=X.comm)
+
+        return self
+
+    def __fit_bounded(self, X):
+        """
+        Hamerly's and Elkan's variants of the fit. The bounds are kept for the local data points,
+        the centroids and their shifts are identical on all processes.
+        """
+        if X.split is not None and X.split != 0:
+            raise NotImplementedError("Not implemented for other splitting-axes")
+        elkan = self.algorithm == "elkan"
+        datatype = ht.promote_types(X.dtype, ht.float32).torch_type()
+        centers = self._cluster_centers._DNDarray__array.to(datatype)
+        points = X._DNDarray__array.to(datatype)
+
+        # exact bounds from the distances to all initial centroids
+        distances = torch.cdist(points, centers)
+        upper, labels = distances.min(dim=1)
+        if elkan:
+            lower = distances
+        else:
+            lower = distances.scatter(1, labels.unsqueeze(1), float("inf")).min(dim=1)[0]
+
+        for epoch in range(self.max_iter):
+            # increment the iteration count
+            self._n_iter += 1
+
+            # update the centroids
+            matching_centroids = ht.array(
+                labels.unsqueeze(1), is_split=X.split, device=X.device, comm=X.comm
+            )
+            new_cluster_centers = self._update_centroids(X, matching_centroids)
+            # check whether centroid movement has converged
+            self._inertia = ((self._cluster_centers - new_cluster_centers) ** 2).sum()
+            self._cluster_centers = new_cluster_centers.copy()
+            if self.tol is not None and self._inertia <= self.tol:
+                break
+            # like in Lloyd's iteration, the labels belong to the centroids before the last update
+            if epoch == self.max_iter - 1:
+                break
+
+            # the bounds are loosened by the shifts of the centroids
+            shift = (new_cluster_centers._DNDarray__array - centers).norm(dim=1)
+            centers = new_cluster_centers._DNDarray__array
+            upper += shift[labels]
+            if elkan:
+                lower = (lower - shift).clamp(min=0)
+            else:
+                largest = shift.topk(min(2, shift.numel()))
+                others = torch.where(
+                    labels == largest.indices[0], largest.values[-1], largest.values[0]
+                )
+                lower = lower - others
+
+            # half the distance of each centroid to its closest other centroid
+            between = torch.cdist(centers, centers) / 2
+            closest = between + torch.diag(torch.full_like(shift, float("inf")))
+            closest = closest.min(dim=1)[0]
+
+            if elkan:
+                labels, upper, lower = _elkan_assign(
+                    points, centers, between, closest, labels, upper, lower
+                )
+            else:
+                labels, upper, lower = _hamerly_assign(
+                    points, centers, closest, labels, upper, lower
+                )
+
+        self._labels = ht.array(labels.unsqueeze(1), is_split=X.split, device=X.device, comm=X.comm)
+
+        return self
+
+
+def _hamerly_assign(points, centers, closest, labels, upper, lower):
+    """
+    Reassigns the points whose upper bound exceeds both the lower bound and half the distance of
+    their centroid to the closest other centroid.
+    """
+    bound = torch.max(closest[labels], lower)
+    rows = (upper > bound).nonzero().flatten()
+    upper[rows] = (points[rows] - centers[labels[rows]]).norm(dim=1)
+    rows = rows[upper[rows] > bound[rows]]
+    if rows.numel() > 0:
+        distances = torch.cdist(points[rows], centers)
+        nearest = distances.topk(min(2, centers.shape[0]), dim=1, largest=False)
+        labels[rows] = nearest.indices[:, 0]
+        upper[rows] = nearest.values[:, 0]
+        lower[rows] = nearest.values[:, -1] if centers.shape[0] > 1 else float("inf")
+
+    return labels, upper, lower
+
+
+def _elkan_assign(points, centers, between, closest, labels, upper, lower):
+    """
+    Computes the distances between the points and those centroids that are closer than the upper
+    bound according to both the lower bound and half the distance of the centroids.
+    """
+    rows = (upper > closest[labels]).nonzero().flatten()
+    if rows.numel() == 0:
+        return labels, upper, lower
+    own = labels[rows]
+    upper[rows] = (points[rows] - centers[own]).norm(dim=1)
+    lower[rows, own] = upper[rows]
+
+    bound = upper[rows].unsqueeze(1)
+    candidates = (bound > lower[rows]) & (bound > between[own])
+    candidates[torch.arange(rows.numel(), device=rows.device), own] = False
+    pairs, columns = candidates.nonzero(as_tuple=True)
+    distances = (points[rows[pairs]] - centers[columns]).norm(dim=1)
+    lower[rows[pairs], columns] = distances
+
+    # the closest of the computed centroids replaces the own centroid if it is closer
+    computed = torch.full(candidates.shape, float("inf"), dtype=upper.dtype, device=upper.device)
+    computed[pairs, columns] = distances
+    nearest, indices = computed.min(dim=1)
+    changed = nearest < upper[rows]
+    labels[rows[changed]] = indices[changed]
+    upper[rows[changed]] = nearest[changed]
+
+    return labels, upper, lower
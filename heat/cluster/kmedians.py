@@ -1,3 +1,5 @@
+import torch
+
 import heat as ht
 from heat.cluster._kcluster import _KCluster
 
@@ -32,7 +34,7 @@ class KMedians(_KCluster):
             init = "probability_based"
 
         super().__init__(
-            metric=lambda x, y: ht.spatial.distance.manhattan(x, y, expand=True),
+            metric="manhattan",
             n_clusters=n_clusters,
             init=init,
             max_iter=max_iter,
@@ -51,39 +53,13 @@ class KMedians(_KCluster):
             Array filled with indeces ``i`` indicating to which cluster ``ci`` each sample point in X is assigned
 
         """
-        new_cluster_centers = self._cluster_centers.copy()
-        for i in range(self.n_clusters):
-            # points in current cluster
-            selection = (matching_centroids == i).astype(ht.int64)
-            # Remove 0-element lines to avoid spoiling of median
-            assigned_points = X * selection
-            rows = (assigned_points.abs()).sum(axis=1) != 0
-            local = assigned_points._DNDarray__array[rows._DNDarray__array]
-            clean = ht.array(local, is_split=X.split)
-            clean.balance_()
-            # failsafe in case no point is assigned to this cluster
-            # draw a random datapoint to continue/restart
-            if clean.shape[0] == 0:
-                _, displ, _ = X.comm.counts_displs_shape(shape=X.shape, axis=0)
-                sample = ht.random.randint(0, X.shape[0]).item()
-                proc = 0
-                for p in range(X.comm.size):
-                    if displ[p] > sample:
-                        break
-                    proc = p
-                xi = ht.zeros(X.shape[1], dtype=X.dtype)
-                if X.comm.rank == proc:
-                    idx = sample - displ[proc]
-                    xi = ht.array(X.lloc[idx, :], device=X.device, comm=X.comm)
-                xi.comm.Bcast(xi, root=proc)
-                new_cluster_centers[i, :] = xi
-            else:
-                if clean.shape[0] <= ht.MPI_WORLD.size:
-                    clean.resplit_(axis=None)
-                median = ht.median(clean, axis=0, keepdim=True)
-                new_cluster_centers[i : i + 1, :] = median
-
-        return new_cluster_centers
+        medians, counts = self._grouped_median(X, matching_centroids)
+
+        # empty clusters keep their previous centroid
+        centers = self._cluster_centers._DNDarray__array.to(medians.dtype)
+        centers = torch.where(counts.unsqueeze(1) > 0, medians, centers)
+
+        return ht.array(centers, device=X.device, comm=X.comm)
 
     def fit(self, X):
         """
@@ -1,3 +1,5 @@
+import torch
+
 import heat as ht
 from heat.cluster._kcluster import _KCluster
 
@@ -32,7 +34,7 @@ class KMedoids(_KCluster):
             init = "probability_based"
 
         super().__init__(
-            metric=lambda x, y: ht.spatial.distance.manhattan(x, y, expand=True),
+            metric="manhattan",
             n_clusters=n_clusters,
             init=init,
             max_iter=max_iter,
@@ -52,54 +54,35 @@ class KMedoids(_KCluster):
             Array filled with indeces ``i`` indicating to which cluster ``ci`` each sample point in X is assigned
         """
 
-        new_cluster_centers = self._cluster_centers.copy()
-        for i in range(self.n_clusters):
-            # points in current cluster
-            selection = (matching_centroids == i).astype(ht.int64)
-            # Remove 0-element lines to avoid spoiling of median
-            assigned_points = X * selection
-            rows = (assigned_points.abs()).sum(axis=1) != 0
-            local = assigned_points._DNDarray__array[rows._DNDarray__array]
-            clean = ht.array(local, is_split=X.split)
-            clean.balance_()
-            # failsafe in case no point is assigned to this cluster
-            # draw a random datapoint to continue/restart
-            if clean.shape[0] == 0:
-                _, displ, _ = X.comm.counts_displs_shape(shape=X.shape, axis=0)
-                sample = ht.random.randint(0, X.shape[0]).item()
-                proc = 0
-                for p in range(X.comm.size):
-                    if displ[p] > sample:
-                        break
-                    proc = p
-                xi = ht.zeros(X.shape[1], dtype=X.dtype)
-                if X.comm.rank == proc:
-                    idx = sample - displ[proc]
-                    xi = ht.array(X.lloc[idx, :], device=X.device, comm=X.comm)
-                xi.comm.Bcast(xi, root=proc)
-                new_cluster_centers[i, :] = xi
-
-            else:
-                if clean.shape[0] <= ht.MPI_WORLD.size:
-                    clean.resplit_(axis=None)
-                median = ht.median(clean, axis=0, keepdim=True)
-
-                dist = self._metric(X, median)
-                _, displ, _ = X.comm.counts_displs_shape(shape=X.shape, axis=0)
-                idx = dist.argmin(axis=0, keepdim=False).item()
-                proc = 0
-                for p in range(X.comm.size):
-                    if displ[p] > idx:
-                        break
-                    proc = p
-                closest_point = ht.zeros(X.shape[1], dtype=X.dtype)
-                if X.comm.rank == proc:
-                    lidx = idx - displ[proc]
-                    closest_point = ht.array(X.lloc[lidx, :], device=X.device, comm=X.comm)
-                closest_point.comm.Bcast(closest_point, root=proc)
-                new_cluster_centers[i, :] = closest_point
-
-        return new_cluster_centers
+        medians, counts = self._grouped_median(X, matching_centroids)
+
+        # the closest local sample to each median, found with a single distance matrix
+        points = X._DNDarray__array.to(medians.dtype)
+        candidates = torch.zeros(
+            (self.n_clusters, X.shape[1] + 1), dtype=medians.dtype, device=medians.device
+        )
+        candidates[:, -1] = float("inf")
+        if points.shape[0] > 0:
+            distances, rows = torch.cdist(points, medians, p=1).min(dim=0)
+            candidates[:, :-1], candidates[:, -1] = points[rows], distances
+
+        # the closest of the local candidates of all processes
+        if X.split == 0 and X.comm.is_distributed():
+            gathered = torch.empty(
+                (X.comm.size * self.n_clusters, X.shape[1] + 1),
+                dtype=candidates.dtype,
+                device=candidates.device,
+            )
+            X.comm.Allgather(candidates, gathered)
+            gathered = gathered.reshape(X.comm.size, self.n_clusters, -1)
+            closest = gathered[:, :, -1].argmin(dim=0)
+            candidates = gathered[closest, torch.arange(self.n_clusters, device=closest.device)]
+
+        # empty clusters keep their previous centroid
+        centers = self._cluster_centers._DNDarray__array.to(medians.dtype)
+        centers = torch.where(counts.unsqueeze(1) > 0, candidates[:, :-1], centers)
+
+        return ht.array(centers, device=X.device, comm=X.comm)
 
     def fit(self, X):
         """
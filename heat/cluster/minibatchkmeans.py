@@ -0,0 +1,161 @@
+import torch
+
+import heat as ht
+from heat.cluster._kcluster import _KCluster
+
+
+class MiniBatchKMeans(_KCluster):
+    def __init__(
+        self,
+        n_clusters=8,
+        init="random",
+        max_iter=100,
+        tol=1e-4,
+        random_state=None,
+        batch_size=1024,
+    ):
+        """
+        Mini-batch K-Means clustering algorithm [1].
+        Every step moves the centroids towards the means of a random mini-batch of the data. Each centroid has its own
+        learning rate, the inverse of the number of points assigned to it so far, so that a centroid is the mean of all
+        points ever assigned to it. The cost of a step only depends on the batch size, partial_fit allows to cluster
+        data streamed in chunks that do not fit into memory at once.
+        Uses the Euclidean (:math:`L_2`) metric for distance calculations
+
+        Parameters
+        ----------
+        n_clusters : int, optional, default: 8
+            The number of clusters to form as well as the number of centroids to generate.
+        init : {‘random’ or an ndarray}
+            Method for initialization, defaults to ‘random’:
+            ‘k-means++’ : selects initial cluster centers for the clustering in a smart way to speed up convergence.
+            ‘random’: choose k observations (rows) at random from data for the initial centroids.
+            If an ht.DNDarray is passed, it should be of shape (n_clusters, n_features) and gives the initial centers.
+        max_iter : int, default: 100
+            Maximum number of mini-batch steps of fit.
+        tol : float, default: 1e-4
+            Tolerance with regards to the centroid movement of a step to declare convergence.
+        random_state : int
+            Determines random number generation for centroid initialization and mini-batch sampling.
+        batch_size : int, default: 1024
+            Number of samples drawn with replacement from all processes for each step of fit.
+
+        References
+        ----------
+        [1] Sculley, D., "Web-scale k-means clustering", Proceedings of the 19th International Conference on World Wide
+            Web, pp. 1177–1178, 2010.
+        """
+        if init == "kmeans++":
+            init = "probability_based"
+
+        super().__init__(
+            metric="euclidean",
+            n_clusters=n_clusters,
+            init=init,
+            max_iter=max_iter,
+            tol=tol,
+            random_state=random_state,
+        )
+        self.batch_size = batch_size
+
+        # in-place properties
+        self._counts = None
+
+    def _update_centroids(self, X, matching_centroids):
+        """
+        Moves each centroid ``ci`` towards the mean of the data points in ``X`` that are assigned to ``ci``, with a
+        learning rate of the number of these points divided by the number of all points assigned to ``ci`` so far.
+
+        Parameters
+        ----------
+        X :  DNDarray
+            Mini-batch of the input data
+        matching_centroids : DNDarray
+            Array filled with indeces ``i`` indicating to which cluster ``ci`` each sample point in X is assigned
+        """
+        sums = self._accumulate_centroids(X, matching_centroids)
+        counts = sums[:, -1:]
+        self._counts = self._counts.to(sums.dtype) + counts.flatten()
+
+        centers = self._cluster_centers._DNDarray__array.to(sums.dtype)
+        rates = counts / self._counts.unsqueeze(1).clamp(min=1)
+        centers = centers + rates * (sums[:, :-1] / counts.clamp(min=1) - centers)
+
+        return ht.array(centers, device=X.device, comm=X.comm)
+
+    def fit(self, X):
+        """
+        Computes the centroids of a mini-batch k-means clustering.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape = [n_samples, n_features]:
+            Training instances to cluster.
+        """
+        # input sanitation
+        if not isinstance(X, ht.DNDarray):
+            raise ValueError("input needs to be a ht.DNDarray, but was {}".format(type(X)))
+        if not isinstance(self.batch_size, int) or self.batch_size < 1:
+            raise ValueError(
+                "batch_size needs to be a positive int, but was {}".format(self.batch_size)
+            )
+
+        # initialize the clustering
+        self._initialize_cluster_centers(X)
+        self._counts = torch.zeros_like(self._cluster_centers._DNDarray__array[:, 0])
+        self._n_iter = 0
+
+        offset = 0
+        if X.split == 0 and X.comm.is_distributed():
+            offset = X.create_lshape_map()[: X.comm.rank, 0].sum().item()
+        local = X._DNDarray__array
+
+        for epoch in range(self.max_iter):
+            # the drawn indices are identical on all processes, each takes its own rows
+            samples = ht.random.randint(0, X.shape[0], size=(self.batch_size,))._DNDarray__array
+            samples = samples.to(local.device) - offset
+            samples = samples[(samples >= 0) & (samples < local.shape[0])]
+            batch = ht.array(local[samples], is_split=X.split, device=X.device, comm=X.comm)
+
+            self.__step(batch)
+            if self.tol is not None and self._inertia <= self.tol:
+                break
+
+        self._labels = self._assign_to_cluster(X)
+
+        return self
+
+    def partial_fit(self, X):
+        """
+        Updates the centroids with a single mini-batch step on X. The first call initializes the
+        centroids from X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape = [n_samples, n_features]:
+            Chunk of the training instances, e.g. read from a file.
+        """
+        # input sanitation
+        if not isinstance(X, ht.DNDarray):
+            raise ValueError("input needs to be a ht.DNDarray, but was {}".format(type(X)))
+
+        if self._counts is None:
+            self._initialize_cluster_centers(X)
+            self._counts = torch.zeros_like(self._cluster_centers._DNDarray__array[:, 0])
+            self._n_iter = 0
+        self._labels = self.__step(X)
+
+        return self
+
+    def __step(self, batch):
+        """
+        Assigns the points of the mini-batch and updates the centroids.
+        """
+        self._n_iter += 1
+        matching_centroids = self._assign_to_cluster(batch)
+        new_cluster_centers = self._update_centroids(batch, matching_centroids)
+        # centroid movement of this step
+        self._inertia = ((self._cluster_centers - new_cluster_centers) ** 2).sum()
+        self._cluster_centers = new_cluster_centers
+
+        return matching_centroids
@@ -12,6 +12,7 @@ class Spectral(ht.ClusteringMixin, ht.BaseEstimator):
         laplacian="fully_connected",
         threshold=1.0,
         boundary="upper",
+        n_neighbours=10,
         n_lanczos=300,
         assign_labels="kmeans",
         **params
@@ -30,15 +31,21 @@ class Spectral(ht.ClusteringMixin, ht.BaseEstimator):
             'euclidean' : construct the similarity matrix as only euclidean distance
         laplacian : string
             How to calculate the graph laplacian (affinity)
-            Currently supported : 'fully_connected', 'eNeighbour'
+            Currently supported : 'fully_connected', 'eNeighbour', 'kNN'
+            The 'kNN' graph is stored sparsely and its eigenvectors are computed with thick-restart Lanczos, neither
+            the similarity matrix nor the Laplacian is materialized
         threshold : float
             Threshold for affinity matrix if laplacian='eNeighbour'
             Ignorded for laplacian='fully_connected'
         boundary : string
             How to interpret threshold: 'upper', 'lower'
             Ignorded for laplacian='fully_connected'
+        n_neighbours : int
+            Number of nearest neighbours of each point if laplacian='kNN'
+            Ignored otherwise
         n_lanczos : int
-            number of Lanczos iterations for Eigenvalue decomposition
+            number of Lanczos iterations for Eigenvalue decomposition, for laplacian='kNN' the maximal dimension of the
+            Krylov subspace
         assign_labels: str, default = 'kmeans'
              The strategy to use to assign labels in the embedding space.
              'kmeans'
@@ -51,26 +58,34 @@ class Spectral(ht.ClusteringMixin, ht.BaseEstimator):
         self.laplacian = laplacian
         self.threshold = threshold
         self.boundary = boundary
+        self.n_neighbours = n_neighbours
         self.n_lanczos = n_lanczos
         self.assign_labels = assign_labels
 
         if metric == "rbf":
             sig = math.sqrt(1 / (2 * gamma))
             self._laplacian = ht.graph.Laplacian(
-                lambda x: ht.spatial.rbf(x, sigma=sig, quadratic_expansion=True),
+                # the kNN graph applies the kernel to the distances of the neighbours
+                (lambda d: ht.exp(d ** 2 * (-1.0 / (2 * sig ** 2))))
+                if laplacian == "kNN"
+                else (lambda x: ht.spatial.rbf(x, sigma=sig, quadratic_expansion=True)),
                 definition="norm_sym",
                 mode=laplacian,
                 threshold_key=boundary,
                 threshold_value=threshold,
+                neighbours=n_neighbours,
             )
 
         elif metric == "euclidean":
             self._laplacian = ht.graph.Laplacian(
-                lambda x: ht.spatial.cdist(x, quadratic_expansion=True),
+                (lambda d: d)
+                if laplacian == "kNN"
+                else (lambda x: ht.spatial.cdist(x, quadratic_expansion=True)),
                 definition="norm_sym",
                 mode=laplacian,
                 threshold_key=boundary,
                 threshold_value=threshold,
+                neighbours=n_neighbours,
             )
         else:
             raise NotImplementedError("Other kernels currently not supported")
@@ -114,6 +129,12 @@ class Spectral(ht.ClusteringMixin, ht.BaseEstimator):
             split=0,
             device=L.device,
         )
+        if isinstance(L, ht.linalg.LinearOperator):
+            # the sparse Laplacian is only accessible through products, the Krylov basis is kept distributed
+            m = min(self.n_lanczos, L.shape[0])
+            k = self.n_clusters if self.n_clusters is not None else m // 2
+            return ht.linalg.thick_restart_lanczos(L, k, m, v0)
+
         V, T = ht.lanczos(L, self.n_lanczos, v0)
 
         # 4. Calculate and Sort Eigenvalues and Eigenvectors of tridiagonal matrix T
@@ -0,0 +1,95 @@
+import numpy as np
+
+import heat as ht
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+def _reference(x, eps, min_samples, p=2):
+    """
+    Brute force DBSCAN, clusters numbered in the order of their first core point, border points join the cluster
+    of their closest core point.
+    """
+    distances = np.linalg.norm(x[:, None] - x[None], ord=p, axis=2)
+    within = distances <= eps
+    core = within.sum(axis=1) >= min_samples
+    labels = np.full(x.shape[0], -1)
+    n_clusters = 0
+    for i in np.flatnonzero(core):
+        if labels[i] >= 0:
+            continue
+        labels[i] = n_clusters
+        stack = [i]
+        while stack:
+            j = stack.pop()
+            for k in np.flatnonzero(within[j] & core & (labels < 0)):
+                labels[k] = n_clusters
+                stack.append(k)
+        n_clusters += 1
+    for i in np.flatnonzero(~core):
+        neighbours = np.flatnonzero(within[i] & core)
+        if neighbours.size > 0:
+            labels[i] = labels[neighbours[distances[i, neighbours].argmin()]]
+    return labels, np.flatnonzero(core)
+
+
+class TestDBSCAN(TestCase):
+    def test_clusterer(self):
+        dbscan = ht.cluster.DBSCAN()
+        self.assertTrue(ht.is_estimator(dbscan))
+        self.assertEqual(
+            dbscan.get_params(),
+            {"eps": 0.5, "min_samples": 5, "metric": "euclidean", "block_size": 1024},
+        )
+        self.assertIsNone(dbscan.labels_)
+
+    def test_exceptions(self):
+        X = ht.zeros((10, 2), split=0)
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN().fit(X._DNDarray__array)
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN().fit(ht.zeros(10, split=0))
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN(eps=0).fit(X)
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN(min_samples=0).fit(X)
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN(metric="cosine").fit(X)
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN(block_size=0).fit(X)
+        with self.assertRaises(ValueError):
+            ht.cluster.DBSCAN(eps=1e-18).fit(ht.array([[0.0, 0.0, 0.0], [1e3, 1e3, 1e3]], split=0))
+
+    def test_example(self):
+        x = [[1.0, 2.0], [2.0, 2.0], [2.0, 3.0], [8.0, 7.0], [8.0, 8.0], [25.0, 80.0]]
+        for split in [None, 0]:
+            dbscan = ht.cluster.DBSCAN(eps=3, min_samples=2).fit(ht.array(x, split=split))
+            self.assertEqual(dbscan.labels_.split, split)
+            self.assert_array_equal(dbscan.labels_, np.array([0, 0, 0, 1, 1, -1]))
+            self.assert_array_equal(dbscan.core_sample_indices_, np.arange(5))
+
+    def test_blobs(self):
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(7)
+        n = 40 * size + 13
+        centers = np.array([[0.0, 0.0], [4.0, 0.5], [1.0, 5.0]])
+        x = centers[rng.randint(0, 3, n)] + 0.6 * rng.randn(n, 2)
+        x = np.vstack((x, rng.uniform(-3, 7, (size + 5, 2))))
+
+        for metric, p in [("euclidean", 2), ("manhattan", 1)]:
+            expected, core = _reference(x, 0.5, 4, p)
+            for split in [None, 0]:
+                X = ht.array(x, split=split)
+                dbscan = ht.cluster.DBSCAN(eps=0.5, min_samples=4, metric=metric, block_size=16)
+                labels = dbscan.fit_predict(X)
+                self.assertEqual(labels.shape, (x.shape[0],))
+                self.assert_array_equal(labels, expected)
+                self.assert_array_equal(dbscan.core_sample_indices_, core)
+
+    def test_high_density(self):
+        # all points fall into few cells, which are owned by few processes
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(8)
+        x = np.vstack((rng.rand(20 * size, 3) * 0.1, rng.rand(20 * size, 3) * 0.1 + 5.0))
+        X = ht.array(x, split=0)
+        labels = ht.cluster.DBSCAN(eps=0.2, min_samples=3).fit(X).labels_
+        self.assert_array_equal(labels, np.repeat([0, 1], 20 * size))
@@ -67,7 +67,15 @@ class TestKMeans(TestCase):
 
         self.assertEqual(
             params,
-            {"n_clusters": 8, "init": "random", "max_iter": 300, "tol": 1e-4, "random_state": None},
+            {
+                "n_clusters": 8,
+                "init": "random",
+                "max_iter": 300,
+                "tol": 1e-4,
+                "random_state": None,
+                "algorithm": "lloyd",
+                "n_init": 1,
+            },
         )
 
         params["n_clusters"] = 10
@@ -110,6 +118,12 @@ class TestKMeans(TestCase):
         with self.assertRaises(ValueError):
             kmeans = ht.cluster.KMeans(n_clusters=k, init="random_number")
             kmeans.fit(iris_split)
+        with self.assertRaises(ValueError):
+            ht.cluster.KMeans(n_clusters=k, algorithm="full").fit(iris_split)
+        with self.assertRaises(ValueError):
+            ht.cluster.KMeans(n_clusters=k, n_init=0).fit(iris_split)
+        with self.assertRaises(ValueError):
+            ht.cluster.KMeans(n_clusters=k, n_init=2, algorithm="elkan").fit(iris_split)
 
     def test_spherical_clusters(self):
         seed = 1
@@ -150,3 +164,97 @@ class TestKMeans(TestCase):
         kmeans.fit(data)
         self.assertIsInstance(kmeans.cluster_centers_, ht.DNDarray)
         self.assertEqual(kmeans.cluster_centers_.shape, (4, 3))
+
+    def test_update_centroids(self):
+        rng = np.random.RandomState(2)
+        n = 10 * ht.MPI_WORLD.size + 3
+        x_torch = torch.tensor(rng.rand(n, 3), dtype=torch.float32)
+        labels_torch = torch.tensor(rng.randint(0, 3, n))
+        weights_torch = torch.tensor(rng.rand(n), dtype=torch.float32)
+        # the last cluster is empty
+        kmeans = ht.cluster.KMeans(n_clusters=4)
+        kmeans._cluster_centers = ht.ones((4, 3))
+
+        for split in [None, 0]:
+            X = ht.array(x_torch, split=split)
+            labels = ht.array(labels_torch, split=split).expand_dims(1)
+            weights = ht.array(weights_torch, split=split)
+
+            sums = kmeans._accumulate_centroids(X, labels, sample_weight=weights)
+            self.assertEqual(sums.shape, (4, 4))
+            for i in range(4):
+                selection = labels_torch == i
+                w = weights_torch[selection]
+                expected = (x_torch[selection] * w.unsqueeze(1)).sum(dim=0)
+                self.assertTrue(torch.allclose(sums[i, :-1], expected, atol=1e-5))
+                self.assertAlmostEqual(sums[i, -1].item(), w.sum().item(), places=4)
+
+            centers = kmeans._update_centroids(X, labels)
+            self.assertIsInstance(centers, ht.DNDarray)
+            self.assertEqual(centers.split, None)
+            for i in range(3):
+                expected = x_torch[labels_torch == i].mean(dim=0)
+                self.assertTrue(torch.allclose(centers._DNDarray__array[i], expected, atol=1e-5))
+            self.assertTrue((centers._DNDarray__array[3] == 1).all())
+
+    def test_kmeans_parallel_init(self):
+        n = 20 * ht.MPI_WORLD.size
+        data = self.create_spherical_dataset(
+            num_samples_cluster=n, radius=1.0, offset=4.0, dtype=ht.float32, random_state=1
+        )
+        everything = ht.resplit(data, None)._DNDarray__array
+        for split in [None, 0]:
+            kmeans = ht.cluster.KMeans(n_clusters=4, init="kmeans++", random_state=3)
+            kmeans._initialize_cluster_centers(ht.resplit(data, split))
+            centers = kmeans.cluster_centers_
+            self.assertEqual(centers.shape, (4, 3))
+            self.assertEqual(centers.split, None)
+            # the centroids are data points, one in each of the separated clusters
+            centers = centers._DNDarray__array
+            self.assertTrue((torch.cdist(centers, everything).min(dim=1)[0] < 1e-5).all())
+            truth = torch.tensor([[1.0], [2.0], [-1.0], [-2.0]]) * torch.full((1, 3), 4.0)
+            closest = torch.cdist(centers, truth).argmin(dim=1)
+            self.assertEqual(closest.unique().numel(), 4)
+
+    def test_bounded_algorithms(self):
+        n = 30 * ht.MPI_WORLD.size
+        data = self.create_spherical_dataset(
+            num_samples_cluster=n, radius=2.5, offset=2.0, dtype=ht.float64, random_state=1
+        )
+        everything = ht.resplit(data, None)._DNDarray__array
+        init = ht.array(everything[:: everything.shape[0] // 6][:6])
+        for split in [None, 0]:
+            X = ht.resplit(data, split)
+            lloyd = ht.cluster.KMeans(n_clusters=6, init=init, tol=None, max_iter=20).fit(X)
+            for algorithm in ["hamerly", "elkan"]:
+                kmeans = ht.cluster.KMeans(
+                    n_clusters=6, init=init, tol=None, max_iter=20, algorithm=algorithm
+                ).fit(X)
+                # the bounds only skip distances that cannot change the assignment
+                self.assertEqual(kmeans.n_iter_, 20)
+                self.assertEqual(kmeans.labels_.shape, (X.shape[0], 1))
+                self.assertEqual(kmeans.labels_.split, split)
+                self.assertTrue(ht.equal(kmeans.labels_, lloyd.labels_))
+                self.assertTrue(
+                    ht.allclose(kmeans.cluster_centers_, lloyd.cluster_centers_, atol=1e-8)
+                )
+
+    def test_n_init(self):
+        n = 20 * ht.MPI_WORLD.size
+        data = self.create_spherical_dataset(
+            num_samples_cluster=n, radius=1.0, offset=4.0, dtype=ht.float32, random_state=1
+        )
+        for split in [None, 0]:
+            X = ht.resplit(data, split)
+            points = ht.resplit(data, None)._DNDarray__array
+            kmeans = ht.cluster.KMeans(n_clusters=4, n_init=5, random_state=1).fit(X)
+            self.assertEqual(kmeans.cluster_centers_.shape, (4, 3))
+            self.assertEqual(kmeans.labels_.shape, (X.shape[0], 1))
+            self.assertEqual(kmeans.labels_.split, split)
+            # the labels belong to the returned centroids
+            centers = kmeans.cluster_centers_._DNDarray__array
+            distances = torch.cdist(points, centers) ** 2
+            labels = ht.resplit(kmeans.labels_, None)._DNDarray__array.flatten()
+            self.assertTrue(torch.equal(labels, distances.argmin(dim=1)))
+            # inertia_ is the centroid shift of the last epoch, as for a single run
+            self.assertLessEqual(kmeans.inertia_.item(), kmeans.tol)
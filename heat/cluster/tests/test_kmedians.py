@@ -151,3 +151,28 @@ class TestKMedians(TestCase):
         kmedians.fit(data)
         self.assertIsInstance(kmedians.cluster_centers_, ht.DNDarray)
         self.assertEqual(kmedians.cluster_centers_.shape, (4, 3))
+
+    def test_grouped_median(self):
+        rng = np.random.RandomState(4)
+        n = 15 * ht.MPI_WORLD.size + 4
+        # repeated values and an empty cluster
+        x_torch = torch.tensor(rng.randint(0, 6, (n, 3)), dtype=torch.float32)
+        labels_torch = torch.tensor(rng.randint(0, 3, n))
+        kmedians = ht.cluster.KMedians(n_clusters=4)
+        kmedians._cluster_centers = ht.ones((4, 3))
+
+        for split in [None, 0]:
+            X = ht.array(x_torch, split=split)
+            labels = ht.array(labels_torch, split=split).expand_dims(1)
+            medians, counts = kmedians._grouped_median(X, labels)
+            self.assertEqual(medians.shape, (4, 3))
+            self.assertEqual(counts.tolist(), torch.bincount(labels_torch, minlength=4).tolist())
+            for i in range(3):
+                values = x_torch[labels_torch == i].sort(dim=0)[0]
+                m = values.shape[0]
+                expected = (values[(m - 1) // 2] + values[m // 2]) / 2
+                self.assertTrue(torch.equal(medians[i], expected))
+
+            centers = kmedians._update_centroids(X, labels)._DNDarray__array
+            self.assertTrue(torch.equal(centers[:3], medians[:3]))
+            self.assertTrue((centers[3] == 1).all())
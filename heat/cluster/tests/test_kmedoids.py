@@ -173,3 +173,30 @@ class TestKMeans(TestCase):
             self.assertTrue(
                 ht.any(ht.sum(ht.abs(kmedoid.cluster_centers_[i, :] - data), axis=1) == 0)
             )
+
+    def test_medoid_update(self):
+        rng = np.random.RandomState(4)
+        n = 15 * ht.MPI_WORLD.size + 4
+        # repeated values and an empty cluster
+        x_torch = torch.tensor(rng.randint(0, 6, (n, 3)), dtype=torch.float32)
+        labels_torch = torch.tensor(rng.randint(0, 3, n))
+        kmedoids = ht.cluster.KMedoids(n_clusters=4)
+        kmedoids._cluster_centers = ht.ones((4, 3))
+
+        for split in [None, 0]:
+            X = ht.array(x_torch, split=split)
+            labels = ht.array(labels_torch, split=split).expand_dims(1)
+            medians, _ = kmedoids._grouped_median(X, labels)
+
+            # the medoids are the samples closest to the medians
+            medoids = kmedoids._update_centroids(X, labels)._DNDarray__array
+            distances = torch.cdist(medians[:3], x_torch, p=1)
+            self.assertTrue(
+                torch.equal(torch.cdist(medoids[:3], x_torch, p=1).min(dim=1)[0], torch.zeros(3))
+            )
+            self.assertTrue(
+                torch.allclose(
+                    torch.cdist(medians[:3], medoids[:3], p=1).diagonal(), distances.min(dim=1)[0]
+                )
+            )
+            self.assertTrue((medoids[3] == 1).all())
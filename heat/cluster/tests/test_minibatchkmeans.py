@@ -0,0 +1,107 @@
+import torch
+
+import heat as ht
+
+from ...core.tests.test_suites.basic_test import TestCase
+
+
+class TestMiniBatchKMeans(TestCase):
+    def create_spherical_dataset(
+        self, num_samples_cluster, radius=1.0, offset=4.0, dtype=ht.float32, random_state=1
+    ):
+        """
+        Creates k=4 sperical clusters in 3D space along the space-diagonal
+
+        Parameters
+        ----------
+        num_samples_cluster: int
+            Number of samples per cluster. Each process will create n // MPI_WORLD.size elements for each cluster
+        radius: float
+            Radius of the sphere
+        offset: float
+            Shift of the clusters along the axes. The 4 clusters will be positioned centered around c1=(offset, offset,offset),
+            c2=(2*offset,2*offset,2*offset), c3=(-offset, -offset, -offset) and c4=(2*offset, -2*offset, -2*offset)
+        dtype: ht.datatype
+        random_state: int
+            seed of the torch random number generator
+        """
+        # contains num_samples
+
+        p = ht.MPI_WORLD.size
+        # create k sperical clusters with each n elements per cluster. Each process creates k * n/p elements
+        num_ele = num_samples_cluster // p
+        ht.random.seed(random_state)
+        # radius between 0 and 1
+        r = ht.random.rand(num_ele, split=0) * radius
+        # theta between 0 and pi
+        theta = ht.random.rand(num_ele, split=0) * 3.1415
+        # phi between 0 and 2pi
+        phi = ht.random.rand(num_ele, split=0) * 2 * 3.1415
+        # Cartesian coordinates
+        x = r * ht.sin(theta) * ht.cos(phi)
+        x.astype(dtype, copy=False)
+        y = r * ht.sin(theta) * ht.sin(phi)
+        y.astype(dtype, copy=False)
+        z = r * ht.cos(theta)
+        z.astype(dtype, copy=False)
+
+        cluster1 = ht.stack((x + offset, y + offset, z + offset), axis=1)
+        cluster2 = ht.stack((x + 2 * offset, y + 2 * offset, z + 2 * offset), axis=1)
+        cluster3 = ht.stack((x - offset, y - offset, z - offset), axis=1)
+        cluster4 = ht.stack((x - 2 * offset, y - 2 * offset, z - 2 * offset), axis=1)
+
+        data = ht.concatenate((cluster1, cluster2, cluster3, cluster4), axis=0)
+        # Note: enhance when shuffel is available
+        return data
+
+    def test_clusterer(self):
+        kmeans = ht.cluster.MiniBatchKMeans()
+        self.assertTrue(ht.is_estimator(kmeans))
+        self.assertTrue(ht.is_clusterer(kmeans))
+        self.assertEqual(kmeans.get_params()["batch_size"], 1024)
+
+    def test_spherical_clusters(self):
+        n = 100 * ht.MPI_WORLD.size
+        data = self.create_spherical_dataset(
+            num_samples_cluster=n, radius=1.0, offset=4.0, dtype=ht.float32, random_state=1
+        )
+        truth = torch.tensor([[1.0], [2.0], [-1.0], [-2.0]]) * torch.full((1, 3), 4.0)
+        everything = ht.resplit(data, None)._DNDarray__array
+        order = torch.randperm(everything.shape[0], generator=torch.Generator().manual_seed(0))
+        shuffled = everything[order]
+
+        for split in [None, 0]:
+            X = ht.resplit(data, split)
+            kmeans = ht.cluster.MiniBatchKMeans(
+                n_clusters=4, init="kmeans++", max_iter=30, batch_size=64, random_state=2
+            )
+            kmeans.fit(X)
+            self.assertEqual(kmeans.cluster_centers_.shape, (4, 3))
+            self.assertEqual(kmeans.labels_.shape, (X.shape[0], 1))
+            self.assertLessEqual(kmeans.n_iter_, 30)
+            # every centroid is the running mean of points of one of the separated clusters
+            centers = kmeans.cluster_centers_._DNDarray__array
+            distances, closest = torch.cdist(centers, truth).min(dim=1)
+            self.assertEqual(closest.unique().numel(), 4)
+            self.assertTrue((distances < 1.0).all())
+
+            # the same clustering from shuffled chunks of the data
+            streamed = ht.cluster.MiniBatchKMeans(n_clusters=4, init="kmeans++", random_state=2)
+            chunk = X.shape[0] // 5
+            for start in range(0, X.shape[0], chunk):
+                piece = ht.array(shuffled[start : start + chunk], split=split)
+                self.assertIs(streamed.partial_fit(piece), streamed)
+            self.assertEqual(streamed.labels_.shape, (chunk, 1))
+            centers = streamed.cluster_centers_._DNDarray__array
+            distances, closest = torch.cdist(centers, truth).min(dim=1)
+            self.assertEqual(closest.unique().numel(), 4)
+            self.assertTrue((distances < 1.0).all())
+
+    def test_exceptions(self):
+        kmeans = ht.cluster.MiniBatchKMeans(batch_size=0)
+        with self.assertRaises(ValueError):
+            kmeans.fit(ht.zeros((10, 2)))
+        with self.assertRaises(ValueError):
+            kmeans.fit(torch.zeros((10, 2)))
+        with self.assertRaises(ValueError):
+            kmeans.partial_fit(torch.zeros((10, 2)))
@@ -25,6 +25,7 @@ class TestSpectral(TestCase):
                 "laplacian": "fully_connected",
                 "threshold": 1.0,
                 "boundary": "upper",
+                "n_neighbours": 10,
                 "n_lanczos": 300,
                 "assign_labels": "kmeans",
             },
@@ -63,6 +64,17 @@ class TestSpectral(TestCase):
         labels = spectral.fit_predict(iris)
         self.assertIsInstance(labels, ht.DNDarray)
 
+        spectral = ht.cluster.Spectral(
+            n_clusters=3, metric="rbf", laplacian="kNN", n_neighbours=10, n_lanczos=m
+        )
+        labels = spectral.fit_predict(iris)
+        self.assertIsInstance(labels, ht.DNDarray)
+        self.assertEqual(labels.shape, (iris.shape[0], 1))
+
+        spectral = ht.cluster.Spectral(metric="euclidean", laplacian="kNN", n_lanczos=m)
+        spectral.fit(iris)
+        self.assertIsInstance(spectral.labels_, ht.DNDarray)
+
         kmeans = {"kmeans++": "kmeans++", "max_iter": 30, "tol": -1}
         spectral = ht.cluster.Spectral(
             n_clusters=3, gamma=1.0, normalize=True, n_lanczos=m, params=kmeans
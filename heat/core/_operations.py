@@ -443,3 +443,33 @@ def __reduce_op(x, partial_op, reduction_op, neutral=None, **kwargs):
         device=x.device,
         comm=x.comm,
     )
+
+
+def _searchsorted(sorted_sequence, values, right=False):
+    """
+    Indices into the sorted 1-D tensor sorted_sequence at which the elements of values would be inserted to keep it
+    sorted, like torch.searchsorted. Falls back to a vectorized binary search for torch versions without it.
+
+    Parameters
+    ----------
+    sorted_sequence : torch.Tensor
+        1-D tensor in ascending order
+    values : torch.Tensor
+        The values to insert
+    right : bool, optional
+        If True, the indices after equal elements are returned, otherwise those before them
+    """
+    if hasattr(torch, "searchsorted"):
+        return torch.searchsorted(sorted_sequence, values, right=right)
+
+    length = sorted_sequence.shape[0]
+    low = torch.zeros(values.shape, dtype=torch.int64, device=values.device)
+    high = torch.full(values.shape, length, dtype=torch.int64, device=values.device)
+    for _ in range(length.bit_length()):
+        middle = (low + high) // 2
+        pivots = sorted_sequence[middle.clamp(max=max(length - 1, 0))]
+        after = (pivots <= values) if right else (pivots < values)
+        active = low < high
+        low = torch.where(active & after, middle + 1, low)
+        high = torch.where(active & ~after, middle, high)
+    return low
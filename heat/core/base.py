@@ -225,6 +225,53 @@ class RegressionMixin:
         raise NotImplementedError()
 
 
+class TransformMixin:
+    """
+    Mixin for all transformations in Heat.
+    """
+
+    def fit(self, X):
+        """
+        Fits the transformation model.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape=(n_samples, n_features)
+            Training instances to train on.
+        """
+        raise NotImplementedError()
+
+    def fit_transform(self, X):
+        """
+        Fits the transformation model and transforms the training instances.
+
+        Convenience method; equivalent to calling fit(X) followed by transform(X).
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape = [n_samples, n_features]
+            Input data to be transformed.
+
+        Returns
+        -------
+        ht.DNDarray, shape = [n_samples, n_features]
+            Transformed data.
+        """
+        self.fit(X)
+        return self.transform(X)
+
+    def transform(self, X):
+        """
+        Transforms the input data.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape = [n_samples, n_features]
+            Values to transform.
+        """
+        raise NotImplementedError()
+
+
 def is_classifier(estimator):
     """
     Return True if the given estimator is a classifier.
@@ -290,3 +337,20 @@ def is_regressor(estimator):
         True if estimator is a regressor and False otherwise.
     """
     return isinstance(estimator, RegressionMixin)
+
+
+def is_transformer(estimator):
+    """
+    Return True if the given estimator is a transformer.
+
+    Parameters
+    ----------
+    estimator : object
+        Estimator object to test.
+
+    Returns
+    -------
+    out : bool
+        True if estimator is a transformer and False otherwise.
+    """
+    return isinstance(estimator, TransformMixin)
@@ -1192,5 +1192,45 @@ def use_comm(comm=None):
     __default_comm = sanitize_comm(comm)
 
 
+def _alltoallv(comm, send, send_counts, recv_counts):
+    """
+    Sends consecutive rows of send, send_counts[i] of them to process i, and returns the received
+    rows.
+    """
+    send_counts, recv_counts = send_counts.tolist(), recv_counts.tolist()
+    recv = torch.empty(
+        (sum(recv_counts),) + tuple(send.shape[1:]), dtype=send.dtype, device=send.device
+    )
+    comm.Alltoallv(
+        (send.contiguous(), send_counts, _displacements(send_counts)),
+        (recv, recv_counts, _displacements(recv_counts)),
+    )
+    return recv
+
+
+def _displacements(counts):
+    """
+    Displacements of consecutive blocks of the given counts.
+    """
+    displacements = [0] * len(counts)
+    for i in range(1, len(counts)):
+        displacements[i] = displacements[i - 1] + counts[i - 1]
+    return displacements
+
+
+def _exchange(comm, owners, *tensors):
+    """
+    Sends every row of the tensors to the process given by owners. Returns the received rows grouped
+    by sender, the order in which the rows were sent and the send and receive counts, so that an
+    answer can be sent back.
+    """
+    order = owners.argsort()
+    send_counts = torch.bincount(owners, minlength=comm.size).cpu()
+    recv_counts = torch.empty_like(send_counts)
+    comm.Alltoall(send_counts, recv_counts)
+    received = [_alltoallv(comm, tensor[order], send_counts, recv_counts) for tensor in tensors]
+    return received, order, send_counts, recv_counts
+
+
 # tensor is imported at the very end to break circular dependency
 from . import dndarray
@@ -1,3 +1,5 @@
 from .basics import *
 from .solver import *
+from .factorizations import *
+from .operators import *
 from .qr import *
@@ -0,0 +1,483 @@
+import collections
+import torch
+
+from .. import dndarray
+from .. import factories
+from .. import manipulations
+from .. import tiling
+from .. import types
+
+__all__ = ["cho_solve", "cholesky", "lu", "solve_triangular"]
+
+
+def cholesky(a, upper=False, tiles_per_proc=2):
+    """
+    Calculates the Cholesky decomposition of a symmetric positive definite 2D DNDarray.
+    Factor the matrix `a` as `l @ l.T`, where `l` is lower-triangular.
+
+    Parameters
+    ----------
+    a : DNDarray
+        Symmetric positive definite matrix of shape (n, n)
+    upper : bool, optional
+        if True, the upper-triangular factor `u = l.T` with `a = u.T @ u` is returned,
+        default: False
+    tiles_per_proc : int, optional
+        number of tile columns per process, default: 2
+
+    Returns
+    -------
+    DNDarray
+        The triangular factor, distributed like `a`
+
+    Notes
+    -----
+    The distributed decomposition is a blocked right-looking Cholesky factorization on the tile
+    columns of a ``tiling.SquareDiagTiles`` object. The panel of each tile column is factorized
+    by its owner and broadcast to the other processes. The next panel is factorized before the
+    remaining trailing update of the current one, so that its non-blocking broadcast overlaps
+    with the trailing update on all processes.
+    As `a` is symmetric, the local rows of a matrix with ``split=0`` are used as local columns
+    without any redistribution, the lower factor is returned for ``split=0`` after a resplit
+    though, which is not required for the upper one.
+
+    References
+    ----------
+    [1] Gene H. Golub and Charles F. Van Loan. 1996. Matrix Computations (3rd Ed.).
+
+    Examples
+    --------
+    >>> a = ht.array([[4.0, 2.0], [2.0, 5.0]], split=0)
+    >>> ht.linalg.cholesky(a)
+    tensor([[2., 0.],
+            [1., 2.]])
+    """
+    __check_square(a)
+    if not isinstance(upper, bool):
+        raise TypeError("upper must be a bool, currently {}".format(type(upper)))
+    dtype = types.promote_types(a.dtype, types.float32)
+
+    if a.split is None:
+        factor = torch.cholesky(a._DNDarray__array.to(dtype.torch_type()), upper=upper)
+        return factories.array(factor, dtype=dtype, device=a.device, comm=a.comm)
+
+    # the local rows of the symmetric matrix are the local columns of its transpose
+    local = a._DNDarray__array.t() if a.split == 0 else a._DNDarray__array
+    local = local.to(dtype.torch_type(), copy=True, memory_format=torch.contiguous_format)
+    factor = dndarray.DNDarray(local, a.gshape, dtype, 1, a.device, a.comm)
+    tiles = tiling.SquareDiagTiles(factor, tiles_per_proc=tiles_per_proc)
+
+    __blocked_factorization(tiles, __cholesky_panel, __cholesky_update)
+
+    if not upper:
+        return factor if a.split == 1 else manipulations.resplit(factor, 0)
+    factor = dndarray.DNDarray(
+        factor._DNDarray__array.t().contiguous(), a.gshape, dtype, 0, a.device, a.comm
+    )
+    return factor if a.split == 0 else manipulations.resplit(factor, 1)
+
+
+def lu(a, tiles_per_proc=2):
+    """
+    Calculates the LU decomposition with partial pivoting of a square 2D DNDarray.
+    Factor the row permuted matrix `a[perm]` as `l @ u`, where `l` is unit lower-triangular and
+    `u` is upper-triangular.
+
+    Parameters
+    ----------
+    a : DNDarray
+        Matrix of shape (n, n)
+    tiles_per_proc : int, optional
+        number of tile columns per process, default: 2
+
+    Returns
+    -------
+    namedtuple of perm, L and U
+        `perm` is a not distributed DNDarray with the row permutation, `L` and `U` are
+        distributed like `a`
+
+    Notes
+    -----
+    The distributed decomposition is a blocked right-looking LU factorization on the tile columns
+    of a ``tiling.SquareDiagTiles`` object of `a` with ``split=1``. Thereby, the pivot search of a
+    panel is local to its owner. The panel factors and pivots are broadcast to all other processes,
+    which apply the row interchanges and the trailing update to their local columns. The next panel
+    is factorized before the remaining trailing update of the current one, so that its non-blocking
+    broadcast overlaps with the trailing update on all processes.
+    Matrices with ``split=0`` are resplit, and so are their factors.
+
+    References
+    ----------
+    [1] Gene H. Golub and Charles F. Van Loan. 1996. Matrix Computations (3rd Ed.).
+
+    Examples
+    --------
+    >>> a = ht.array([[1.0, 2.0], [3.0, 4.0]], split=1)
+    >>> perm, l, u = ht.linalg.lu(a)
+    >>> perm
+    tensor([1, 0])
+    >>> l
+    tensor([[1.0000, 0.0000],
+            [0.3333, 1.0000]])
+    >>> u
+    tensor([[3.0000, 4.0000],
+            [0.0000, 0.6667]])
+    """
+    __check_square(a)
+    dtype = types.promote_types(a.dtype, types.float32)
+    n = a.gshape[0]
+    LU = collections.namedtuple("LU", "perm, L, U")
+
+    if a.split is None:
+        factor, pivots = torch.lu(a._DNDarray__array.to(dtype.torch_type()))
+        perm = __pivots_to_permutation(pivots, n)
+        lower = torch.tril(factor, -1)
+        lower.diagonal().fill_(1)
+        return LU(
+            factories.array(perm, device=a.device, comm=a.comm),
+            factories.array(lower, device=a.device, comm=a.comm),
+            factories.array(torch.triu(factor), device=a.device, comm=a.comm),
+        )
+
+    factor = manipulations.resplit(a, 1) if a.split == 0 else a
+    local = factor._DNDarray__array.to(dtype.torch_type(), copy=True)
+    factor = dndarray.DNDarray(local, a.gshape, dtype, 1, a.device, a.comm)
+    tiles = tiling.SquareDiagTiles(factor, tiles_per_proc=tiles_per_proc)
+
+    perm = __blocked_factorization(tiles, __lu_panel, __lu_update, pivoting=True)
+
+    offset = tiles.lshape_map[: a.comm.rank, 1].sum().item()
+    local = factor._DNDarray__array
+    lower = torch.tril(local, -offset - 1)
+    lower[offset : offset + local.shape[1]].diagonal().fill_(1)
+    upper = torch.triu(local, -offset)
+    lower = dndarray.DNDarray(lower, a.gshape, dtype, 1, a.device, a.comm)
+    upper = dndarray.DNDarray(upper, a.gshape, dtype, 1, a.device, a.comm)
+    if a.split == 0:
+        lower, upper = manipulations.resplit(lower, 0), manipulations.resplit(upper, 0)
+
+    return LU(factories.array(perm, device=a.device, comm=a.comm), lower, upper)
+
+
+def solve_triangular(a, b, upper=True, transpose=False, unitriangular=False):
+    """
+    Solves the system of equations `a @ x = b` for x, where `a` is a triangular matrix.
+
+    Parameters
+    ----------
+    a : DNDarray
+        Triangular matrix of shape (n, n)
+    b : DNDarray
+        Right hand side(s) of shape (n,) or (n, k)
+    upper : bool, optional
+        whether `a` is upper- or lower-triangular, default: True
+    transpose : bool, optional
+        if True, `a.T @ x = b` is solved instead, default: False
+    unitriangular : bool, optional
+        if True, the diagonal elements of `a` are assumed to be 1, default: False
+
+    Returns
+    -------
+    DNDarray
+        Solution x, distributed like `b`
+
+    Notes
+    -----
+    If the local part of `a` holds rows of the (transposed) matrix, the processes solve for their
+    diagonal blocks in turn and broadcast the solution, which is used by the remaining processes
+    to update their right hand side. If it holds columns, the right hand side is passed on from
+    process to process, each of which solves for its diagonal block and applies its columns.
+
+    Examples
+    --------
+    >>> a = ht.array([[2.0, 0.0], [1.0, 1.0]], split=0)
+    >>> b = ht.array([2.0, 3.0], split=0)
+    >>> ht.linalg.solve_triangular(a, b, upper=False)
+    tensor([1., 2.])
+    """
+    __check_square(a)
+    if not isinstance(b, dndarray.DNDarray):
+        raise TypeError("b must be a DNDarray, currently {}".format(type(b)))
+    if b.ndim not in [1, 2] or b.gshape[0] != a.gshape[0]:
+        raise ValueError(
+            "b must be of shape ({0},) or ({0}, k), currently {1}".format(a.gshape[0], b.gshape)
+        )
+    for name, value in [
+        ("upper", upper),
+        ("transpose", transpose),
+        ("unitriangular", unitriangular),
+    ]:
+        if not isinstance(value, bool):
+            raise TypeError("{} must be a bool, currently {}".format(name, type(value)))
+
+    dtype = types.promote_types(types.promote_types(a.dtype, b.dtype), types.float32)
+    torch_type = dtype.torch_type()
+    rhs = b if b.split is None else manipulations.resplit(b, None)
+    rhs = rhs._DNDarray__array.to(torch_type, copy=True)
+    rhs = rhs.unsqueeze(1) if b.ndim == 1 else rhs
+    local = a._DNDarray__array.to(torch_type)
+
+    if a.split is None:
+        x = torch.triangular_solve(rhs, local, upper, transpose, unitriangular)[0]
+    else:
+        # the triangular solve works on the local part of op(a) = a.T if transpose else a
+        local = local.t() if transpose else local
+        lower = upper == transpose
+        counts = a.create_lshape_map()[:, a.split].tolist()
+        displs = [sum(counts[:i]) for i in range(len(counts))]
+        if (a.split == 0) != transpose:
+            x = __row_solve(local, rhs, lower, unitriangular, counts, displs, a.comm)
+        else:
+            x = __column_solve(local, rhs, lower, unitriangular, counts, displs, a.comm)
+
+    x = x.squeeze(1) if b.ndim == 1 else x
+    return factories.array(x, dtype=dtype, split=b.split, device=b.device, comm=b.comm)
+
+
+def cho_solve(c, b, upper=False):
+    """
+    Solves the system of equations `a @ x = b` for x, given the Cholesky factor `c` of `a`.
+
+    Parameters
+    ----------
+    c : DNDarray
+        Cholesky factor of `a` as returned by ``ht.linalg.cholesky``
+    b : DNDarray
+        Right hand side(s) of shape (n,) or (n, k)
+    upper : bool, optional
+        whether `c` is the upper factor `a = c.T @ c` or the lower one `a = c @ c.T`,
+        default: False
+
+    Returns
+    -------
+    DNDarray
+        Solution x, distributed like `b`
+
+    Examples
+    --------
+    >>> a = ht.array([[4.0, 2.0], [2.0, 5.0]], split=0)
+    >>> b = ht.array([6.0, 7.0], split=0)
+    >>> ht.linalg.cho_solve(ht.linalg.cholesky(a), b)
+    tensor([1., 1.])
+    """
+    y = solve_triangular(c, b, upper=upper, transpose=upper)
+    return solve_triangular(c, y, upper=upper, transpose=not upper)
+
+
+def __check_square(a):
+    """
+    Raises if `a` is not a square 2D DNDarray.
+    """
+    if not isinstance(a, dndarray.DNDarray):
+        raise TypeError("'a' must be a DNDarray, currently {}".format(type(a)))
+    if a.ndim != 2 or a.gshape[0] != a.gshape[1]:
+        raise ValueError("'a' must be a square 2D DNDarray, currently {}".format(a.gshape))
+
+
+def __pivots_to_permutation(pivots, m):
+    """
+    Converts the 1-based sequential row interchanges of torch.lu into a permutation of m rows.
+    """
+    perm = torch.arange(m, device=pivots.device)
+    for i, p in enumerate(pivots.tolist()):
+        perm[[i, p - 1]] = perm[[p - 1, i]]
+    return perm
+
+
+def __blocked_factorization(tiles, factorize_panel, update, pivoting=False):
+    """
+    Blocked right-looking factorization with look-ahead of the column distributed, tiled square
+    array in place.
+
+    Parameters
+    ----------
+    tiles : tiling.SquareDiagTiles
+        tiles of the array with split=1
+    factorize_panel : function
+        factorize_panel(local, start, stop, offset) factorizes the up-to-date local tile column
+        [start, stop) and returns its part from the diagonal downwards (and the row permutation
+        of the rows from start on if pivoting)
+    update : function
+        update(local, panel, start, offset, first, last) applies the panel of the tile column
+        starting at start to the global columns [first, last) of the local columns, which begin
+        at offset
+    pivoting : bool
+        whether the panels are permuting rows
+
+    Returns
+    -------
+    torch.Tensor or None
+        global row permutation if pivoting
+    """
+    arr = tiles.arr
+    comm = arr.comm
+    rank = comm.rank
+    n = arr.gshape[0]
+    local = arr._DNDarray__array
+    offset = tiles.lshape_map[:rank, 1].sum().item()
+    end = offset + local.shape[1]
+
+    # tile columns (start, stop, owner), empty tiles of small arrays are skipped
+    starts = [min(int(c), n) for c in tiles.col_indices] + [n]
+    owners = tiles.tile_map[0, :, 2].tolist()
+    columns = [
+        (starts[i], starts[i + 1], owners[i])
+        for i in range(len(owners))
+        if starts[i] < starts[i + 1]
+    ]
+    perm = torch.arange(n, device=local.device) if pivoting else None
+
+    def post(k):
+        # the owner factorizes the panel, the others receive it with a non-blocking broadcast
+        start, stop, owner = columns[k]
+        if rank == owner:
+            buffers = factorize_panel(local, start, stop, offset)
+        else:
+            buffers = torch.empty((n - start, stop - start), dtype=local.dtype, device=local.device)
+            if pivoting:
+                buffers = (buffers, torch.empty(n - start, dtype=torch.int64, device=local.device))
+        buffers = buffers if pivoting else (buffers,)
+        return buffers, [comm.Ibcast(buf, root=owner) for buf in buffers]
+
+    buffers, requests = post(0)
+    for k, (start, stop, owner) in enumerate(columns):
+        for request in requests:
+            request.wait()
+        panel = buffers[0]
+        if not torch.isfinite(panel[0, 0]):
+            raise RuntimeError("factorization failed at column {}".format(start))
+        if pivoting:
+            rows = buffers[1]
+            perm[start:] = perm[start:][rows]
+            if rank == owner:
+                own = local[start:, start - offset : stop - offset].clone()
+            local[start:] = local[start:][rows]
+            if rank == owner:
+                local[start:, start - offset : stop - offset] = own
+
+        remaining = max(stop, offset)
+        if k + 1 < len(columns):
+            next_start, next_stop, next_owner = columns[k + 1]
+            if rank == next_owner:
+                # look-ahead: the next tile column is updated first to factorize it early
+                update(local, panel, start, offset, next_start, next_stop)
+                remaining = next_stop
+            buffers, requests = post(k + 1)
+        if remaining < end:
+            update(local, panel, start, offset, remaining, end)
+
+    return perm
+
+
+def __cholesky_panel(local, start, stop, offset):
+    """
+    Cholesky factorization of the tile column [start, stop) of the local columns, the part below
+    the diagonal tile is solved with the transposed diagonal factor. A failure is signalled to the
+    other processes with a non-finite panel.
+    """
+    panel = local[:, start - offset : stop - offset]
+    try:
+        diag = torch.cholesky(panel[start:stop])
+    except RuntimeError:
+        shape = (local.shape[0] - start, stop - start)
+        return torch.full(shape, float("nan"), dtype=local.dtype, device=local.device)
+    panel[:start] = 0
+    panel[start:stop] = diag
+    panel[stop:] = torch.triangular_solve(panel[stop:].t(), diag, upper=False)[0].t()
+    # the broadcast buffer must not be a view with a storage offset
+
+    return panel[start:].clone(memory_format=torch.contiguous_format)
+
+
+def __cholesky_update(local, panel, start, offset, first, last):
+    """
+    Symmetric trailing update of the global columns [first, last) with the panel of the tile
+    column starting at start, only the rows from the diagonal block downwards are updated.
+    """
+    columns = local[first:, first - offset : last - offset]
+    columns -= panel[first - start :] @ panel[first - start : last - start].t()
+
+
+def __lu_panel(local, start, stop, offset):
+    """
+    LU factorization with partial pivoting of the tile column [start, stop) of the local columns
+    from the diagonal downwards. Returns the packed factors and the row permutation.
+    """
+    factor, pivots = torch.lu(local[start:, start - offset : stop - offset])
+    local[start:, start - offset : stop - offset] = factor
+    rows = __pivots_to_permutation(pivots, local.shape[0] - start)
+
+    return factor.clone(memory_format=torch.contiguous_format), rows
+
+
+def __lu_update(local, panel, start, offset, first, last):
+    """
+    Computes the block row of U of the global columns [first, last) with the panel of the tile
+    column starting at start and applies the trailing update below it.
+    """
+    width = panel.shape[1]
+    columns = local[start:, first - offset : last - offset]
+    columns[:width] = torch.triangular_solve(
+        columns[:width], panel[:width], upper=False, unitriangular=True
+    )[0]
+    columns[width:] -= panel[width:] @ columns[:width]
+
+
+def __row_solve(local, rhs, lower, unitriangular, counts, displs, comm):
+    """
+    Triangular solve with the local rows of a row distributed matrix. The processes solve for
+    their diagonal block in turn and broadcast it, the right hand side of the processes with
+    unsolved rows is updated in place.
+    """
+    rank = comm.rank
+    begin, end = displs[rank], displs[rank] + counts[rank]
+    x = torch.empty_like(rhs)
+    order = range(comm.size) if lower else reversed(range(comm.size))
+
+    for pr in order:
+        start, stop = displs[pr], displs[pr] + counts[pr]
+        if start == stop:
+            continue
+        # the communication buffers must not be views with a storage offset
+        if rank == pr:
+            block = torch.triangular_solve(
+                rhs[start:stop], local[:, start:stop], not lower, False, unitriangular
+            )[0].contiguous()
+        else:
+            block = torch.empty_like(rhs[start:stop])
+        comm.Bcast(block, root=pr)
+        x[start:stop] = block
+        if (rank > pr if lower else rank < pr) and begin < end:
+            rhs[begin:end] -= local[:, start:stop] @ x[start:stop]
+
+    return x
+
+
+def __column_solve(local, rhs, lower, unitriangular, counts, displs, comm):
+    """
+    Triangular solve with the local columns of a column distributed matrix. The right hand side
+    is passed on from process to process, each of which solves for its diagonal block and
+    updates the right hand side of the unsolved rows with its columns.
+    """
+    rank = comm.rank
+    start, stop = displs[rank], displs[rank] + counts[rank]
+    previous, following = (rank - 1, rank + 1) if lower else (rank + 1, rank - 1)
+    pending = slice(start, None) if lower else slice(0, stop)
+    unsolved = slice(stop, None) if lower else slice(0, start)
+
+    # the communication buffers must not be views with a storage offset
+    if 0 <= previous < comm.size:
+        received = torch.empty_like(rhs[pending])
+        comm.Recv(received, source=previous)
+        rhs[pending] = received
+    own = rhs[start:stop]
+    if start < stop:
+        own = torch.triangular_solve(own, local[start:stop], not lower, False, unitriangular)[0]
+        rhs[unsolved] -= local[unsolved] @ own
+    if 0 <= following < comm.size:
+        comm.Send(rhs[unsolved].clone(), dest=following)
+
+    x = torch.empty_like(rhs)
+    comm.Allgatherv(own.contiguous(), (x, counts, displs), recv_axis=0)
+
+    return x
@@ -0,0 +1,209 @@
+from .. import communication
+from .. import devices
+from .. import dndarray
+from .. import types
+from . import basics
+
+__all__ = ["LinearOperator", "aslinearoperator"]
+
+
+class LinearOperator:
+    """
+    Matrix-free linear operator A of shape (m, n), that is only accessible through its action on distributed vectors.
+    Graph Laplacians, kernel matrices or any other implicitly given matrices can be passed to the iterative solvers in
+    ``ht.linalg`` without materializing them.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Global shape (m, n) of the operator
+    matvec : function
+        Function that maps a 1D ht.DNDarray x of length n to the 1D ht.DNDarray A @ x of length m
+    rmatvec : function, optional
+        Function that maps a 1D ht.DNDarray y of length m to the 1D ht.DNDarray A.T @ y of length n
+    dtype : ht.dtype, optional
+        Data type of the operator, default: ht.float32
+    split : None or 0, optional
+        Distribution of the vectors the operator acts on and returns, default: None
+    device : str or ht.Device, optional
+        Device of the vectors the operator acts on
+    comm : Communication, optional
+        Communicator of the vectors the operator acts on
+
+    Examples
+    --------
+    >>> A = 2 * ht.eye(4, split=0)
+    >>> op = ht.linalg.LinearOperator(A.shape, lambda x: A @ x, split=0)
+    >>> op @ ht.ones(4, split=0)
+    tensor([2., 2., 2., 2.])
+    """
+
+    def __init__(
+        self, shape, matvec, rmatvec=None, dtype=types.float32, split=None, device=None, comm=None
+    ):
+        if len(shape) != 2:
+            raise ValueError("shape needs to be 2-dimensional, but was {}".format(shape))
+        if not callable(matvec):
+            raise TypeError("matvec needs to be callable, but was {}".format(type(matvec)))
+        if rmatvec is not None and not callable(rmatvec):
+            raise TypeError("rmatvec needs to be callable, but was {}".format(type(rmatvec)))
+        if split not in [None, 0]:
+            raise ValueError("split needs to be None or 0, but was {}".format(split))
+
+        self.__shape = tuple(int(ele) for ele in shape)
+        self.__matvec = matvec
+        self.__rmatvec = rmatvec
+        self.__dtype = types.canonical_heat_type(dtype)
+        self.__split = split
+        self.__device = devices.sanitize_device(device)
+        self.__comm = communication.sanitize_comm(comm)
+
+    @property
+    def shape(self):
+        """
+        Returns the global shape (m, n) of the operator.
+        """
+        return self.__shape
+
+    @property
+    def ndim(self):
+        """
+        Returns the number of dimensions of the operator, always 2.
+        """
+        return 2
+
+    @property
+    def dtype(self):
+        """
+        Returns the data type of the operator.
+        """
+        return self.__dtype
+
+    @property
+    def split(self):
+        """
+        Returns the distribution of the vectors the operator acts on.
+        """
+        return self.__split
+
+    @property
+    def device(self):
+        """
+        Returns the device of the vectors the operator acts on.
+        """
+        return self.__device
+
+    @property
+    def comm(self):
+        """
+        Returns the communicator of the vectors the operator acts on.
+        """
+        return self.__comm
+
+    @property
+    def T(self):
+        """
+        Returns the transposed operator, requires rmatvec.
+        """
+        if self.__rmatvec is None:
+            raise NotImplementedError("rmatvec is required for the transposed operator")
+        return LinearOperator(
+            self.__shape[::-1],
+            self.__rmatvec,
+            self.__matvec,
+            self.__dtype,
+            self.__split,
+            self.__device,
+            self.__comm,
+        )
+
+    def matvec(self, x):
+        """
+        Applies the operator to the vector x.
+
+        Parameters
+        ----------
+        x : ht.DNDarray
+            1D vector of length n
+
+        Returns
+        -------
+        ht.DNDarray
+            1D vector A @ x of length m
+        """
+        if not isinstance(x, dndarray.DNDarray):
+            raise TypeError("x needs to be a ht.DNDarray, but was {}".format(type(x)))
+        if x.shape != (self.__shape[1],):
+            raise ValueError(
+                "x needs to be a vector of length {}, but was {}".format(self.__shape[1], x.shape)
+            )
+        return self.__matvec(x)
+
+    def rmatvec(self, y):
+        """
+        Applies the transposed operator to the vector y.
+
+        Parameters
+        ----------
+        y : ht.DNDarray
+            1D vector of length m
+
+        Returns
+        -------
+        ht.DNDarray
+            1D vector A.T @ y of length n
+        """
+        if self.__rmatvec is None:
+            raise NotImplementedError("rmatvec was not provided for this operator")
+        if not isinstance(y, dndarray.DNDarray):
+            raise TypeError("y needs to be a ht.DNDarray, but was {}".format(type(y)))
+        if y.shape != (self.__shape[0],):
+            raise ValueError(
+                "y needs to be a vector of length {}, but was {}".format(self.__shape[0], y.shape)
+            )
+        return self.__rmatvec(y)
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+    def __repr__(self):
+        return "<{}x{} LinearOperator with dtype={}>".format(
+            self.__shape[0], self.__shape[1], self.__dtype.__name__
+        )
+
+
+def aslinearoperator(A):
+    """
+    Returns A as a LinearOperator.
+
+    Parameters
+    ----------
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or LinearOperator
+        2D matrix, it is applied to vectors with matmul. LinearOperators are returned as they are.
+
+    Returns
+    -------
+    LinearOperator
+    """
+    import heat as ht
+
+    if isinstance(A, LinearOperator):
+        return A
+    if isinstance(A, ht.sparse.DCSR_matrix):
+        return LinearOperator(
+            A.shape, A.matmul, dtype=A.dtype, split=A.split, device=A.device, comm=A.comm
+        )
+    if not isinstance(A, dndarray.DNDarray):
+        raise TypeError("A needs to be a ht.DNDarray or LinearOperator, but was {}".format(type(A)))
+    if A.ndim != 2:
+        raise RuntimeError("A needs to be a 2D matrix")
+
+    return LinearOperator(
+        A.shape,
+        lambda x: basics.matmul(A, x),
+        lambda y: basics.matmul(y, A),
+        dtype=A.dtype,
+        split=0 if A.split is not None else None,
+        device=A.device,
+        comm=A.comm,
+    )
@@ -1,14 +1,19 @@
+import collections
 import heat as ht
 
 import torch
 
-__all__ = ["cg", "lanczos"]
+__all__ = ["bicgstab", "cg", "gmres", "lanczos", "minres", "thick_restart_lanczos"]
 
 
-def cg(A, b, x0, out=None):
+def cg(A, b, x0, out=None, tol=1e-10, max_iter=None, M=None, pipelined=False, return_info=False):
     """
     Conjugate gradients method for solving a system of linear equations Ax = b
 
+    The iteration can be preconditioned and optionally be run in its pipelined variant [1], in which all inner products
+    of an iteration are fused into a single non-blocking Allreduce that is overlapped with the application of the
+    preconditioner and the matrix-vector product.
+
     Parameters
     ----------
     A : ht.DNDarray
@@ -19,18 +24,103 @@ def cg(A, b, x0, out=None):
         Arbitrary 1D starting vector
     out : ht.DNDarray, optional
         Output Vector
-
+    tol : float, optional
+        The iteration stops once the euclidean norm of the residual b - Ax drops below tol
+    max_iter : int, optional
+        Maximal number of iterations, defaults to len(b)
+    M : str or callable, optional
+        Preconditioner, i.e. an approximation of the inverse of A:
+            - ``None``: no preconditioning \n
+            - 'jacobi': the inverse of the diagonal of A \n
+            - 'block_jacobi': the inverse of the diagonal block of A that is local to each process \n
+            - callable: function that maps a ht.DNDarray r to the preconditioned ht.DNDarray z = M^-1 r
+    pipelined : bool, optional
+        If True, the Ghysels-Vanroose pipelined conjugate gradients method is used
+    return_info : bool, optional
+        If True, a dictionary with the number of iterations 'n_iter', the residual norm of every iteration 'residuals'
+        and whether the tolerance was reached 'converged' is returned as well
 
     Returns
     -------
     ht.DNDarray
-        Returns the solution x of the system of linear equations. If out is given, it is returned
+        Returns the solution x of the system of linear equations, split along axis 0 if any input is distributed
+    dict, optional
+        Convergence information, only returned if return_info is True
+
+    References
+    ----------
+    [1] Ghysels, P. and Vanroose, W., "Hiding global synchronization latency in the preconditioned Conjugate Gradient
+        algorithm", Parallel Computing, 40 (7), pp. 224-238, 2014.
+    """
+
+    if x0 is None or not isinstance(x0, ht.DNDarray):
+        raise TypeError("x0 needs to be of type ht.dndarra, but was {}".format(type(x0)))
+    krylov, b, x = _krylov_setup(A, b, x0)
+    matvec, reduce = krylov.matvec, krylov.reduce
+    if max_iter is None:
+        max_iter = krylov.n
+    precondition = _cg_preconditioner(A, M, krylov)
+
+    if pipelined:
+        x, residuals = _pipelined_cg(krylov, precondition, b, x, tol, max_iter)
+    else:
+        r = b - matvec(x)
+        z = precondition(r)
+        p = z
+        buf = reduce(torch.stack((torch.dot(r, z), torch.dot(r, r))))
+        rz, residuals = buf[0], [buf[1].sqrt().item()]
+
+        for i in range(max_iter):
+            if residuals[-1] < tol:
+                break
+            Ap = matvec(p)
+            alpha = rz / reduce(torch.dot(p, Ap).reshape(1))[0]
+            x = x + alpha * p
+            r = r - alpha * Ap
+            z = precondition(r)
+            # the new inner product for beta and the residual norm are reduced together
+            buf = reduce(torch.stack((torch.dot(r, z), torch.dot(r, r))))
+            residuals.append(buf[1].sqrt().item())
+            p = z + (buf[0] / rz) * p
+            rz = buf[0]
+
+    return _krylov_result(krylov, x, residuals, tol, return_info)
+
+
+_Krylov = collections.namedtuple(
+    "_Krylov", ["n", "dtype", "split", "comm", "vector", "matvec", "reduce"]
+)
+
+
+def _krylov_setup(A, b, x0=None):
     """
+    Common input sanitation of the Krylov solvers. All vectors are worked on as local torch chunks, distributed along
+    the rows whenever the operator or any of the vectors is distributed.
 
+    Parameters
+    ----------
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or ht.linalg.LinearOperator
+        The system matrix
+    b : ht.DNDarray
+        The right-hand side
+    x0 : ht.DNDarray, optional
+        The starting vector, defaults to zeros
+
+    Returns
+    -------
+    krylov : _Krylov
+        Global length ``n``, ``dtype`` and ``split`` of the vectors, the communicator ``comm`` (None if not distributed), a
+        function ``vector`` that wraps a local chunk into a ht.DNDarray, the local matrix-vector product ``matvec`` and
+        the in-place sum reduction ``reduce`` of a torch buffer
+    b : torch.Tensor
+        Local chunk of the right-hand side
+    x : torch.Tensor
+        Local chunk of the starting vector
+    """
     if (
-        not isinstance(A, ht.DNDarray)
+        not isinstance(A, (ht.DNDarray, ht.linalg.LinearOperator, ht.sparse.DCSR_matrix))
         or not isinstance(b, ht.DNDarray)
-        or not isinstance(x0, ht.DNDarray)
+        or not (x0 is None or isinstance(x0, ht.DNDarray))
     ):
         raise TypeError(
             "A, b and x0 need to be of type ht.dndarra, but were {}, {}, {}".format(
@@ -42,41 +132,564 @@ def cg(A, b, x0, out=None):
         raise RuntimeError("A needs to be a 2D matrix")
     if not b.ndim == 1:
         raise RuntimeError("b needs to be a 1D vector")
-    if not x0.ndim == 1:
+    if x0 is not None and not x0.ndim == 1:
         raise RuntimeError("c needs to be a 1D vector")
 
-    r = b - ht.matmul(A, x0)
-    p = r
-    rsold = ht.matmul(r, r)
-    x = x0
+    op = ht.linalg.aslinearoperator(A)
+    n = len(b)
+    dtype = ht.promote_types(ht.promote_types(op.dtype, b.dtype), ht.float32)
+    split = None
+    if op.split is not None or b.split is not None or (x0 is not None and x0.split is not None):
+        split = 0
+    comm = op.comm if split is not None and op.comm.is_distributed() else None
 
-    for i in range(len(b)):
-        Ap = ht.matmul(A, p)
-        alpha = rsold / ht.matmul(p, Ap)
-        x = x + alpha * p
-        r = r - alpha * Ap
-        rsnew = ht.matmul(r, r)
-        if ht.sqrt(rsnew).item() < 1e-10:
-            print("Residual reaches tolerance in it = {}".format(i))
-            if out is not None:
-                out = x
-                return out
-            return x
-        p = r + ((rsnew / rsold) * p)
-        rsold = rsnew
-
-    if out is not None:
-        out = x
-        return out
+    def vector(x):
+        return ht.DNDarray(x, (n,), dtype, split, op.device, op.comm)
+
+    def matvec(x):
+        w = op.matvec(vector(x))
+        if w.split != split:
+            w = ht.resplit(w, split)
+        return w._DNDarray__array.to(x.dtype)
+
+    def reduce(buf):
+        if comm is not None:
+            comm.Allreduce(ht.communication.MPI.IN_PLACE, buf, ht.communication.MPI.SUM)
+        return buf
+
+    b = ht.resplit(b, split).astype(dtype)._DNDarray__array
+    if x0 is None:
+        x = torch.zeros_like(b)
+    else:
+        x = ht.resplit(x0, split).astype(dtype)._DNDarray__array
+
+    return _Krylov(n, dtype, split, comm, vector, matvec, reduce), b, x
+
+
+def _krylov_result(krylov, x, residuals, tol, return_info):
+    """
+    Wraps the local chunk of the solution and optionally the convergence information of a Krylov solver.
+    """
+    x = krylov.vector(x)
+    if return_info:
+        info = {
+            "n_iter": len(residuals) - 1,
+            "residuals": residuals,
+            "converged": residuals[-1] < tol,
+        }
+        return x, info
     return x
 
 
+def _cg_preconditioner(A, M, krylov):
+    """
+    Returns a function that applies the preconditioner M to the local chunk of a residual vector.
+
+    Parameters
+    ----------
+    A : ht.DNDarray
+        The system matrix
+    M : None, str or callable
+        The preconditioner, see ``cg``
+    krylov : _Krylov
+        Distribution of the vectors, see ``_krylov_setup``
+    """
+    split = krylov.split
+    if M is None:
+        return lambda r: r
+    if callable(M):
+
+        def precondition(r):
+            z = M(krylov.vector(r))
+            if not isinstance(z, ht.DNDarray):
+                raise TypeError(
+                    "preconditioner needs to return a ht.DNDarray, but was {}".format(type(z))
+                )
+            if z.split != split:
+                z = ht.resplit(z, split)
+            return z._DNDarray__array
+
+        return precondition
+    if M not in ["jacobi", "block_jacobi"]:
+        raise ValueError(
+            "M needs to be None, a callable, 'jacobi' or 'block_jacobi', but was {}".format(M)
+        )
+    if not isinstance(A, ht.DNDarray):
+        raise TypeError("M='{}' requires A to be a ht.DNDarray, but was {}".format(M, type(A)))
+
+    # the diagonal block of A that couples the local chunk of the vectors
+    block = A._DNDarray__array
+    if split is not None:
+        offset, lshape, _ = A.comm.chunk((A.shape[0],), 0)
+        local = slice(offset, offset + lshape[0])
+        if A.split is None:
+            block = block[local, local]
+        elif A.split == 0:
+            block = block[:, local]
+        else:
+            block = block[local, :]
+    block = block.to(krylov.dtype.torch_type())
+
+    if M == "jacobi":
+        diagonal = block.diagonal().clone()
+        diagonal[diagonal == 0] = 1.0
+        return lambda r: r / diagonal
+
+    if block.numel() == 0:
+        return lambda r: r
+    factor = torch.cholesky(block)
+    return lambda r: torch.cholesky_solve(r.unsqueeze(1), factor).squeeze(1)
+
+
+def _pipelined_cg(krylov, precondition, b, x, tol, max_iter):
+    """
+    Ghysels-Vanroose pipelined preconditioned conjugate gradients on the local vector chunks. The inner products of
+    an iteration are reduced with one non-blocking Allreduce while the preconditioner and the matrix-vector product of
+    the next search direction are computed.
+
+    Returns
+    -------
+    x : torch.Tensor
+        Local chunk of the solution
+    residuals : list of float
+        Residual norms of all iterations
+    """
+    matvec, comm = krylov.matvec, krylov.comm
+    r = b - matvec(x)
+    u = precondition(r)
+    w = matvec(u)
+    z = q = s = p = torch.zeros_like(x)
+    gamma_old = alpha = None
+    residuals = []
+
+    for i in range(max_iter + 1):
+        buf = torch.stack((torch.dot(r, u), torch.dot(w, u), torch.dot(r, r)))
+        request = None
+        if comm is not None:
+            request = comm.Iallreduce(ht.communication.MPI.IN_PLACE, buf, ht.communication.MPI.SUM)
+        # overlap the reduction with the preconditioner and the matrix-vector product
+        m = precondition(w)
+        n = matvec(m)
+        if request is not None:
+            request.wait()
+
+        gamma, delta, rr = buf[0], buf[1], buf[2]
+        residuals.append(rr.sqrt().item())
+        if residuals[-1] < tol or i == max_iter:
+            break
+
+        if gamma_old is None:
+            beta = torch.zeros_like(gamma)
+            alpha = gamma / delta
+        else:
+            beta = gamma / gamma_old
+            alpha = gamma / (delta - beta * gamma / alpha)
+        gamma_old = gamma
+
+        z = n + beta * z
+        q = m + beta * q
+        s = w + beta * s
+        p = u + beta * p
+        x = x + alpha * p
+        r = r - alpha * s
+        u = u - alpha * q
+        w = w - alpha * z
+
+    return x, residuals
+
+
+def bicgstab(A, b, x0=None, tol=1e-10, max_iter=None, return_info=False):
+    """
+    Biconjugate gradient stabilized method [1] for solving a (non-symmetric) system of linear equations Ax = b
+
+    The inner products are batched such that an iteration needs two global reductions, the residual norm and the
+    inner product of the next iteration are derived from the second one.
+
+    Parameters
+    ----------
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or ht.linalg.LinearOperator
+        2D square matrix or linear operator
+    b : ht.DNDarray
+        1D vector
+    x0 : ht.DNDarray, optional
+        1D starting vector, defaults to zeros
+    tol : float, optional
+        The iteration stops once the euclidean norm of the residual b - Ax drops below tol
+    max_iter : int, optional
+        Maximal number of iterations, defaults to len(b)
+    return_info : bool, optional
+        If True, a dictionary with the number of iterations 'n_iter', the residual norm of every iteration 'residuals'
+        and whether the tolerance was reached 'converged' is returned as well
+
+    Returns
+    -------
+    ht.DNDarray
+        Returns the solution x of the system of linear equations, split along axis 0 if any input is distributed
+    dict, optional
+        Convergence information, only returned if return_info is True
+
+    References
+    ----------
+    [1] van der Vorst, H. A., "Bi-CGSTAB: A Fast and Smoothly Converging Variant of Bi-CG for the Solution of
+        Nonsymmetric Linear Systems", SIAM Journal on Scientific and Statistical Computing, 13 (2), pp. 631-644, 1992.
+    """
+    krylov, b, x = _krylov_setup(A, b, x0)
+    matvec, reduce = krylov.matvec, krylov.reduce
+    if max_iter is None:
+        max_iter = krylov.n
+
+    r = b - matvec(x)
+    r_hat = r.clone()
+    rr = reduce(torch.dot(r, r).reshape(1))[0]
+    rho, residuals = rr, [rr.sqrt().item()]
+    rho_old = alpha = omega = torch.ones_like(rr)
+    p = v = torch.zeros_like(r)
+
+    for i in range(max_iter):
+        if residuals[-1] < tol:
+            break
+        beta = (rho / rho_old) * (alpha / omega)
+        p = r + beta * (p - omega * v)
+        v = matvec(p)
+        alpha = rho / reduce(torch.dot(r_hat, v).reshape(1))[0]
+        s = r - alpha * v
+        t = matvec(s)
+
+        buf = reduce(
+            torch.stack(
+                (
+                    torch.dot(t, s),
+                    torch.dot(t, t),
+                    torch.dot(s, s),
+                    torch.dot(r_hat, s),
+                    torch.dot(r_hat, t),
+                )
+            )
+        )
+        ts, tt, ss, r_hat_s, r_hat_t = buf
+        if ss.sqrt() < tol or tt == 0:
+            x = x + alpha * p
+            residuals.append(ss.sqrt().item())
+            break
+
+        omega = ts / tt
+        x = x + alpha * p + omega * s
+        r = s - omega * t
+        rho_old, rho = rho, r_hat_s - omega * r_hat_t
+        rr = (ss - 2.0 * omega * ts + omega * omega * tt).clamp(min=0.0)
+        residuals.append(rr.sqrt().item())
+        if rho == 0:
+            # breakdown of the underlying Lanczos biorthogonalization
+            break
+
+    return _krylov_result(krylov, x, residuals, tol, return_info)
+
+
+def gmres(A, b, x0=None, tol=1e-10, restart=20, max_iter=None, return_info=False):
+    """
+    Restarted generalized minimal residual method GMRES(m) [1] for solving a (non-symmetric) system of linear equations
+    Ax = b
+
+    The Arnoldi basis is orthogonalized with classical Gram-Schmidt and a selective second pass, i.e. one local
+    matrix-vector product and one Allreduce per pass. The small least-squares problem is solved redundantly on every
+    process with Givens rotations.
+
+    Parameters
+    ----------
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or ht.linalg.LinearOperator
+        2D square matrix or linear operator
+    b : ht.DNDarray
+        1D vector
+    x0 : ht.DNDarray, optional
+        1D starting vector, defaults to zeros
+    tol : float, optional
+        The iteration stops once the euclidean norm of the residual b - Ax drops below tol
+    restart : int, optional
+        Dimension m of the Krylov subspace before restarting
+    max_iter : int, optional
+        Maximal total number of iterations (matrix-vector products), defaults to len(b)
+    return_info : bool, optional
+        If True, a dictionary with the number of iterations 'n_iter', the residual norm of every iteration 'residuals'
+        and whether the tolerance was reached 'converged' is returned as well
+
+    Returns
+    -------
+    ht.DNDarray
+        Returns the solution x of the system of linear equations, split along axis 0 if any input is distributed
+    dict, optional
+        Convergence information, only returned if return_info is True
+
+    References
+    ----------
+    [1] Saad, Y. and Schultz, M. H., "GMRES: A Generalized Minimal Residual Algorithm for Solving Nonsymmetric Linear
+        Systems", SIAM Journal on Scientific and Statistical Computing, 7 (3), pp. 856-869, 1986.
+    """
+    if not isinstance(restart, int) or restart < 1:
+        raise ValueError("restart needs to be a positive int, but was {}".format(restart))
+    krylov, b, x = _krylov_setup(A, b, x0)
+    matvec, reduce = krylov.matvec, krylov.reduce
+    if max_iter is None:
+        max_iter = krylov.n
+    m = min(restart, krylov.n)
+
+    V = torch.zeros((b.shape[0], m + 1), dtype=b.dtype, device=b.device)
+    H = torch.zeros((m + 1, m), dtype=b.dtype, device=b.device)
+    residuals = []
+    n_iter = 0
+
+    while True:
+        r = b - matvec(x)
+        beta = reduce(torch.dot(r, r).reshape(1))[0].sqrt()
+        if not residuals:
+            residuals.append(beta.item())
+        if beta < tol or n_iter >= max_iter:
+            break
+
+        V[:, 0] = r / beta
+        H.zero_()
+        g = torch.zeros(m + 1, dtype=b.dtype, device=b.device)
+        g[0] = beta
+        cs = torch.zeros(m, dtype=b.dtype, device=b.device)
+        sn = torch.zeros(m, dtype=b.dtype, device=b.device)
+
+        for j in range(m):
+            w = matvec(V[:, j])
+            w, h, h_norm = _cgs2(V[:, : j + 1], w, krylov.comm)
+            H[: j + 1, j] = h
+            H[j + 1, j] = h_norm
+
+            # apply the previous Givens rotations to the new column and eliminate the subdiagonal entry
+            for i in range(j):
+                H[i, j], H[i + 1, j] = (
+                    cs[i] * H[i, j] + sn[i] * H[i + 1, j],
+                    -sn[i] * H[i, j] + cs[i] * H[i + 1, j],
+                )
+            denominator = torch.sqrt(H[j, j] ** 2 + H[j + 1, j] ** 2)
+            cs[j], sn[j] = H[j, j] / denominator, H[j + 1, j] / denominator
+            H[j, j], H[j + 1, j] = denominator, 0.0
+            g[j], g[j + 1] = cs[j] * g[j], -sn[j] * g[j]
+
+            n_iter += 1
+            residuals.append(g[j + 1].abs().item())
+            if residuals[-1] < tol or h_norm < 1e-14 or n_iter >= max_iter:
+                j += 1
+                break
+            V[:, j + 1] = w / h_norm
+        else:
+            j = m
+
+        # update the solution with the minimizer of the least-squares problem
+        y = torch.triangular_solve(g[:j].unsqueeze(1), H[:j, :j])[0].squeeze(1)
+        x = x + torch.mv(V[:, :j], y)
+        if residuals[-1] < tol or n_iter >= max_iter:
+            break
+
+    return _krylov_result(krylov, x, residuals, tol, return_info)
+
+
+def minres(A, b, x0=None, tol=1e-10, max_iter=None, return_info=False):
+    """
+    Minimal residual method [1] for solving a symmetric (possibly indefinite) system of linear equations Ax = b
+
+    The norm of the unnormalized Lanczos vector and its Rayleigh quotient are fused into a single global reduction
+    per iteration.
+
+    Parameters
+    ----------
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or ht.linalg.LinearOperator
+        2D symmetric matrix or linear operator
+    b : ht.DNDarray
+        1D vector
+    x0 : ht.DNDarray, optional
+        1D starting vector, defaults to zeros
+    tol : float, optional
+        The iteration stops once the euclidean norm of the residual b - Ax drops below tol
+    max_iter : int, optional
+        Maximal number of iterations, defaults to len(b)
+    return_info : bool, optional
+        If True, a dictionary with the number of iterations 'n_iter', the residual norm estimate of every iteration
+        'residuals' and whether the tolerance was reached 'converged' is returned as well
+
+    Returns
+    -------
+    ht.DNDarray
+        Returns the solution x of the system of linear equations, split along axis 0 if any input is distributed
+    dict, optional
+        Convergence information, only returned if return_info is True
+
+    References
+    ----------
+    [1] Paige, C. C. and Saunders, M. A., "Solution of Sparse Indefinite Systems of Linear Equations", SIAM Journal on
+        Numerical Analysis, 12 (4), pp. 617-629, 1975.
+    """
+    krylov, b, x = _krylov_setup(A, b, x0)
+    matvec, reduce = krylov.matvec, krylov.reduce
+    if max_iter is None:
+        max_iter = krylov.n
+
+    # the Lanczos vectors are carried unnormalized, so that their norm and the Rayleigh quotient are reduced together
+    # after the matrix-vector product, the QR update of a step is done once the next norm is known
+    p = b - matvec(x)
+    v = w = w_old = torch.zeros_like(p)
+    alpha = None
+    residuals = []
+    # state of the QR factorization of the tridiagonal Lanczos matrix
+    cs, sn, d_bar, epsilon = -1.0, 0.0, 0.0, 0.0
+
+    for i in range(max_iter + 1):
+        q = matvec(p)
+        buf = reduce(torch.stack((torch.dot(p, p), torch.dot(p, q))))
+        beta = buf[0].sqrt().item()
+
+        if alpha is None:
+            phi_bar = beta
+            residuals.append(beta)
+        else:
+            # apply the previous rotation and compute the new one
+            epsilon_old = epsilon
+            delta = cs * d_bar + sn * alpha
+            g_bar = sn * d_bar - cs * alpha
+            epsilon = sn * beta
+            d_bar = -cs * beta
+            gamma = max((g_bar * g_bar + beta * beta) ** 0.5, torch.finfo(p.dtype).eps)
+            cs, sn = g_bar / gamma, beta / gamma
+            phi = cs * phi_bar
+            phi_bar = sn * phi_bar
+
+            w_old, w = w, (v - epsilon_old * w_old - delta * w) / gamma
+            x = x + phi * w
+            residuals.append(abs(phi_bar))
+        if residuals[-1] < tol or beta < 1e-14 or i == max_iter:
+            break
+
+        v_old, v = v, p / beta
+        alpha = buf[1].item() / (beta * beta)
+        p = q / beta - alpha * v - beta * v_old
+
+    return _krylov_result(krylov, x, residuals, tol, return_info)
+
+
+def _cgs2(V, w, comm=None, eta=0.7071067811865476):
+    """
+    Orthogonalizes the local chunk ``w`` of a vector against the orthonormal columns of the local chunk ``V`` using
+    classical Gram-Schmidt with a selective second pass (Daniel-Gragg-Kaufman-Stewart criterion). Each pass is a single
+    local matrix-vector product followed by one Allreduce of the coefficient vector.
+
+    Parameters
+    ----------
+    V : torch.Tensor
+        2D local chunk of the orthonormal basis, shape (n_local, j)
+    w : torch.Tensor
+        1D local chunk of the vector to be orthogonalized, shape (n_local,)
+    comm : ht.communication.MPICommunication, optional
+        Communicator of the row-distributed vectors. ``None`` if ``V`` and ``w`` are not distributed.
+    eta : float, optional
+        A second pass is done if the norm of ``w`` drops below ``eta`` times its original norm
+
+    Returns
+    -------
+    w : torch.Tensor
+        The local chunk of the orthogonalized vector
+    h : torch.Tensor
+        The projection coefficients ``V^T w``, shape (j,)
+    norm : torch.Tensor
+        The global euclidean norm of the orthogonalized vector
+    """
+
+    def reduce(buf):
+        if comm is not None:
+            comm.Allreduce(ht.communication.MPI.IN_PLACE, buf, ht.communication.MPI.SUM)
+        return buf
+
+    # first pass, coefficients and the squared norm of w are reduced together
+    buf = reduce(torch.cat((torch.mv(V.t(), w), torch.dot(w, w).reshape(1))))
+    h, norm = buf[:-1], buf[-1].sqrt()
+    w = w - torch.mv(V, h)
+    new_norm = reduce(torch.dot(w, w).reshape(1))[0].sqrt()
+
+    # selective second pass, the norm follows from Pythagoras as the columns of V are orthonormal
+    if new_norm < eta * norm:
+        h2 = reduce(torch.mv(V.t(), w))
+        w = w - torch.mv(V, h2)
+        h = h + h2
+        new_norm = (new_norm ** 2 - torch.dot(h2, h2)).clamp(min=0.0).sqrt()
+
+    return w, h, new_norm
+
+
+def _lanczos_setup(A, v0):
+    """
+    Common input sanitation of the Lanczos methods. Promotes ``A`` to a floating point type, determines the
+    distribution of the Krylov vectors and returns the local chunk of the normalized starting vector.
+    """
+    if not isinstance(A, (ht.DNDarray, ht.linalg.LinearOperator, ht.sparse.DCSR_matrix)):
+        raise TypeError("A needs to be of type ht.dndarra, but was {}".format(type(A)))
+    if not (A.ndim == 2):
+        raise RuntimeError("A needs to be a 2D matrix")
+    if isinstance(A, ht.sparse.DCSR_matrix):
+        A = ht.linalg.aslinearoperator(A)
+
+    n, column = A.shape
+    if n != column:
+        raise TypeError("Input Matrix A needs to be symmetric.")
+
+    dtype = ht.promote_types(A.dtype, ht.float32)
+    if isinstance(A, ht.DNDarray) and A.dtype != dtype:
+        A = A.astype(dtype)
+    # Krylov vectors are row-distributed whenever A is distributed, this is the split the matrix-vector product yields
+    split = 0 if A.split is not None else None
+
+    if v0 is None:
+        vr = ht.random.rand(n, dtype=dtype, split=split, device=A.device, comm=A.comm)
+        v0 = vr / ht.norm(vr)
+    else:
+        if not isinstance(v0, ht.DNDarray):
+            raise TypeError("v0 needs to be of type ht.dndarra, but was {}".format(type(v0)))
+        if v0.shape != (n,):
+            raise ValueError("v0 needs to be a vector of length {}, but was {}".format(n, v0.shape))
+        if v0.split != split:
+            v0 = ht.resplit(v0, axis=split)
+        v0 = v0.astype(dtype)
+
+    return A, split, v0._DNDarray__array
+
+
+def _lanczos_matvec(A, v, split):
+    """
+    Matrix-vector product of ``A`` with the vector given by its local chunk ``v``, returns the local chunk of the result
+    distributed along ``split``.
+    """
+    x = ht.DNDarray(v, (A.shape[1],), A.dtype, split, A.device, A.comm)
+    if isinstance(A, ht.linalg.LinearOperator):
+        w = A.matvec(x)
+    else:
+        w = ht.matmul(A, x)
+    if w.split != split:
+        w.resplit_(axis=split)
+    return w._DNDarray__array.to(v.dtype)
+
+
+def _lanczos_random_restart(A, V, split, comm):
+    """
+    Draws a random vector, orthonormalized against the columns of ``V``, to continue the iteration after a Lanczos
+    breakdown.
+    """
+    vr = ht.random.rand(A.shape[0], dtype=A.dtype, split=split, device=A.device, comm=A.comm)
+    vr, _, norm = _cgs2(V, vr._DNDarray__array, comm)
+    return vr / norm
+
+
 def lanczos(A, m, v0=None, V_out=None, T_out=None):
     """
     Lanczos algorithm for iterative approximation of the solution to the eigenvalue problem,  an adaptation of power methods to find the m "most useful" (tending towards extreme highest/lowest) eigenvalues and eigenvectors of an n x n Hermitian matrix, where often m<<n
+
+    Every new Krylov vector is fully reorthogonalized against all previous ones with classical Gram-Schmidt and a
+    selective second pass. A pass is one local matrix-vector product and a single Allreduce of the coefficient vector,
+    hence an iteration needs two global reductions (three if the second pass is triggered) independent of m.
+
     Parameters
     ----------
-    A : ht.DNDarray
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or ht.linalg.LinearOperator
         2D symmetric, positive definite Matrix
     m : int
         number of Lanczos iterations
@@ -96,78 +709,36 @@ def lanczos(A, m, v0=None, V_out=None, T_out=None):
         Tridiagonal matrix of size mxm, with coefficients alpha_1,...alpha_n on the diagonal and coefficients beta_1,...,beta_n-1 on the side-diagonals. If T_out is given, it is returned
 
     """
-    if not isinstance(A, ht.DNDarray):
-        raise TypeError("A needs to be of type ht.dndarra, but was {}".format(type(A)))
-
-    if not (A.ndim == 2):
-        raise RuntimeError("A needs to be a 2D matrix")
     if not isinstance(m, (int, float)):
         raise TypeError("m must be eiter int or float, but was {}".format(type(m)))
+    A, split, v = _lanczos_setup(A, v0)
+    m = int(m)
+    comm = A.comm if split is not None and A.comm.is_distributed() else None
 
-    n, column = A.shape
-    if n != column:
-        raise TypeError("Input Matrix A needs to be symmetric.")
-    T = ht.zeros((m, m))
-    if A.split == 0:
-        # This is done for better memory access in the reorthogonalization Gram-Schmidt algorithm
-        V = ht.ones((n, m), split=0, dtype=A.dtype, device=A.device)
-    else:
-        V = ht.ones((n, m), split=None, dtype=A.dtype, device=A.device)
+    # the Krylov vectors are stored column-wise in a local buffer, which is done for better memory access in the
+    # reorthogonalization
+    V = torch.zeros((v.shape[0], m), dtype=v.dtype, device=v.device)
+    T = torch.zeros((m, m), dtype=v.dtype, device=v.device)
+    V[:, 0] = v
+
+    for i in range(m):
+        w = _lanczos_matvec(A, V[:, i], split)
+        # orthogonalization against all previous vectors, the coefficient of v_i itself is alpha
+        w, h, beta = _cgs2(V[:, : i + 1], w, comm)
+        T[i, i] = h[i]
+        if i == m - 1:
+            break
 
-    if v0 is None:
-        vr = ht.random.rand(n, split=V.split)
-        v0 = vr / ht.norm(vr)
-    else:
-        if v0.split != V.split:
-            v0.resplit_(axis=V.split)
-    # # 0th iteration
-    # # vector v0 has euklidian norm = 1
-    w = ht.matmul(A, v0)
-    alpha = ht.dot(w, v0)
-    w = w - alpha * v0
-    T[0, 0] = alpha
-    V[:, 0] = v0
-    for i in range(1, int(m)):
-        beta = ht.norm(w)
         if abs(beta) < 1e-10:
-            # print("Lanczos breakdown in iteration {}".format(i))
             # Lanczos Breakdown, pick a random vector to continue
-            vr = ht.random.rand(n, dtype=A.dtype, split=V.split)
-            # orthogonalize v_r with respect to all vectors v[i]
-            for j in range(i):
-                vi_loc = V._DNDarray__array[:, j]
-                a = torch.dot(vr._DNDarray__array, vi_loc)
-                b = torch.dot(vi_loc, vi_loc)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, a, ht.communication.MPI.SUM)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, b, ht.communication.MPI.SUM)
-                vr._DNDarray__array = vr._DNDarray__array - a / b * vi_loc
-            # normalize v_r to Euclidian norm 1 and set as ith vector v
-            vi = vr / ht.norm(vr)
+            V[:, i + 1] = _lanczos_random_restart(A, V[:, : i + 1], split, comm)
         else:
-            vr = w
-
-            # Reorthogonalization
-            # ToDo: Rethink this; mask torch calls, See issue #494
-            # This is the fast solution, using item access on the ht.dndarray level is way slower
-            for j in range(i):
-                vi_loc = V._DNDarray__array[:, j]
-                a = torch.dot(vr._DNDarray__array, vi_loc)
-                b = torch.dot(vi_loc, vi_loc)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, a, ht.communication.MPI.SUM)
-                A.comm.Allreduce(ht.communication.MPI.IN_PLACE, b, ht.communication.MPI.SUM)
-                vr._DNDarray__array -= a / b * vi_loc
-
-            vi = vr / ht.norm(vr)
-
-        w = ht.matmul(A, vi)
-        alpha = ht.dot(w, vi)
-        w -= alpha * vi - beta * V[:, i - 1]
-
-        T[i - 1, i] = beta
-        T[i, i - 1] = beta
-        T[i, i] = alpha
-        V[:, i] = vi
+            V[:, i + 1] = w / beta
+        T[i, i + 1] = beta
+        T[i + 1, i] = beta
 
+    V = ht.DNDarray(V, (A.shape[0], m), A.dtype, split, A.device, A.comm)
+    T = ht.array(T, device=A.device, comm=A.comm)
     if V.split is not None:
         V.resplit_(axis=None)
 
@@ -182,3 +753,103 @@ def lanczos(A, m, v0=None, V_out=None, T_out=None):
         return V_out, T
 
     return V, T
+
+
+def thick_restart_lanczos(A, k, m=None, v0=None, tol=1e-6, max_restarts=100, largest=False):
+    """
+    Thick-restart Lanczos method [1] for the computation of k extreme eigenpairs of a symmetric n x n matrix A with a
+    fixed memory budget of m + 1 Krylov vectors.
+
+    After m Lanczos steps the Rayleigh-Ritz problem of the projected m x m matrix is solved locally. If the wanted Ritz
+    pairs have not converged, the subspace is compressed to the best Ritz vectors, which are kept together with the
+    last Krylov vector, and the iteration is continued from there. Reorthogonalization is done like in ``lanczos``, i.e.
+    one local matrix-vector product and one Allreduce per Gram-Schmidt pass.
+
+    Parameters
+    ----------
+    A : ht.DNDarray, ht.sparse.DCSR_matrix or ht.linalg.LinearOperator
+        2D symmetric matrix
+    k : int
+        Number of wanted eigenpairs
+    m : int, optional
+        Maximal dimension of the Krylov subspace, k < m <= n. Defaults to min(n, max(2 * k + 1, 20))
+    v0 : ht.DNDarray, optional
+        1D starting vector of euclidian norm 1. If not provided, a random vector will be used to start the algorithm
+    tol : float, optional
+        Convergence tolerance for the residual norms ||A y - theta y|| of the wanted Ritz pairs, relative to the largest
+        Ritz value in magnitude
+    max_restarts : int, optional
+        Maximal number of restarts
+    largest : bool, optional
+        If True, the k largest eigenvalues are computed, otherwise the k smallest
+
+    Returns
+    -------
+    eigenvalues : ht.DNDarray
+        1D array of size k with the eigenvalues, sorted ascending if largest is False, descending otherwise
+    eigenvectors : ht.DNDarray
+        Matrix of size n x k with the orthonormal eigenvectors as columns. It is split along the rows if A is distributed
+
+    References
+    ----------
+    [1] Wu, K. and Simon, H., "Thick-Restart Lanczos Method for Large Symmetric Eigenvalue Problems", SIAM Journal on
+        Matrix Analysis and Applications, 22 (2), pp. 602-616, 2000.
+    """
+    if not isinstance(k, int):
+        raise TypeError("k must be int, but was {}".format(type(k)))
+    A, split, v = _lanczos_setup(A, v0)
+    n = A.shape[0]
+    if m is None:
+        m = min(n, max(2 * k + 1, 20))
+    if not isinstance(m, int):
+        raise TypeError("m must be int, but was {}".format(type(m)))
+    if not 0 < k < m <= n:
+        raise ValueError("0 < k < m <= n is required, but was k={}, m={}, n={}".format(k, m, n))
+    comm = A.comm if split is not None and A.comm.is_distributed() else None
+
+    # number of Ritz vectors that are retained on a restart
+    keep = min(k + (m - k) // 2, m - 1)
+
+    V = torch.zeros((v.shape[0], m + 1), dtype=v.dtype, device=v.device)
+    T = torch.zeros((m, m), dtype=v.dtype, device=v.device)
+    V[:, 0] = v
+    start = 0
+
+    for restart in range(max_restarts + 1):
+        for j in range(start, m):
+            w = _lanczos_matvec(A, V[:, j], split)
+            # the coefficients are the j-th column of the projected matrix, including the arrowhead after a restart
+            w, h, beta = _cgs2(V[:, : j + 1], w, comm)
+            T[: j + 1, j] = h
+            T[j, : j + 1] = h
+            if abs(beta) < 1e-10:
+                # invariant subspace found, the residual coupling vanishes
+                V[:, j + 1] = _lanczos_random_restart(A, V[:, : j + 1], split, comm)
+                beta = torch.zeros_like(beta)
+            else:
+                V[:, j + 1] = w / beta
+
+        # Rayleigh-Ritz on the projected matrix
+        theta, S = torch.symeig(T, eigenvectors=True)
+        order = torch.argsort(theta, descending=largest)
+        residuals = (beta * S[-1, :]).abs()
+        wanted = order[:k]
+        if (residuals[wanted] <= tol * theta.abs().max()).all() or restart == max_restarts:
+            break
+
+        # compress the subspace to the best Ritz vectors and the residual direction
+        kept = order[:keep]
+        V[:, :keep] = torch.mm(V[:, :m], S[:, kept])
+        V[:, keep] = V[:, m]
+        T.zero_()
+        T[:keep, :keep] = torch.diag(theta[kept])
+        T[keep, :keep] = beta * S[-1, kept]
+        T[:keep, keep] = beta * S[-1, kept]
+        start = keep
+
+    eigenvalues = ht.array(theta[wanted], device=A.device, comm=A.comm)
+    eigenvectors = ht.DNDarray(
+        torch.mm(V[:, :m], S[:, wanted]), (n, k), A.dtype, split, A.device, A.comm
+    )
+
+    return eigenvalues, eigenvectors
@@ -0,0 +1,119 @@
+import torch
+import heat as ht
+
+from ...tests.test_suites.basic_test import TestCase
+
+
+class TestFactorizations(TestCase):
+    def test_cholesky(self):
+        size = ht.communication.MPI_WORLD.size * 4 + 1
+        torch.manual_seed(1)
+        B = torch.rand(size, size, dtype=torch.float64)
+        A_torch = B @ B.t() + size * torch.eye(size, dtype=torch.float64)
+        L_torch = torch.cholesky(A_torch)
+
+        for split in [None, 0, 1]:
+            A = ht.array(A_torch, split=split)
+            for tiles_per_proc in [1, 2]:
+                L = ht.linalg.cholesky(A, tiles_per_proc=tiles_per_proc)
+                self.assertEqual(L.split, split)
+                self.assertEqual(L.dtype, ht.float64)
+                self.assertTrue(torch.allclose(ht.resplit(L, None)._DNDarray__array, L_torch))
+
+                U = ht.linalg.cholesky(A, upper=True, tiles_per_proc=tiles_per_proc)
+                self.assertEqual(U.split, split)
+                self.assertTrue(torch.allclose(ht.resplit(U, None)._DNDarray__array, L_torch.t()))
+
+        # integer matrices are factorized in floating point
+        L = ht.linalg.cholesky(ht.eye(size, dtype=ht.int32, split=0))
+        self.assertEqual(L.dtype, ht.float32)
+        self.assertTrue(ht.equal(L, ht.eye(size, split=0)))
+
+        with self.assertRaises(RuntimeError):
+            ht.linalg.cholesky(ht.eye(size, split=0) * -1)
+        with self.assertRaises(TypeError):
+            ht.linalg.cholesky(A_torch)
+        with self.assertRaises(TypeError):
+            ht.linalg.cholesky(A, upper="upper")
+        with self.assertRaises(ValueError):
+            ht.linalg.cholesky(ht.ones((size, size + 1), split=0))
+
+    def test_lu(self):
+        size = ht.communication.MPI_WORLD.size * 4 + 1
+        torch.manual_seed(2)
+        A_torch = torch.rand(size, size, dtype=torch.float64)
+        LU_torch, _ = torch.lu(A_torch)
+
+        for split in [None, 0, 1]:
+            A = ht.array(A_torch, split=split)
+            for tiles_per_proc in [1, 2]:
+                perm, L, U = ht.linalg.lu(A, tiles_per_proc=tiles_per_proc)
+                self.assertIsNone(perm.split)
+                self.assertEqual(L.split, split)
+                self.assertEqual(U.split, split)
+                L = ht.resplit(L, None)._DNDarray__array
+                U = ht.resplit(U, None)._DNDarray__array
+                self.assertTrue(torch.allclose(A_torch[perm._DNDarray__array], L @ U))
+                self.assertTrue(torch.equal(L, torch.tril(L)))
+                self.assertTrue(torch.equal(L.diagonal(), torch.ones(size, dtype=L.dtype)))
+                # partial pivoting selects the same pivots
+                self.assertTrue(torch.allclose(U, torch.triu(LU_torch)))
+
+        with self.assertRaises(TypeError):
+            ht.linalg.lu(A_torch)
+        with self.assertRaises(ValueError):
+            ht.linalg.lu(ht.ones(size, split=0))
+
+    def test_solve_triangular(self):
+        size = ht.communication.MPI_WORLD.size * 3 + 2
+        torch.manual_seed(3)
+        B = torch.rand(size, size, dtype=torch.float64) / size
+        B.diagonal().add_(1)
+
+        for split in [None, 0, 1]:
+            for upper in [True, False]:
+                T = torch.triu(B) if upper else torch.tril(B)
+                A = ht.array(T, split=split)
+                for b_split, b_shape in [(None, (size,)), (0, (size,)), (0, (size, 3))]:
+                    torch.manual_seed(4)
+                    b_torch = torch.rand(b_shape, dtype=torch.float64)
+                    b = ht.array(b_torch, split=b_split)
+                    for transpose in [False, True]:
+                        for unitriangular in [False, True]:
+                            x = ht.linalg.solve_triangular(
+                                A, b, upper=upper, transpose=transpose, unitriangular=unitriangular
+                            )
+                            self.assertEqual(x.split, b_split)
+                            self.assertEqual(x.shape, b.shape)
+                            M = T.clone()
+                            if unitriangular:
+                                M.diagonal().fill_(1)
+                            M = M.t() if transpose else M
+                            x = ht.resplit(x, None)._DNDarray__array
+                            self.assertTrue(torch.allclose(M @ x, b_torch))
+
+        A = ht.array(torch.triu(B), split=0)
+        with self.assertRaises(TypeError):
+            ht.linalg.solve_triangular(A, torch.ones(size))
+        with self.assertRaises(ValueError):
+            ht.linalg.solve_triangular(A, ht.ones(size + 1))
+        with self.assertRaises(TypeError):
+            ht.linalg.solve_triangular(A, ht.ones(size), upper=1)
+
+    def test_cho_solve(self):
+        size = ht.communication.MPI_WORLD.size * 3 + 2
+        torch.manual_seed(5)
+        B = torch.rand(size, size, dtype=torch.float64)
+        A_torch = B @ B.t() + size * torch.eye(size, dtype=torch.float64)
+        torch.manual_seed(6)
+        b_torch = torch.rand(size, 2, dtype=torch.float64)
+        x_torch = A_torch.inverse() @ b_torch
+
+        for split in [None, 0, 1]:
+            A = ht.array(A_torch, split=split)
+            b = ht.array(b_torch, split=0)
+            for upper in [False, True]:
+                c = ht.linalg.cholesky(A, upper=upper)
+                x = ht.linalg.cho_solve(c, b, upper=upper)
+                self.assertEqual(x.split, 0)
+                self.assertTrue(torch.allclose(ht.resplit(x, None)._DNDarray__array, x_torch))
@@ -0,0 +1,66 @@
+import heat as ht
+
+from ...tests.test_suites.basic_test import TestCase
+
+
+class TestOperators(TestCase):
+    def test_linear_operator(self):
+        size = ht.communication.MPI_WORLD.size * 3
+        A = ht.random.rand(size, size + 1, dtype=ht.float64, split=0)
+        x = ht.ones(size + 1, dtype=ht.float64, split=0)
+        y = ht.ones(size, dtype=ht.float64, split=0)
+
+        op = ht.linalg.LinearOperator(
+            A.shape, lambda v: ht.matmul(A, v), lambda v: ht.matmul(v, A), dtype=ht.float64, split=0
+        )
+        self.assertEqual(op.shape, (size, size + 1))
+        self.assertEqual(op.ndim, 2)
+        self.assertEqual(op.dtype, ht.float64)
+        self.assertEqual(op.split, 0)
+        self.assertIsInstance(repr(op), str)
+        self.assertTrue(ht.allclose(op @ x, ht.matmul(A, x)))
+        self.assertTrue(ht.allclose(op.rmatvec(y), ht.matmul(y, A)))
+        self.assertEqual(op.T.shape, (size + 1, size))
+        self.assertTrue(ht.allclose(op.T.matvec(y), ht.matmul(y, A)))
+
+        with self.assertRaises(ValueError):
+            op.matvec(y)
+        with self.assertRaises(TypeError):
+            op.matvec(x.numpy())
+        with self.assertRaises(ValueError):
+            op.rmatvec(x)
+
+        op = ht.linalg.LinearOperator(A.shape, lambda v: ht.matmul(A, v))
+        self.assertEqual(op.dtype, ht.float32)
+        self.assertIsNone(op.split)
+        with self.assertRaises(NotImplementedError):
+            op.rmatvec(y)
+        with self.assertRaises(NotImplementedError):
+            op.T
+
+        with self.assertRaises(ValueError):
+            ht.linalg.LinearOperator((size,), lambda v: v)
+        with self.assertRaises(TypeError):
+            ht.linalg.LinearOperator(A.shape, A)
+        with self.assertRaises(TypeError):
+            ht.linalg.LinearOperator(A.shape, lambda v: v, A)
+        with self.assertRaises(ValueError):
+            ht.linalg.LinearOperator(A.shape, lambda v: v, split=1)
+
+    def test_aslinearoperator(self):
+        size = ht.communication.MPI_WORLD.size * 3
+        A = ht.random.rand(size, size, dtype=ht.float64, split=1)
+        x = ht.ones(size, dtype=ht.float64)
+
+        op = ht.linalg.aslinearoperator(A)
+        self.assertIsInstance(op, ht.linalg.LinearOperator)
+        self.assertIs(ht.linalg.aslinearoperator(op), op)
+        self.assertEqual(op.split, 0)
+        self.assertEqual(op.dtype, ht.float64)
+        self.assertTrue(ht.allclose(op @ x, ht.matmul(A, x)))
+        self.assertTrue(ht.allclose(op.T @ x, ht.matmul(x, A)))
+
+        with self.assertRaises(TypeError):
+            ht.linalg.aslinearoperator(A.numpy())
+        with self.assertRaises(RuntimeError):
+            ht.linalg.aslinearoperator(x)
@@ -29,3 +29,208 @@ class TestSolver(TestCase):
             ht.linalg.cg(b, b, x0)
         with self.assertRaises(RuntimeError):
             ht.linalg.cg(A, b, A)
+        with self.assertRaises(ValueError):
+            ht.linalg.cg(A, b, x0, M="ilu")
+        with self.assertRaises(TypeError):
+            ht.linalg.cg(A, b, x0, M=lambda r: r._DNDarray__array)
+
+    def test_cg_preconditioned(self):
+        size = ht.communication.MPI_WORLD.size * 6
+        B = ht.random.rand(size, size, dtype=ht.float64)
+        A = B @ B.T + 10 * ht.diag(ht.arange(1, size + 1, dtype=ht.float64))
+        x = ht.ones(size, dtype=ht.float64)
+        b = ht.matmul(A, x)
+
+        for split in [None, 0, 1]:
+            A_split = ht.resplit(A, split)
+            b_split = ht.resplit(b, 0 if split == 0 else None)
+            x0 = ht.zeros(size, dtype=ht.float64, split=b_split.split)
+            iterations = {}
+            for M in [None, "jacobi", "block_jacobi", lambda r: r / 2.0]:
+                for pipelined in [False, True]:
+                    res, info = ht.linalg.cg(
+                        A_split,
+                        b_split,
+                        x0,
+                        tol=1e-8,
+                        max_iter=2 * size,
+                        M=M,
+                        pipelined=pipelined,
+                        return_info=True,
+                    )
+                    self.assertTrue(ht.allclose(ht.resplit(res, None), x, atol=1e-6))
+                    self.assertTrue(info["converged"])
+                    self.assertEqual(len(info["residuals"]), info["n_iter"] + 1)
+                    self.assertTrue(info["residuals"][-1] < 1e-8)
+                    if isinstance(M, str):
+                        iterations[(M, pipelined)] = info["n_iter"]
+
+            # pipelining does not change the iteration in exact arithmetic
+            self.assertLessEqual(
+                abs(iterations[("jacobi", False)] - iterations[("jacobi", True)]), 1
+            )
+            # the local diagonal blocks of the undistributed matrix are the whole matrix
+            if split is None or ht.communication.MPI_WORLD.size == 1:
+                self.assertEqual(iterations[("block_jacobi", False)], 1)
+
+        res, info = ht.linalg.cg(
+            A, b, ht.zeros(size, dtype=ht.float64), max_iter=2, return_info=True
+        )
+        self.assertEqual(info["n_iter"], 2)
+        self.assertFalse(info["converged"])
+
+    def test_lanczos(self):
+        n = ht.communication.MPI_WORLD.size * 10
+        B = ht.random.rand(n, n, dtype=ht.float64)
+        B = B + B.T
+        v0 = ht.full((n,), 1.0 / np.sqrt(n), dtype=ht.float64)
+        for split in [None, 0, 1]:
+            A = ht.resplit(B, split)
+            V, T = ht.lanczos(A, n, v0)
+            self.assertEqual(V.shape, (n, n))
+            self.assertEqual(T.shape, (n, n))
+            self.assertEqual(V.split, None)
+            self.assertEqual(T.dtype, ht.float64)
+            # Krylov vectors are orthonormal and span an invariant subspace for m = n
+            self.assertTrue(ht.allclose(V.T @ V, ht.eye(n, dtype=ht.float64), atol=1e-8))
+            self.assertTrue(ht.allclose(V.T @ A @ V, T, atol=1e-8))
+
+        V_out = ht.zeros((n, 5))
+        T_out = ht.zeros((5, 5))
+        V, T = ht.lanczos(ht.resplit(B, 0), 5, V_out=V_out, T_out=T_out)
+        self.assertEqual(V.shape, (n, 5))
+        self.assertEqual(T.shape, (5, 5))
+
+        with self.assertRaises(TypeError):
+            ht.lanczos(B._DNDarray__array, 5)
+        with self.assertRaises(TypeError):
+            ht.lanczos(B, "5")
+        with self.assertRaises(TypeError):
+            ht.lanczos(ht.zeros((n, n + 1)), 5)
+        with self.assertRaises(RuntimeError):
+            ht.lanczos(ht.zeros(n), 5)
+
+    def test_thick_restart_lanczos(self):
+        n = ht.communication.MPI_WORLD.size * 10
+        diagonal = ht.arange(1, n + 1, dtype=ht.float64)
+        v0 = ht.full((n,), 1.0 / np.sqrt(n), dtype=ht.float64)
+        for split in [None, 0, 1]:
+            A = ht.resplit(ht.diag(diagonal), split)
+            eigenvalues, eigenvectors = ht.linalg.thick_restart_lanczos(
+                A, 3, m=8, v0=v0, tol=1e-10, max_restarts=500
+            )
+            self.assertEqual(eigenvalues.shape, (3,))
+            self.assertEqual(eigenvectors.shape, (n, 3))
+            self.assertTrue(
+                ht.allclose(eigenvalues, ht.array([1.0, 2.0, 3.0], dtype=ht.float64), atol=1e-6)
+            )
+            residual = ht.matmul(A, eigenvectors).resplit_(None) - (
+                eigenvectors.resplit_(None) * eigenvalues
+            )
+            self.assertTrue(ht.norm(residual) < 1e-6)
+
+            eigenvalues, _ = ht.linalg.thick_restart_lanczos(
+                A, 2, m=8, v0=v0, tol=1e-10, max_restarts=500, largest=True
+            )
+            self.assertTrue(
+                ht.allclose(eigenvalues, ht.array([n, n - 1.0], dtype=ht.float64), atol=1e-6)
+            )
+
+        with self.assertRaises(TypeError):
+            ht.linalg.thick_restart_lanczos(A, 2.0)
+        with self.assertRaises(TypeError):
+            ht.linalg.thick_restart_lanczos(A, 2, m=5.0)
+        with self.assertRaises(ValueError):
+            ht.linalg.thick_restart_lanczos(A, 2, m=2)
+        with self.assertRaises(ValueError):
+            ht.linalg.thick_restart_lanczos(A, 2, v0=ht.ones(n + 1))
+
+    def test_gmres(self):
+        size = ht.communication.MPI_WORLD.size * 6
+        B = ht.random.rand(size, size, dtype=ht.float64)
+        A = B + size * ht.eye(size, dtype=ht.float64)
+        x = ht.ones(size, dtype=ht.float64)
+        b = ht.matmul(A, x)
+
+        for split in [None, 0, 1]:
+            A_split = ht.resplit(A, split)
+            b_split = ht.resplit(b, 0 if split == 0 else None)
+            for restart in [5, 20]:
+                res, info = ht.linalg.gmres(
+                    A_split, b_split, tol=1e-8, restart=restart, max_iter=200, return_info=True
+                )
+                self.assertTrue(ht.allclose(ht.resplit(res, None), x, atol=1e-6))
+                self.assertTrue(info["converged"])
+                self.assertTrue(info["residuals"][-1] < 1e-8)
+
+            op = ht.linalg.LinearOperator(
+                A.shape, lambda v: ht.matmul(A_split, v), dtype=ht.float64, split=b_split.split
+            )
+            res = ht.linalg.gmres(op, b_split, tol=1e-8)
+            self.assertTrue(ht.allclose(ht.resplit(res, None), x, atol=1e-6))
+
+        with self.assertRaises(ValueError):
+            ht.linalg.gmres(A, b, restart=0)
+        with self.assertRaises(TypeError):
+            ht.linalg.gmres(A, b.numpy())
+        with self.assertRaises(RuntimeError):
+            ht.linalg.gmres(b, b)
+
+    def test_bicgstab(self):
+        size = ht.communication.MPI_WORLD.size * 6
+        B = ht.random.rand(size, size, dtype=ht.float64)
+        A = B + size * ht.eye(size, dtype=ht.float64)
+        x = ht.ones(size, dtype=ht.float64)
+        b = ht.matmul(A, x)
+
+        for split in [None, 0, 1]:
+            A_split = ht.resplit(A, split)
+            b_split = ht.resplit(b, 0 if split == 0 else None)
+            res, info = ht.linalg.bicgstab(
+                A_split, b_split, tol=1e-8, max_iter=200, return_info=True
+            )
+            self.assertTrue(ht.allclose(ht.resplit(res, None), x, atol=1e-6))
+            self.assertTrue(info["converged"])
+            self.assertEqual(len(info["residuals"]), info["n_iter"] + 1)
+
+            op = ht.linalg.aslinearoperator(A_split)
+            res = ht.linalg.bicgstab(op, b_split, x0=ht.zeros_like(b_split), tol=1e-8)
+            self.assertTrue(ht.allclose(ht.resplit(res, None), x, atol=1e-6))
+
+        res, info = ht.linalg.bicgstab(A, b, max_iter=1, return_info=True)
+        self.assertEqual(info["n_iter"], 1)
+        self.assertFalse(info["converged"])
+
+        with self.assertRaises(TypeError):
+            ht.linalg.bicgstab(A, b, x0=x.numpy())
+        with self.assertRaises(RuntimeError):
+            ht.linalg.bicgstab(A, A)
+
+    def test_minres(self):
+        size = ht.communication.MPI_WORLD.size * 6
+        B = ht.random.rand(size, size, dtype=ht.float64)
+        # symmetric, but indefinite
+        A = B + B.T - 2 * ht.eye(size, dtype=ht.float64)
+        x = ht.ones(size, dtype=ht.float64)
+        b = ht.matmul(A, x)
+
+        for split in [None, 0, 1]:
+            A_split = ht.resplit(A, split)
+            b_split = ht.resplit(b, 0 if split == 0 else None)
+            res, info = ht.linalg.minres(
+                A_split, b_split, tol=1e-8, max_iter=10 * size, return_info=True
+            )
+            self.assertTrue(info["converged"])
+            self.assertEqual(len(info["residuals"]), info["n_iter"] + 1)
+            residual = ht.matmul(A, ht.resplit(res, None)) - b
+            self.assertTrue(ht.norm(residual) < 1e-6)
+
+            op = ht.linalg.aslinearoperator(A_split)
+            res = ht.linalg.minres(op, b_split, tol=1e-8, max_iter=10 * size)
+            residual = ht.matmul(A, ht.resplit(res, None)) - b
+            self.assertTrue(ht.norm(residual) < 1e-6)
+
+        with self.assertRaises(TypeError):
+            ht.linalg.minres(A.numpy(), b)
+        with self.assertRaises(RuntimeError):
+            ht.linalg.minres(A, b, x0=A)
@@ -6,7 +6,6 @@ from .communication import MPI
 from . import arithmetics
 from . import exponential
 from . import factories
-from . import linalg
 from . import manipulations
 from . import _operations
 from . import dndarray
@@ -393,7 +392,20 @@ def cov(m, y=None, rowvar=True, bias=False, ddof=None):
     Returns
     -------
     cov : DNDarray
-        the covariance matrix of the variables
+        the covariance matrix of the variables, split along axis 0 if `m` is distributed
+
+    Notes
+    -----
+    The covariance matrix is computed in a single pass over the observations. The local
+    observations are streamed in chunks, each chunk is centered on its own mean and only the upper
+    triangle of its co-moment matrix is computed blockwise. The chunks and eventually the
+    processes are merged with the pairwise update formulas of Reference 1 in a single reduction.
+    If the variables are distributed, the observations are redistributed first.
+
+    References
+    ----------
+    [1] T. Chan, G. Golub, R. LeVeque, Updating formulae and a pairwise algorithm for computing
+        sample variances, Technical Report STAN-CS-79-773, Stanford University, 1979.
     """
     if ddof is not None and not isinstance(ddof, int):
         raise TypeError("ddof must be integer")
@@ -406,7 +418,7 @@ def cov(m, y=None, rowvar=True, bias=False, ddof=None):
 
     if m.ndim == 1:
         m = m.expand_dims(1)
-    x = m.copy()
+    x = m
     if not rowvar and x.shape[0] != 1:
         x = x.T
 
@@ -432,15 +444,112 @@ def cov(m, y=None, rowvar=True, bias=False, ddof=None):
 
         x = manipulations.concatenate((x, y), axis=0)
 
-    avg = mean(x, axis=1)
     norm = x.shape[1] - ddof
     # find normalization:
     if norm <= 0:
         raise ValueError(f"ddof >= number of elements in m, {ddof} {m.gnumel}")
-    x -= avg.expand_dims(1)
-    c = linalg.dot(x, x.T)
+
+    # the co-moments of a variable pair require all of its observations
+    if x.split == 0:
+        x = manipulations.resplit(x, 1)
+    dtype = types.promote_types(x.dtype, types.float32)
+    n, mu, comoment = __comoments(x._DNDarray__array.to(dtype.torch_type()))
+
+    if x.split is not None:
+        # merge the co-moments of all processes in a single reduction
+        upper = torch.triu_indices(mu.shape[0], mu.shape[0], device=mu.device)
+        packed = torch.cat(
+            (
+                torch.tensor([mu.shape[0], n], dtype=torch.float64, device=mu.device),
+                mu.double(),
+                comoment[upper[0], upper[1]].double(),
+            )
+        ).cpu()
+        # the packed moments are a single element, MPI must not split them into segments
+        packed_type = MPI.DOUBLE.Create_contiguous(packed.numel()).Commit()
+        x.comm.handle.Allreduce(
+            MPI.IN_PLACE, [x.comm.as_mpi_memory(packed), 1, packed_type], MPI_COMOMENTS
+        )
+        packed_type.Free()
+        comoment[upper[0], upper[1]] = packed[2 + mu.shape[0] :].to(comoment)
+
+    c = torch.triu(comoment) + torch.triu(comoment, diagonal=1).t()
     c /= norm
-    return c
+    return factories.array(
+        c, dtype=dtype, split=None if x.split is None else 0, device=x.device, comm=x.comm
+    )
+
+
+def __comoments(x, block_size=256, chunk_size=2 ** 22):
+    """
+    Single-pass number of observations, mean and co-moment matrix of the variables in the rows of
+    the torch tensor x. Only the upper triangle of the co-moment matrix is computed.
+
+    Parameters
+    ----------
+    x : torch.Tensor
+        variables in the rows, observations in the columns
+    block_size : int
+        number of variables in a block row of the co-moment matrix
+    chunk_size : int
+        maximal number of elements in a chunk of observations
+
+    Returns
+    -------
+    n : int
+    mu : torch.Tensor
+    comoment : torch.Tensor
+    """
+    variables, observations = x.shape
+    chunk = chunk_size // variables if chunk_size > variables else 1
+    n = 0
+    mu = torch.zeros(variables, dtype=x.dtype, device=x.device)
+    comoment = torch.zeros((variables, variables), dtype=x.dtype, device=x.device)
+
+    for start in range(0, observations, chunk):
+        centered = x[:, start : start + chunk]
+        chunk_mu = centered.mean(dim=1)
+        centered = centered - chunk_mu.unsqueeze(1)
+        # blockwise upper triangle of the co-moment matrix of the chunk
+        chunk_comoment = torch.zeros_like(comoment)
+        for row in range(0, variables, block_size):
+            block = centered[row : row + block_size]
+            chunk_comoment[row : row + block_size, row:] = block @ centered[row:].t()
+        n, mu, comoment = __merge_comoments(
+            (n, mu, comoment), (centered.shape[1], chunk_mu, chunk_comoment)
+        )
+
+    return n, mu, comoment
+
+
+def __merge_comoments(m1, m2):
+    """
+    Merges the number of observations, means and upper triangular co-moment matrices of two sets
+    of observations of the same variables, see Reference 1 of ``cov``.
+
+    Parameters
+    ----------
+    m1 : tuple
+        number of observations, mean and co-moment matrix of the first set
+    m2 : tuple
+        number of observations, mean and co-moment matrix of the second set
+
+    Returns
+    -------
+    merged_comoments : tuple
+        number of observations, mean and co-moment matrix of the union
+    """
+    n1, mu1, comoment1 = m1
+    n2, mu2, comoment2 = m2
+    n = n1 + n2
+    if n1 == 0 or n2 == 0:
+        return (m2 if n1 == 0 else m1)[:2] + (comoment1 + comoment2,)
+
+    delta = mu2 - mu1
+    mu = mu1 + delta * (n2 / n)
+    comoment = comoment1 + comoment2 + torch.triu(torch.ger(delta, delta)) * (n1 * n2 / n)
+
+    return n, mu, comoment
 
 
 def kurtosis(x, axis=None, unbiased=True, Fischer=True):
@@ -1214,6 +1323,29 @@ def mpi_argmin(a, b, _):
 MPI_ARGMIN = MPI.Op.Create(mpi_argmin, commute=True)
 
 
+def mpi_comoments(a, b, _):
+    lhs = torch.from_numpy(np.frombuffer(a, dtype=np.float64))
+    rhs = torch.from_numpy(np.frombuffer(b, dtype=np.float64))
+
+    # the buffers contain the number of variables and observations, the means and the upper
+    # triangle of the co-moment matrix
+    variables = int(lhs[0].item())
+    upper = torch.triu_indices(variables, variables)
+    moments = []
+    for buffer in (lhs, rhs):
+        comoment = torch.zeros((variables, variables), dtype=torch.float64)
+        comoment[upper[0], upper[1]] = buffer[2 + variables :]
+        moments.append((buffer[1].item(), buffer[2 : 2 + variables], comoment))
+    n, mu, comoment = __merge_comoments(*moments)
+
+    rhs[1] = n
+    rhs[2 : 2 + variables] = mu
+    rhs[2 + variables :] = comoment[upper[0], upper[1]]
+
+
+MPI_COMOMENTS = MPI.Op.Create(mpi_comoments, commute=True)
+
+
 def percentile(x, q, axis=None, out=None, interpolation="linear", keepdim=False):
     """
     Compute the q-th percentile of the data along the specified axis.
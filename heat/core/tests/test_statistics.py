@@ -399,6 +399,16 @@ class TestStatistics(TestCase):
             with self.assertRaises(RuntimeError):
                 ht.cov(htdata, htdata[1:], rowvar=False)
 
+        # more variables than a block row of the co-moment matrix, distributed in both directions
+        np_data = np.random.RandomState(42).randn(40, 300) + 10.0
+        np_cov = np.cov(np_data, rowvar=False)
+        for split in [None, 0, 1]:
+            ht_data = ht.array(np_data, split=split)
+            ht_cov = ht.cov(ht_data, rowvar=False)
+            self.assertEqual(ht_cov.split, None if split is None else 0)
+            self.assertEqual(ht_cov.dtype, ht.float64)
+            self.assertTrue(ht.allclose(ht.array(np_cov), ht_cov, atol=1e-10))
+
         with self.assertRaises(TypeError):
             ht.cov(np_cov)
         with self.assertRaises(TypeError):
@@ -1,6 +1,9 @@
 import torch
 import heat as ht
 
+from ..core._operations import _searchsorted
+from ..core.communication import _exchange
+
 
 class Laplacian:
     def __init__(
@@ -21,24 +24,28 @@ class Laplacian:
         similarity : function f(X) --> similarity matrix
             Metric function that defines similarity between vertices. Should accept a data matrix (n,f) as input and return an (n,n) similarity matrix.
             Additional required parameters can be passed via a lambda function.
+            For mode 'kNN', it is applied to the (n,neighbours) matrix of euclidean distances of the vertices to their nearest neighbours instead and
+            should return the edge weights elementwise, e.g. lambda d: ht.exp(-d ** 2 / 2)
         definition : string
             Type of Laplacian
             'simple': Laplacian matrix for simple graphs L = D - A
             'norm_sym': Symmetric normalized Laplacian L^sym = D^{-1/2} L D^{-1/2} = I - D^{-1/2} A D^{-1/2}
             'norm_rw': L^rw = D^{-1} L = I - D^{-1} A
-        mode : "fc", "eNeighbour"
+        mode : "fc", "eNeighbour", "kNN"
             How to calculate adjacency from the similarity matrix
             "fully_connected" is fully-connected, so A = S
             "eNeighbour" is the epsilon neighbourhood, with A_ji = 0 if S_ij </> lower/upper; for eNeighbour an upper or lower boundary needs to be set
+            "kNN" is the symmetrized k-nearest-neighbour graph A = (W + W^T) / 2, where W_ij is the weight of the edge to the j-th vertex if it is
+            one of the nearest neighbours of the i-th vertex. It is stored as a ht.sparse.DCSR_matrix and the Laplacian is returned as a ht.linalg.LinearOperator
         threshold_key : string
             "upper" or "lower", defining the type of threshold for the epsilon-neighrborhood
         threshold_value : float
             Boundary value for the epsilon-neighrborhood
         neighbours : int
-            Number of neirest neighbors to be considered for adjacency definition. Currently not implemented
+            Number of neirest neighbors to be considered for adjacency definition in mode 'kNN'
         Returns
         -------
-        L : ht.DNDarray
+        L : ht.DNDarray or ht.linalg.LinearOperator
 
         """
         self.similarity_metric = similarity
@@ -49,9 +56,9 @@ class Laplacian:
             )
         else:
             self.definition = definition
-        if mode not in ["eNeighbour", "fully_connected"]:
+        if mode not in ["eNeighbour", "fully_connected", "kNN"]:
             raise NotImplementedError(
-                "Only eNeighborhood and fully-connected graphs supported at the moment."
+                "Only eNeighborhood, kNN and fully-connected graphs supported at the moment."
             )
         else:
             self.mode = mode
@@ -66,41 +73,142 @@ class Laplacian:
         self.neighbours = neighbours
 
     def _normalized_symmetric_L(self, A):
-        degree = ht.sum(A, axis=1)
-        degree.resplit_(axis=None)
+        """
+        Turns the adjacency matrix A in-place into I - D^{-1/2} A D^{-1/2}.
+        """
+        degree = self.__degree(A)
         # Find stand-alone vertices with no connections
-        temp = torch.ones(
-            degree.shape, dtype=degree._DNDarray__array.dtype, device=degree.device.torch_device
-        )
-        degree._DNDarray__array = torch.where(
-            degree._DNDarray__array == 0, temp, degree._DNDarray__array
-        )
-        L = A / ht.sqrt(ht.expand_dims(degree, axis=1))
-        L = L / ht.sqrt(ht.expand_dims(degree, axis=0))
-        L = L * (-1.0)
-        L.fill_diagonal(1.0)
-        return L
+        degree[degree == 0] = 1
+        scale = degree.rsqrt()
+        row_offset, col_offset, diagonal = self.__diagonal(A)
+        local = A._DNDarray__array
+        local.mul_(scale[row_offset : row_offset + local.shape[0]].neg().unsqueeze(1))
+        local.mul_(scale[col_offset : col_offset + local.shape[1]].unsqueeze(0))
+        local[diagonal - row_offset, diagonal - col_offset] = 1.0
+        return A
 
     def _simple_L(self, A):
+        """
+        Turns the adjacency matrix A in-place into D - A.
+        """
+        degree = self.__degree(A)
+        row_offset, col_offset, diagonal = self.__diagonal(A)
+        local = A._DNDarray__array
+        local.neg_()
+        local[diagonal - row_offset, diagonal - col_offset] += degree[diagonal]
+        return A
+
+    def __degree(self, A):
+        """
+        Degrees of all vertices. The row sums are local for row-distributed matrices, only the vector of the degrees
+        is communicated.
+        """
         degree = ht.sum(A, axis=1)
-        L = ht.diag(degree) - A
-        return L
+        degree.resplit_(axis=None)
+        return degree._DNDarray__array.to(A._DNDarray__array.dtype)
+
+    def __diagonal(self, A):
+        """
+        Global offsets of the local rows and columns of A and the global indices of the local diagonal elements.
+        """
+        local = A._DNDarray__array
+        offsets = [0, 0]
+        if A.split is not None and A.comm.is_distributed():
+            offsets[A.split] = A.create_lshape_map()[: A.comm.rank, A.split].sum().item()
+        start = max(offsets)
+        end = min(offsets[0] + local.shape[0], offsets[1] + local.shape[1])
+        diagonal = torch.arange(start, max(start, end), device=local.device)
+        return offsets[0], offsets[1], diagonal
+
+    def _knn_L(self, X):
+        """
+        Laplacian of the symmetrized k-nearest-neighbour graph of X without dense materialization. The adjacency
+        matrix is a ht.sparse.DCSR_matrix, the Laplacian only applies it to vectors.
+        """
+        if not isinstance(self.neighbours, int) or self.neighbours < 1:
+            raise ValueError(
+                "neighbours needs to be a positive int, but was {}".format(self.neighbours)
+            )
+        comm = X.comm
+        distributed = X.split == 0 and comm.is_distributed()
+        if distributed and not X.is_balanced():
+            X = X.copy()
+            X.balance_()
+        n = X.shape[0]
+
+        # every vertex is its own first neighbour, self-loops are dropped below
+        k = min(self.neighbours + 1, n)
+        distances, indices = ht.spatial.NearestNeighbors(k).fit(X).kneighbors(X)
+        if self.weighted:
+            weights = self.similarity_metric(distances)._DNDarray__array
+        else:
+            weights = torch.ones_like(distances._DNDarray__array)
+        cols = indices._DNDarray__array
+        device = cols.device
+
+        offset, bounds = 0, None
+        if distributed:
+            bounds = X.create_lshape_map()[:, 0].to(device).long().cumsum(0)
+            offset = (bounds[comm.rank] - X.lshape[0]).item()
+        rows = torch.arange(offset, offset + cols.shape[0], device=device).unsqueeze(1)
+        edges = cols != rows
+        rows, cols = rows.expand_as(cols)[edges], cols[edges]
+        weights = weights[edges] / 2
+
+        # the transposed edges are sent to the processes holding their rows
+        if distributed:
+            owners = _searchsorted(bounds, cols, right=True)
+            (t_rows, t_cols, t_weights), _, _, _ = _exchange(comm, owners, cols, rows, weights)
+        else:
+            t_rows, t_cols, t_weights = cols, rows, weights
+        rows = torch.cat((rows, t_rows)) - offset
+        A = torch.sparse_coo_tensor(
+            torch.stack((rows, torch.cat((cols, t_cols)))),
+            torch.cat((weights, t_weights)),
+            (X.lshape[0], n),
+        )
+        dtype = ht.core.types.canonical_heat_type(weights.dtype)
+        split = 0 if distributed else None
+        A = ht.sparse.DCSR_matrix(A, (n, n), dtype, split, X.device, comm)
+
+        degree = A.sum(axis=1)
+        # Find stand-alone vertices with no connections
+        degree._DNDarray__array[degree._DNDarray__array == 0] = 1
+        scale = 1.0 / ht.sqrt(degree)
+
+        def matvec(v):
+            if v.split != split:
+                v = ht.resplit(v, split)
+            if self.definition == "norm_sym":
+                return v - scale * (A @ (scale * v))
+            return degree * v - A @ v
+
+        return ht.linalg.LinearOperator(
+            (n, n), matvec, matvec, dtype=dtype, split=split, device=X.device, comm=comm
+        )
 
     def construct(self, X):
+        if self.mode == "kNN":
+            return self._knn_L(X)
+
+        # the similarity matrix is the only n x n array, it is turned into the Laplacian in-place
         S = self.similarity_metric(X)
-        S.fill_diagonal(0.0)
+        if not ht.core.types.heat_type_is_inexact(S.dtype):
+            S = S.astype(ht.float32)
+        row_offset, col_offset, diagonal = self.__diagonal(S)
+        S._DNDarray__array[diagonal - row_offset, diagonal - col_offset] = 0.0
 
         if self.mode == "eNeighbour":
+            local = S._DNDarray__array
             if self.epsilon[0] == "upper":
-                if self.weighted:
-                    S = ht.where(S < self.epsilon[1], S, 0)
-                else:
-                    S = ht.int(S < self.epsilon[1])
+                inside = local < self.epsilon[1]
+            else:
+                inside = local > self.epsilon[1]
+            if self.weighted:
+                local.masked_fill_(inside.logical_not_(), 0.0)
             else:
-                if self.weighted:
-                    S = ht.where(S > self.epsilon[1], S, 0)
-                else:
-                    S = ht.int(S > self.epsilon[1])
+                local.copy_(inside)
+            del inside
 
         if self.definition == "simple":
             L = self._simple_L(S)
@@ -1,6 +1,8 @@
 import os
 import unittest
 
+import torch
+
 import heat as ht
 
 from heat.core.tests.test_suites.basic_test import TestCase
@@ -67,9 +69,106 @@ class TestLaplacian(TestCase):
             )
         with self.assertRaises(NotImplementedError):
             L = ht.graph.Laplacian(
-                lambda x: ht.spatial.cdist(x, quadratic_expansion=True), mode="kNN"
+                lambda x: ht.spatial.cdist(x, quadratic_expansion=True), mode="mutual_kNN"
             )
         with self.assertRaises(NotImplementedError):
             L = ht.graph.Laplacian(
                 lambda x: ht.spatial.cdist(x, quadratic_expansion=True), definition="norm_rw"
             )
+
+    def test_knn_laplacian(self):
+        size = ht.communication.MPI_WORLD.size
+        n = size * 4
+        ht.random.seed(1)
+        X = ht.random.randn(n, 3, split=0)
+        v = ht.arange(n, dtype=ht.float32, split=0)
+
+        # with n - 1 neighbours the kNN graph is complete
+        L = ht.graph.Laplacian(
+            lambda d: d, weighted=False, definition="simple", mode="kNN", neighbours=n - 1
+        )
+        res = L.construct(X)
+        self.assertIsInstance(res, ht.linalg.LinearOperator)
+        self.assertEqual(res.shape, (n, n))
+        self.assertEqual(res.split, 0)
+        self.assertTrue(ht.allclose(res @ v, n * v - v.sum(), atol=1e-3))
+
+        L = ht.graph.Laplacian(lambda d: ht.exp(d ** 2 * (-0.5)), mode="kNN", neighbours=n - 1)
+        dense = ht.graph.Laplacian(lambda x: ht.spatial.rbf(x, sigma=1.0)).construct(X)
+        self.assertTrue(ht.allclose(L.construct(X) @ v, ht.matmul(dense, v), atol=1e-3))
+
+        # replicated data
+        res = L.construct(X.resplit(None))
+        self.assertIsNone(res.split)
+        self.assertTrue(ht.allclose(res @ v.resplit(None), ht.matmul(dense, v), atol=1e-3))
+
+        # the graph is symmetric, the Laplacian positive semi-definite with the smallest eigenvalue 0
+        L = ht.graph.Laplacian(lambda d: ht.exp(d ** 2 * (-0.5)), mode="kNN", neighbours=3)
+        eigenvalues, _ = ht.linalg.thick_restart_lanczos(L.construct(X), 2, m=n - 1)
+        self.assertGreaterEqual(eigenvalues.min().item(), -1e-4)
+        self.assertAlmostEqual(eigenvalues[0].item(), 0.0, places=3)
+
+        with self.assertRaises(ValueError):
+            ht.graph.Laplacian(lambda d: d, mode="kNN", neighbours=0).construct(X)
+
+    def test_laplacian_values(self):
+        size = ht.communication.MPI_WORLD.size
+        torch.manual_seed(1)
+        x = torch.rand(size * 3 + 1, 2, dtype=torch.float64)
+        # a vertex far away from all others is isolated in the epsilon neighbourhood graph
+        x[-1] = 10.0
+        distances = torch.cdist(x, x)
+        similarity = torch.exp(-(distances ** 2) / 2)
+        similarity.fill_diagonal_(0)
+        within = torch.where(distances < 0.5, distances, torch.zeros_like(distances))
+        within.fill_diagonal_(0)
+        unweighted = (distances > 0.5).double()
+
+        def simple(A):
+            return torch.diag(A.sum(dim=1)) - A
+
+        def norm_sym(A):
+            degree = A.sum(dim=1)
+            degree[degree == 0] = 1
+            L = -A / degree.sqrt().unsqueeze(1) / degree.sqrt().unsqueeze(0)
+            return L.fill_diagonal_(1)
+
+        for split in [None, 0]:
+            X = ht.array(x, split=split)
+            for L, expected in [
+                (
+                    ht.graph.Laplacian(lambda x: ht.spatial.rbf(x), definition="simple"),
+                    simple(similarity),
+                ),
+                (ht.graph.Laplacian(lambda x: ht.spatial.rbf(x)), norm_sym(similarity)),
+                (
+                    ht.graph.Laplacian(
+                        lambda x: ht.spatial.cdist(x), mode="eNeighbour", threshold_value=0.5
+                    ),
+                    norm_sym(within),
+                ),
+                (
+                    ht.graph.Laplacian(
+                        lambda x: ht.spatial.cdist(x),
+                        definition="simple",
+                        mode="eNeighbour",
+                        threshold_value=0.5,
+                    ),
+                    simple(within),
+                ),
+                (
+                    ht.graph.Laplacian(
+                        lambda x: ht.spatial.cdist(x),
+                        weighted=False,
+                        definition="simple",
+                        mode="eNeighbour",
+                        threshold_key="lower",
+                        threshold_value=0.5,
+                    ),
+                    simple(unweighted),
+                ),
+            ]:
+                res = L.construct(X)
+                self.assertEqual(res.split, split)
+                res = ht.resplit(res, None)._DNDarray__array.double()
+                self.assertTrue(torch.allclose(res, expected, atol=1e-4))
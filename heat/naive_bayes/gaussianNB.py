@@ -1,6 +1,8 @@
 import heat as ht
 import torch
 
+from heat.core._operations import _searchsorted
+
 
 class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
     """
@@ -131,37 +133,38 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
         return False
 
     @staticmethod
-    def __update_mean_variance(n_past, mu, var, X, sample_weight=None):
+    def __update_mean_variance(n_past, mu, var, n_new, new_mu, new_var):
         """
         Adapted to HeAT from scikit-learn.
 
-        Compute online update of Gaussian mean and variance.
-        Given starting sample count, mean, and variance, a new set of
-        points X, and optionally sample weights, return the updated mean and
-        variance. (NB - each dimension (column) in X is treated as independent
-        -- you get variance, not covariance).
-        Can take scalar mean and variance, or vector mean and variance to
-        simultaneously update a number of independent Gaussians.
+        Combine Gaussian means and variances of past and new samples. All classes are
+        updated at once, each row holds the independent Gaussians of one class (NB - each
+        dimension (column) is treated as independent -- you get variance, not covariance).
+        Classes without new samples keep their mean and variance.
         See Chan, Golub, and LeVeque 1983 [1]
 
         Parameters
         ----------
-        n_past : int
+        n_past : torch.Tensor of shape (n_classes, 1)
             Number of samples represented in old mean and variance. If sample
             weights were given, this should contain the sum of sample
             weights represented in old mean and variance.
-        mu : ht.tensor of shape (number of Gaussians,)
+        mu : torch.Tensor of shape (n_classes, n_features)
             Means for Gaussians in original set.
-        var : ht.tensor of shape (number of Gaussians,)
+        var : torch.Tensor of shape (n_classes, n_features)
             Variances for Gaussians in original set.
-        sample_weight : ht.tensor of shape (n_samples,), optional (default=None)
-            Weights applied to individual samples (1. for unweighted).
+        n_new : torch.Tensor of shape (n_classes, 1)
+            (Weighted) number of new samples of each class.
+        new_mu : torch.Tensor of shape (n_classes, n_features)
+            Means for Gaussians in the new samples.
+        new_var : torch.Tensor of shape (n_classes, n_features)
+            Variances for Gaussians in the new samples.
 
         Returns
         -------
-        total_mu : ht.tensor of shape (number of Gaussians,)
+        total_mu : torch.Tensor of shape (n_classes, n_features)
             Updated mean for each Gaussian over the combined set.
-        total_var : ht.tensor of shape (number of Gaussians,)
+        total_var : torch.Tensor of shape (n_classes, n_features)
             Updated variance for each Gaussian over the combined set.
 
         References
@@ -169,24 +172,9 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
         [1] Chan, Tony F., Golub, Gene H., and Leveque, Randall J., "Algorithms for Computing the Sample Variance: Analysis
         and Recommendations", The American Statistician, 37:3, pp. 242-247, 1983
         """
-        if X.shape[0] == 0:
-            return mu, var
-
-        # Compute (potentially weighted) mean and variance of new datapoints
-        # TODO:Issue #351 allow weighted average across multiple axes
-        if sample_weight is not None:
-            n_new = float(sample_weight.sum())
-            new_mu = ht.average(X, axis=0, weights=sample_weight)
-            new_var = ht.average((X - new_mu) ** 2, axis=0, weights=sample_weight)
-        else:
-            n_new = X.shape[0]
-            new_var = ht.var(X, axis=0)
-            new_mu = ht.mean(X, axis=0)
-
-        if n_past == 0:
-            return new_mu, new_var
-
-        n_total = float(n_past + n_new)
+        n_total = n_past + n_new
+        # classes without any samples keep their zero mean and variance
+        n_total = torch.where(n_total > 0, n_total, torch.ones_like(n_total))
         # Combine mean of old and new data, taking into consideration
         # (weighted) number of observations
         total_mu = (n_new * new_mu + n_past * mu) / n_total
@@ -200,6 +188,27 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
 
         return total_mu, total_var
 
+    @staticmethod
+    def __local_rows(a, X):
+        """
+        Returns the local torch tensor of the 1-D DNDarray a holding the entries of the
+        local rows of X.
+        """
+        if X.split is None:
+            if a.split is not None:
+                a = ht.resplit(a, axis=None)
+            return a._DNDarray__array
+
+        counts = X.create_lshape_map()[:, :1]
+        if a.split is None:
+            offset = counts[: X.comm.rank].sum().item()
+            return a._DNDarray__array[offset : offset + X.lshape[0]]
+        lshape_map = a.create_lshape_map()
+        if not torch.equal(lshape_map, counts):
+            a = a.copy()
+            a.redistribute_(lshape_map=lshape_map, target_map=counts)
+        return a._DNDarray__array
+
     def partial_fit(self, X, y, classes=None, sample_weight=None):
         """
         Adapted to HeAT from scikit-learn.
@@ -290,9 +299,12 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
         if _refit:
             self.classes_ = None
 
-        if self.__check_partial_fit_first_call(classes):
+        first_call = self.__check_partial_fit_first_call(classes)
+        if first_call:
             # This is the first call to partial_fit:
             # initialize various cumulative counters
+            if self.classes_.split is not None:
+                self.classes_ = ht.resplit(self.classes_, axis=None)
             n_features = X.shape[1]
             n_classes = len(self.classes_)
             self.theta_ = ht.zeros((n_classes, n_features), dtype=X.dtype, device=X.device)
@@ -329,51 +341,70 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
                         X.shape[1], self.theta_.shape[1]
                     )
                 )
-            # Put epsilon back in each time
-            self.sigma_[:, :] -= self.epsilon_
-
-        classes = self.classes_
-
-        unique_y = ht.unique(y, sorted=True)
-        if unique_y.split is not None:
-            unique_y = ht.resplit(unique_y, axis=None)
-        unique_y_in_classes = ht.eq(unique_y, classes)
 
-        if not ht.all(unique_y_in_classes):
+        if X.split not in [None, 0]:
+            X = ht.resplit(X, axis=0)
+        local = X._DNDarray__array
+        labels = self.__local_rows(y, X)
+        distributed = X.split is not None and X.comm.is_distributed()
+
+        # map the labels to the indices of their classes, classes_ need not be sorted
+        classes = self.classes_._DNDarray__array
+        order = torch.argsort(classes)
+        indices = _searchsorted(classes[order], labels.to(classes.dtype))
+        indices = order[indices.clamp(max=classes.shape[0] - 1)]
+        unknown = labels[classes[indices] != labels]
+        n_unknown = unknown.numel()
+        if distributed:
+            n_unknown = X.comm.allreduce(n_unknown, ht.communication.MPI.SUM)
+        if n_unknown > 0:
+            unknown = set(unknown.tolist())
+            if distributed:
+                unknown = set().union(*X.comm.allgather(unknown))
             raise ValueError(
                 "The target label(s) {} in y do not exist in the "
-                "initial classes {}".format(unique_y[~unique_y_in_classes], classes)
+                "initial classes {}".format(sorted(unknown), self.classes_)
             )
-        for y_i in unique_y:
-            # assuming classes.split is None
-            if y_i in classes:
-                i = ht.where(classes == y_i).item()
-            else:
-                classes_ext = torch.cat(
-                    (classes._DNDarray__array, y_i._DNDarray__array.unsqueeze(0))
-                )
-                i = torch.argsort(classes_ext)[-1].item()
-            where_y_i = ht.where(y == y_i)
-            X_i = X[where_y_i, :]
-
-            if sample_weight is not None:
-                sw_i = sample_weight[where_y_i]
-                if 0 not in sw_i.shape:
-                    N_i = sw_i.sum()
-                else:
-                    N_i = 0.0
-                    sw_i = None
-            else:
-                sw_i = None
-                N_i = X_i.shape[0]
-            new_theta, new_sigma = self.__update_mean_variance(
-                self.class_count_[i], self.theta_[i, :], self.sigma_[i, :], X_i, sw_i
-            )
-            self.theta_[i, :] = new_theta
-            self.sigma_[i, :] = new_sigma
-            self.class_count_[i] += N_i
 
-        self.sigma_[:, :] += self.epsilon_
+        dtype = self.theta_._DNDarray__array.dtype
+        theta = self.theta_._DNDarray__array.double()
+        sigma = self.sigma_._DNDarray__array.double()
+        if sample_weight is not None:
+            weights = self.__local_rows(sample_weight, X).double()
+        else:
+            weights = torch.ones(local.shape[0], dtype=torch.float64, device=theta.device)
+
+        # (weighted) per-class sums and sums of squares, scattered in a single pass. The
+        # samples are shifted by the past means and accumulated in double precision to
+        # avoid cancellation in the variances
+        shifted = local.double() - theta[indices]
+        weighted = weights.unsqueeze(1) * shifted
+        stats = torch.zeros(
+            (theta.shape[0], 2 * theta.shape[1] + 1), dtype=torch.float64, device=theta.device
+        )
+        stats.index_add_(
+            0, indices, torch.cat((weighted, weighted * shifted, weights.unsqueeze(1)), dim=1)
+        )
+        if distributed:
+            X.comm.Allreduce(ht.communication.MPI.IN_PLACE, stats, ht.communication.MPI.SUM)
+
+        n_new = stats[:, -1:]
+        n_safe = torch.where(n_new > 0, n_new, torch.ones_like(n_new))
+        new_mu = stats[:, : theta.shape[1]] / n_safe
+        new_var = (stats[:, theta.shape[1] : -1] / n_safe - new_mu ** 2).clamp(min=0)
+        new_mu += theta
+
+        # Put epsilon back in each time
+        epsilon = self.epsilon_.item()
+        n_past = self.class_count_._DNDarray__array.double().unsqueeze(1)
+        if not first_call:
+            sigma = sigma - epsilon
+        theta, sigma = self.__update_mean_variance(n_past, theta, sigma, n_new, new_mu, new_var)
+        theta, sigma = theta.to(dtype), (sigma + epsilon).to(dtype)
+
+        self.theta_ = ht.array(theta, device=X.device)
+        self.sigma_ = ht.array(sigma, device=X.device)
+        self.class_count_ = self.class_count_ + ht.array(n_new.squeeze(1), device=X.device)
 
         # Update if only no priors is provided
         if self.priors is None:
@@ -387,18 +418,36 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
         Adapted to HeAT from scikit-learn.
 
         Calculates joint log-likelihood for n_samples to be assigned to each class.
-        Returns ht.DNDarray joint_log_likelihood(n_samples, n_classes).
+        Returns ht.DNDarray joint_log_likelihood(n_samples, n_classes), distributed like
+        the rows of X. The log-likelihoods of all classes are evaluated in one batch on the
+        local samples.
         """
-
-        jll_size = self.classes_._DNDarray__array.numel()
-        jll_shape = (X.shape[0], jll_size)
-        joint_log_likelihood = ht.empty(jll_shape, dtype=X.dtype, split=X.split, device=X.device)
-        for i in range(jll_size):
-            jointi = ht.log(self.class_prior_[i])
-            n_ij = -0.5 * ht.sum(ht.log(2.0 * ht.pi * self.sigma_[i, :]))
-            n_ij -= 0.5 * ht.sum(((X - self.theta_[i, :]) ** 2) / (self.sigma_[i, :]), 1)
-            joint_log_likelihood[:, i] = jointi + n_ij
-        return joint_log_likelihood
+        if X.split not in [None, 0]:
+            X = ht.resplit(X, axis=0)
+        local = X._DNDarray__array
+        dtype = torch.promote_types(local.dtype, self.theta_._DNDarray__array.dtype)
+        local = local.to(dtype)
+        theta = self.theta_._DNDarray__array.to(dtype)
+        sigma = self.sigma_._DNDarray__array.to(dtype)
+        precision = 1.0 / sigma
+        prior = self.class_prior_._DNDarray__array.to(dtype)
+
+        joint_log_likelihood = torch.log(prior) - 0.5 * torch.log(2.0 * ht.pi * sigma).sum(1)
+        joint_log_likelihood = joint_log_likelihood.repeat(local.shape[0], 1)
+        # the squared distances are evaluated directly in row blocks of bounded size, an
+        # expansion into matrix products cancels for features with large offsets
+        rows = max(1, 2 ** 22 // max(1, theta.numel()))
+        for start in range(0, local.shape[0], rows):
+            block = local[start : start + rows].unsqueeze(1) - theta
+            joint_log_likelihood[start : start + rows] -= 0.5 * (block ** 2 * precision).sum(2)
+        return ht.DNDarray(
+            joint_log_likelihood,
+            (X.shape[0], theta.shape[0]),
+            ht.core.types.canonical_heat_type(dtype),
+            X.split,
+            X.device,
+            X.comm,
+        )
 
     def logsumexp(self, a, axis=None, b=None, keepdim=False, return_sign=False):
         """
@@ -494,7 +543,10 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
         if not isinstance(X, ht.DNDarray):
             raise ValueError("input needs to be a ht.DNDarray, but was {}".format(type(X)))
         jll = self.__joint_log_likelihood(X)
-        return self.classes_[ht.argmax(jll, axis=1).numpy()]
+        labels = self.classes_._DNDarray__array[jll._DNDarray__array.argmax(1)]
+        return ht.DNDarray(
+            labels, (jll.shape[0],), self.classes_.dtype, jll.split, jll.device, jll.comm
+        )
 
     def predict_log_proba(self, X):
         """
@@ -515,11 +567,10 @@ class GaussianNB(ht.ClassificationMixin, ht.BaseEstimator):
         """
         # TODO: sanitation/validation module, cf. #468, log_prob_x must be 2D (cf. np.atleast_2D)
         jll = self.__joint_log_likelihood(X)
-        log_prob_x_shape = (jll.gshape[0], 1)
-        log_prob_x = ht.empty(log_prob_x_shape, dtype=jll.dtype, split=jll.split, device=jll.device)
-        # normalize by P(x) = P(f_1, ..., f_n)
-        log_prob_x._DNDarray__array = self.logsumexp(jll, axis=1)._DNDarray__array.unsqueeze(1)
-        return jll - log_prob_x
+        # normalize by P(x) = P(f_1, ..., f_n), the samples are normalized independently
+        local = jll._DNDarray__array
+        local = local - torch.logsumexp(local, dim=1, keepdim=True)
+        return ht.DNDarray(local, jll.shape, jll.dtype, jll.split, jll.device, jll.comm)
 
     def predict_proba(self, X):
         """
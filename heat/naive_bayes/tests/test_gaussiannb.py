@@ -163,6 +163,90 @@ class TestGaussianNB(TestCase):
             gnb_heat.priors = priors_wrong_sign
             gnb_heat.fit(X_train, y_train)
 
+    def test_many_classes(self):
+        torch.manual_seed(1)
+        n_classes = 12
+        data = torch.randn(240, 3, dtype=torch.float64)
+        labels = torch.arange(240) % n_classes
+        data += labels.unsqueeze(1).to(data.dtype)
+        weights = torch.rand(240, dtype=torch.float64) + 0.5
+
+        # per-class reference statistics
+        theta = torch.stack([data[labels == i].mean(0) for i in range(n_classes)])
+        sigma = torch.stack([data[labels == i].var(0, unbiased=False) for i in range(n_classes)])
+        weighted_theta = torch.stack(
+            [
+                (weights[labels == i].unsqueeze(1) * data[labels == i]).sum(0)
+                / weights[labels == i].sum()
+                for i in range(n_classes)
+            ]
+        )
+
+        for split in [None, 0]:
+            X = ht.array(data, split=split)
+            y = ht.array(labels, split=split)
+            gnb = ht.naive_bayes.GaussianNB().fit(X, y)
+            epsilon = gnb.epsilon_.item()
+            self.assertEqual(gnb.theta_.shape, (n_classes, 3))
+            self.assertTrue(torch.allclose(gnb.theta_._DNDarray__array, theta))
+            self.assertTrue(torch.allclose(gnb.sigma_._DNDarray__array - epsilon, sigma))
+            self.assert_array_equal(gnb.class_count_, np.full(n_classes, 20.0))
+
+            # the predictions are normalized per sample and distributed like X
+            proba = gnb.predict_proba(X)
+            self.assertEqual(proba.shape, (240, n_classes))
+            self.assertEqual(proba.split, split)
+            self.assertTrue(ht.allclose(proba.sum(axis=1), ht.ones(240, dtype=ht.float64)))
+            predicted = gnb.predict(X)
+            self.assertEqual(predicted.split, split)
+            self.assertTrue(ht.equal(predicted, ht.argmax(proba, axis=1)))
+
+            # online updates in two chunks match a single fit
+            online = ht.naive_bayes.GaussianNB()
+            classes = ht.arange(n_classes)
+            online.partial_fit(X[:100], y[:100], classes=classes)
+            online.partial_fit(X[100:], y[100:])
+            self.assertTrue(torch.allclose(online.theta_._DNDarray__array, theta))
+            self.assertTrue(
+                torch.allclose(online.sigma_._DNDarray__array - online.epsilon_.item(), sigma)
+            )
+
+            # sample weights
+            w = ht.array(weights, split=split)
+            gnb.fit(X, y, sample_weight=w)
+            self.assertTrue(torch.allclose(gnb.theta_._DNDarray__array, weighted_theta))
+            self.assertTrue(ht.allclose(gnb.class_count_.sum(), ht.array(weights.sum().item())))
+
+            # unknown labels
+            with self.assertRaises(ValueError):
+                online.partial_fit(X, y + n_classes)
+
+    def test_large_offset(self):
+        # features with a large offset and small spread in single precision
+        torch.manual_seed(2)
+        labels = torch.arange(200) % 2
+        data = 1e4 + torch.randn(200, 2, dtype=torch.float64) + 3.0 * labels.unsqueeze(1)
+        sigma = torch.stack([data[labels == i].var(0, unbiased=False) for i in range(2)])
+
+        for split in [None, 0]:
+            X = ht.array(data.float(), split=split)
+            y = ht.array(labels, split=split)
+            gnb = ht.naive_bayes.GaussianNB().fit(X, y)
+            variance = gnb.sigma_._DNDarray__array.double() - gnb.epsilon_.item()
+            self.assertTrue(torch.allclose(variance, sigma, rtol=1e-3))
+
+            expected = ht.array(data.float().double(), split=split)
+            reference = ht.naive_bayes.GaussianNB().fit(expected, y)
+            self.assertTrue(
+                ht.allclose(
+                    gnb.predict_log_proba(X).astype(ht.float64),
+                    reference.predict_log_proba(expected),
+                    rtol=1e-3,
+                    atol=1e-3,
+                )
+            )
+            self.assertTrue(ht.equal(gnb.predict(X), reference.predict(expected)))
+
     def test_exception(self):
         with self.assertRaises(ValueError):
             ht.naive_bayes.GaussianNB().set_params(foo="bar")
@@ -0,0 +1 @@
+from .preprocessing import *
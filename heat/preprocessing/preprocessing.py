@@ -0,0 +1,542 @@
+import heat as ht
+import torch
+
+__all__ = ["MinMaxScaler", "RobustScaler", "StandardScaler"]
+
+
+class StandardScaler(ht.TransformMixin, ht.BaseEstimator):
+    """
+    Standardizes the features by removing the mean and scaling to unit variance, based on
+    scikit-learn.preprocessing.StandardScaler.
+
+    The means and variances of all features are computed in a single pass over the local samples, the sums are
+    reduced in one Allreduce. The statistics can be updated with partial_fit on a stream of chunks and are combined
+    with those of the previous chunks as in [1].
+
+    Parameters
+    ----------
+    copy : bool, optional
+        If False, transform and inverse_transform modify floating point inputs in-place. Default: True
+    with_mean : bool, optional
+        Whether to center the data. Default: True
+    with_std : bool, optional
+        Whether to scale the data to unit variance. Default: True
+
+    Attributes
+    ----------
+    mean_ : ht.DNDarray, shape (n_features,)
+        The mean of each feature
+    var_ : ht.DNDarray, shape (n_features,)
+        The variance of each feature
+    scale_ : ht.DNDarray, shape (n_features,)
+        The standard deviation of each feature, 1 for constant features, None if not with_std
+    n_samples_seen_ : int
+        The number of samples seen by the estimator
+
+    References
+    ----------
+    [1] Chan, Tony F., Golub, Gene H., and Leveque, Randall J., "Algorithms for Computing the Sample Variance: Analysis
+    and Recommendations", The American Statistician, 37:3, pp. 242-247, 1983
+
+    Examples
+    --------
+    >>> X = ht.array([[0.0, 0.0], [0.0, 0.0], [1.0, 1.0], [1.0, 1.0]], split=0)
+    >>> scaler = ht.preprocessing.StandardScaler().fit(X)
+    >>> scaler.mean_
+    tensor([0.5000, 0.5000])
+    >>> scaler.transform(ht.array([[2.0, 2.0]]))
+    tensor([[3., 3.]])
+    """
+
+    def __init__(self, copy=True, with_mean=True, with_std=True):
+        self.copy = copy
+        self.with_mean = with_mean
+        self.with_std = with_std
+
+        # in-place properties
+        self.mean_ = None
+        self.var_ = None
+        self.scale_ = None
+        self.n_samples_seen_ = 0
+
+    def fit(self, X):
+        """
+        Computes the mean and variance of the features of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The data, X.split can be None or 0
+
+        Returns
+        -------
+        self : StandardScaler
+        """
+        self.mean_, self.var_, self.scale_, self.n_samples_seen_ = None, None, None, 0
+        return self.partial_fit(X)
+
+    def partial_fit(self, X):
+        """
+        Updates the mean and variance of the features with the samples of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The next chunk of the data, X.split can be None or 0
+
+        Returns
+        -------
+        self : StandardScaler
+        """
+        _sanitize_samples(X, None if self.mean_ is None else self.mean_.shape[0])
+        local = X._DNDarray__array
+        n_new = X.shape[0]
+        if n_new == 0:
+            return self
+
+        # the samples are shifted by the previous means to reduce cancellation in the variances
+        if self.mean_ is None:
+            shift = torch.zeros(X.shape[1], dtype=torch.float64, device=local.device)
+        else:
+            shift = self.mean_._DNDarray__array.double()
+        sums = torch.zeros(2, X.shape[1], dtype=torch.float64, device=local.device)
+        for block in _blocks(local):
+            block = block.double() - shift
+            sums[0] += block.sum(dim=0)
+            sums[1] += block.pow_(2).sum(dim=0)
+        if X.split is not None and X.comm.is_distributed():
+            X.comm.Allreduce(ht.communication.MPI.IN_PLACE, sums, ht.communication.MPI.SUM)
+
+        new_mean = sums[0] / n_new
+        new_ssd = (sums[1] - sums[0] * new_mean).clamp(min=0.0)
+        new_mean += shift
+        n_total = self.n_samples_seen_ + n_new
+        if self.mean_ is None:
+            mean, ssd = new_mean, new_ssd
+        else:
+            old_mean = self.mean_._DNDarray__array.double()
+            old_ssd = self.var_._DNDarray__array.double() * self.n_samples_seen_
+            mean = old_mean + (new_mean - old_mean) * (n_new / n_total)
+            correction = self.n_samples_seen_ * n_new / n_total
+            ssd = old_ssd + new_ssd + (old_mean - new_mean) ** 2 * correction
+
+        dtype = _float_type(X.dtype)
+        var = (ssd / n_total).to(dtype)
+        self.mean_ = ht.array(mean.to(dtype), device=X.device, comm=X.comm)
+        self.var_ = ht.array(var, device=X.device, comm=X.comm)
+        self.scale_ = None
+        if self.with_std:
+            scale = var.sqrt()
+            self.scale_ = ht.array(_handle_zeros(scale), device=X.device, comm=X.comm)
+        self.n_samples_seen_ = n_total
+        return self
+
+    def transform(self, X, copy=None):
+        """
+        Standardizes the features of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The data, X.split can be None or 0
+        copy : bool, optional
+            Whether to return a copy instead of transforming X in-place, default: the copy of the estimator
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_features)
+        """
+        multiplier, addend = self.__affine()
+        return _affine(X, multiplier, addend, self.copy if copy is None else copy)
+
+    def inverse_transform(self, X, copy=None):
+        """
+        Scales the features of X back to the original representation.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The standardized data, X.split can be None or 0
+        copy : bool, optional
+            Whether to return a copy instead of transforming X in-place, default: the copy of the estimator
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_features)
+        """
+        multiplier, addend = self.__affine()
+        return _affine(X, multiplier, addend, self.copy if copy is None else copy, inverse=True)
+
+    def __affine(self):
+        """
+        Multiplier and addend of the transformation x * multiplier + addend.
+        """
+        if self.mean_ is None:
+            raise RuntimeError("the scaler needs to be fitted before transforming")
+        mean = self.mean_._DNDarray__array
+        multiplier = torch.ones_like(mean)
+        if self.with_std:
+            multiplier /= self.scale_._DNDarray__array
+        addend = -mean * multiplier if self.with_mean else torch.zeros_like(mean)
+        return multiplier, addend
+
+
+class MinMaxScaler(ht.TransformMixin, ht.BaseEstimator):
+    """
+    Scales the features to the given range, based on scikit-learn.preprocessing.MinMaxScaler.
+
+    The minima and maxima of all features are reduced in one Allreduce. They can be updated with partial_fit on a
+    stream of chunks.
+
+    Parameters
+    ----------
+    feature_range : tuple (min, max), optional
+        The range of the transformed data. Default: (0, 1)
+    copy : bool, optional
+        If False, transform and inverse_transform modify floating point inputs in-place. Default: True
+
+    Attributes
+    ----------
+    data_min_ : ht.DNDarray, shape (n_features,)
+        The minimum of each feature
+    data_max_ : ht.DNDarray, shape (n_features,)
+        The maximum of each feature
+    data_range_ : ht.DNDarray, shape (n_features,)
+        The range of each feature, data_max_ - data_min_
+    scale_ : ht.DNDarray, shape (n_features,)
+        Relative scaling of each feature
+    min_ : ht.DNDarray, shape (n_features,)
+        Offset of each feature after the scaling
+    n_samples_seen_ : int
+        The number of samples seen by the estimator
+
+    Examples
+    --------
+    >>> X = ht.array([[-1.0, 2.0], [-0.5, 6.0], [0.0, 10.0], [1.0, 18.0]], split=0)
+    >>> ht.preprocessing.MinMaxScaler().fit_transform(X)
+    tensor([[0.0000, 0.0000],
+            [0.2500, 0.2500],
+            [0.5000, 0.5000],
+            [1.0000, 1.0000]])
+    """
+
+    def __init__(self, feature_range=(0, 1), copy=True):
+        self.feature_range = feature_range
+        self.copy = copy
+
+        # in-place properties
+        self.data_min_ = None
+        self.data_max_ = None
+        self.data_range_ = None
+        self.scale_ = None
+        self.min_ = None
+        self.n_samples_seen_ = 0
+
+    def fit(self, X):
+        """
+        Computes the minimum and maximum of the features of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The data, X.split can be None or 0
+
+        Returns
+        -------
+        self : MinMaxScaler
+        """
+        self.data_min_, self.data_max_, self.n_samples_seen_ = None, None, 0
+        return self.partial_fit(X)
+
+    def partial_fit(self, X):
+        """
+        Updates the minimum and maximum of the features with the samples of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The next chunk of the data, X.split can be None or 0
+
+        Returns
+        -------
+        self : MinMaxScaler
+        """
+        lower, upper = self.feature_range
+        if lower >= upper:
+            raise ValueError(
+                "feature_range needs to be increasing, but was {}".format(self.feature_range)
+            )
+        _sanitize_samples(X, None if self.data_min_ is None else self.data_min_.shape[0])
+        local = X._DNDarray__array
+        if X.shape[0] == 0:
+            return self
+
+        # minima and negated maxima, reduced with a single MIN
+        dtype = _float_type(X.dtype)
+        bounds = torch.full((2, X.shape[1]), float("inf"), dtype=dtype, device=local.device)
+        if local.shape[0] > 0:
+            bounds[0] = local.min(dim=0)[0]
+            bounds[1] = -local.max(dim=0)[0]
+        if self.data_min_ is not None:
+            bounds[0] = torch.min(bounds[0], self.data_min_._DNDarray__array.to(dtype))
+            bounds[1] = torch.min(bounds[1], -self.data_max_._DNDarray__array.to(dtype))
+        if X.split is not None and X.comm.is_distributed():
+            X.comm.Allreduce(ht.communication.MPI.IN_PLACE, bounds, ht.communication.MPI.MIN)
+
+        data_min, data_max = bounds[0], -bounds[1]
+        data_range = data_max - data_min
+        scale = (upper - lower) / _handle_zeros(data_range.clone())
+        self.data_min_ = ht.array(data_min, device=X.device, comm=X.comm)
+        self.data_max_ = ht.array(data_max, device=X.device, comm=X.comm)
+        self.data_range_ = ht.array(data_range, device=X.device, comm=X.comm)
+        self.scale_ = ht.array(scale, device=X.device, comm=X.comm)
+        self.min_ = ht.array(lower - data_min * scale, device=X.device, comm=X.comm)
+        self.n_samples_seen_ += X.shape[0]
+        return self
+
+    def transform(self, X, copy=None):
+        """
+        Scales the features of X to the feature range.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The data, X.split can be None or 0
+        copy : bool, optional
+            Whether to return a copy instead of transforming X in-place, default: the copy of the estimator
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_features)
+        """
+        if self.scale_ is None:
+            raise RuntimeError("the scaler needs to be fitted before transforming")
+        return _affine(
+            X,
+            self.scale_._DNDarray__array,
+            self.min_._DNDarray__array,
+            self.copy if copy is None else copy,
+        )
+
+    def inverse_transform(self, X, copy=None):
+        """
+        Scales the features of X back to the original representation.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The scaled data, X.split can be None or 0
+        copy : bool, optional
+            Whether to return a copy instead of transforming X in-place, default: the copy of the estimator
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_features)
+        """
+        if self.scale_ is None:
+            raise RuntimeError("the scaler needs to be fitted before transforming")
+        return _affine(
+            X,
+            self.scale_._DNDarray__array,
+            self.min_._DNDarray__array,
+            self.copy if copy is None else copy,
+            inverse=True,
+        )
+
+
+class RobustScaler(ht.TransformMixin, ht.BaseEstimator):
+    """
+    Scales the features with statistics that are robust to outliers, based on
+    scikit-learn.preprocessing.RobustScaler. The median is removed and the data is scaled by the range between two
+    quantiles, the interquartile range by default.
+
+    The median and both quantiles of all features are computed in a single call of ht.percentile. Quantiles cannot
+    be combined across chunks, hence there is no partial_fit.
+
+    Parameters
+    ----------
+    with_centering : bool, optional
+        Whether to center the data at the median. Default: True
+    with_scaling : bool, optional
+        Whether to scale the data by the quantile range. Default: True
+    quantile_range : tuple (q_min, q_max), optional
+        The percentiles of the range, 0.0 <= q_min <= q_max <= 100.0. Default: (25.0, 75.0)
+    copy : bool, optional
+        If False, transform and inverse_transform modify floating point inputs in-place. Default: True
+
+    Attributes
+    ----------
+    center_ : ht.DNDarray, shape (n_features,)
+        The median of each feature, None if not with_centering
+    scale_ : ht.DNDarray, shape (n_features,)
+        The quantile range of each feature, 1 for constant features, None if not with_scaling
+
+    Examples
+    --------
+    >>> X = ht.array([[1.0, -2.0], [-2.0, 1.0], [4.0, 1.0], [0.0, 0.0], [1.0, 100.0]], split=0)
+    >>> ht.preprocessing.RobustScaler().fit_transform(X)
+    tensor([[ 0.0000, -2.0000],
+            [-1.0000,  0.0000],
+            [ 1.0000,  0.0000],
+            [-0.3333, -1.0000],
+            [ 0.0000, 99.0000]])
+    """
+
+    def __init__(
+        self, with_centering=True, with_scaling=True, quantile_range=(25.0, 75.0), copy=True
+    ):
+        self.with_centering = with_centering
+        self.with_scaling = with_scaling
+        self.quantile_range = quantile_range
+        self.copy = copy
+
+        # in-place properties
+        self.center_ = None
+        self.scale_ = None
+
+    def fit(self, X):
+        """
+        Computes the median and quantile range of the features of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The data, X.split can be None or 0
+
+        Returns
+        -------
+        self : RobustScaler
+        """
+        q_min, q_max = self.quantile_range
+        if not 0.0 <= q_min <= q_max <= 100.0:
+            raise ValueError("invalid quantile range {}".format(self.quantile_range))
+        _sanitize_samples(X, None)
+        dtype = ht.types.canonical_heat_type(_float_type(X.dtype))
+        if X.dtype != dtype:
+            X = X.astype(dtype)
+
+        quantiles = ht.percentile(X, [q_min, 50.0, q_max], axis=0)
+        if quantiles.split is not None:
+            quantiles = ht.resplit(quantiles, None)
+        quantiles = quantiles._DNDarray__array
+        self.center_, self.scale_ = None, None
+        if self.with_centering:
+            self.center_ = ht.array(quantiles[1], device=X.device, comm=X.comm)
+        if self.with_scaling:
+            scale = _handle_zeros(quantiles[2] - quantiles[0])
+            self.scale_ = ht.array(scale, device=X.device, comm=X.comm)
+        return self
+
+    def transform(self, X, copy=None):
+        """
+        Centers and scales the features of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The data, X.split can be None or 0
+        copy : bool, optional
+            Whether to return a copy instead of transforming X in-place, default: the copy of the estimator
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_features)
+        """
+        multiplier, addend = self.__affine(X)
+        return _affine(X, multiplier, addend, self.copy if copy is None else copy)
+
+    def inverse_transform(self, X, copy=None):
+        """
+        Scales the features of X back to the original representation.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            The scaled data, X.split can be None or 0
+        copy : bool, optional
+            Whether to return a copy instead of transforming X in-place, default: the copy of the estimator
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_features)
+        """
+        multiplier, addend = self.__affine(X)
+        return _affine(X, multiplier, addend, self.copy if copy is None else copy, inverse=True)
+
+    def __affine(self, X):
+        """
+        Multiplier and addend of the transformation x * multiplier + addend.
+        """
+        if (self.with_centering and self.center_ is None) or (
+            self.with_scaling and self.scale_ is None
+        ):
+            raise RuntimeError("the scaler needs to be fitted before transforming")
+        if not isinstance(X, ht.DNDarray):
+            raise TypeError("X needs to be a ht.DNDarray, but was {}".format(type(X)))
+        dtype = _float_type(X.dtype)
+        multiplier = torch.ones(X.shape[-1], dtype=dtype, device=X.device.torch_device)
+        addend = torch.zeros_like(multiplier)
+        if self.with_scaling:
+            multiplier /= self.scale_._DNDarray__array
+        if self.with_centering:
+            addend -= self.center_._DNDarray__array * multiplier
+        return multiplier, addend
+
+
+def _affine(X, multiplier, addend, copy, inverse=False):
+    """
+    Transforms the features of X to x * multiplier + addend, or inverse, (x - addend) / multiplier. Floating point
+    inputs are transformed in-place unless copy, otherwise the local samples are copied once.
+    """
+    _sanitize_samples(X, multiplier.shape[0])
+    local = X._DNDarray__array
+    dtype = _float_type(X.dtype)
+    in_place = not copy and local.dtype == dtype
+    if not in_place:
+        local = local.to(dtype, copy=True)
+    multiplier, addend = multiplier.to(dtype), addend.to(dtype)
+    if inverse:
+        local.sub_(addend).div_(multiplier)
+    else:
+        local.mul_(multiplier).add_(addend)
+    if in_place:
+        return X
+    return ht.array(local, is_split=X.split, device=X.device, comm=X.comm)
+
+
+def _blocks(local):
+    """
+    Consecutive blocks of the rows of local with at most 2**22 elements, bounding the temporaries of the reductions.
+    """
+    rows = max(1, 2 ** 22 // max(1, local.shape[1]))
+    for start in range(0, local.shape[0], rows):
+        yield local[start : start + rows]
+
+
+def _float_type(dtype):
+    """
+    The torch floating point type of the transformed data of the heat type dtype.
+    """
+    return ht.promote_types(dtype, ht.float32).torch_type()
+
+
+def _handle_zeros(scale):
+    """
+    Replaces the scales of constant features in-place by 1.
+    """
+    scale[scale == 0.0] = 1.0
+    return scale
+
+
+def _sanitize_samples(X, n_features):
+    """
+    Checks that X is a 2D ht.DNDarray split along None or 0 with n_features features, if given.
+    """
+    if not isinstance(X, ht.DNDarray):
+        raise TypeError("X needs to be a ht.DNDarray, but was {}".format(type(X)))
+    if X.ndim != 2:
+        raise ValueError("X needs to be 2D, but has the shape {}".format(X.shape))
+    if X.split not in [None, 0]:
+        raise NotImplementedError("X.split needs to be None or 0, but was {}".format(X.split))
+    if n_features is not None and X.shape[1] != n_features:
+        raise ValueError("X needs to have {} features, but has {}".format(n_features, X.shape[1]))
@@ -0,0 +1,161 @@
+import numpy as np
+import torch
+
+import heat as ht
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+class TestStandardScaler(TestCase):
+    def test_transformer(self):
+        scaler = ht.preprocessing.StandardScaler()
+        self.assertTrue(ht.is_estimator(scaler))
+        self.assertTrue(ht.is_transformer(scaler))
+        self.assertEqual(scaler.get_params(), {"copy": True, "with_mean": True, "with_std": True})
+
+    def test_fit_transform(self):
+        np.random.seed(5)
+        data = np.random.randn(51, 4) * [1.0, 10.0, 1e-3, 0.0] + [0.0, 5.0, 1e4, 3.0]
+        for split in [None, 0]:
+            X = ht.array(data, split=split)
+            scaler = ht.preprocessing.StandardScaler().fit(X)
+            self.assertEqual(scaler.n_samples_seen_, 51)
+            self.assertTrue(np.allclose(scaler.mean_.numpy(), data.mean(axis=0)))
+            self.assertTrue(np.allclose(scaler.var_.numpy(), data.var(axis=0)))
+            self.assertEqual(scaler.scale_.numpy()[3], 1.0)
+
+            Y = scaler.transform(X)
+            self.assertIsNot(Y, X)
+            self.assertEqual(Y.split, split)
+            expected = (data - data.mean(axis=0)) / scaler.scale_.numpy()
+            self.assertTrue(np.allclose(Y.numpy(), expected))
+            self.assertTrue(np.allclose(X.numpy(), data))
+            self.assertTrue(np.allclose(scaler.inverse_transform(Y).numpy(), data))
+
+            # in-place
+            Z = ht.preprocessing.StandardScaler(copy=False).fit_transform(X)
+            self.assertIs(Z, X)
+            self.assertTrue(np.allclose(X.numpy(), expected))
+
+            # without centering and scaling
+            scaler = ht.preprocessing.StandardScaler(with_mean=False, with_std=False)
+            scaler.fit(ht.array(data, split=split))
+            self.assertIsNone(scaler.scale_)
+            self.assertTrue(np.allclose(scaler.transform(ht.array(data)).numpy(), data))
+
+    def test_partial_fit(self):
+        np.random.seed(7)
+        data = np.random.rand(40, 3).astype(np.float32) * 100.0
+        scaler = ht.preprocessing.StandardScaler()
+        for start in range(0, 40, 13):
+            scaler.partial_fit(ht.array(data[start : start + 13], split=0))
+        self.assertEqual(scaler.n_samples_seen_, 40)
+        self.assertEqual(scaler.mean_.dtype, ht.float32)
+        self.assertTrue(np.allclose(scaler.mean_.numpy(), data.mean(axis=0), rtol=1e-5))
+        self.assertTrue(np.allclose(scaler.var_.numpy(), data.var(axis=0), rtol=1e-4))
+
+        # fit restarts the statistics
+        scaler.fit(ht.array(data[:10], split=0))
+        self.assertEqual(scaler.n_samples_seen_, 10)
+        self.assertTrue(np.allclose(scaler.mean_.numpy(), data[:10].mean(axis=0), rtol=1e-5))
+
+    def test_exceptions(self):
+        scaler = ht.preprocessing.StandardScaler()
+        with self.assertRaises(RuntimeError):
+            scaler.transform(ht.zeros((2, 2)))
+        with self.assertRaises(TypeError):
+            scaler.fit(np.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            scaler.fit(ht.zeros(2))
+        with self.assertRaises(NotImplementedError):
+            scaler.fit(ht.zeros((2, 2), split=1))
+        scaler.fit(ht.zeros((2, 2)))
+        with self.assertRaises(ValueError):
+            scaler.partial_fit(ht.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            scaler.transform(ht.zeros((2, 3)))
+
+
+class TestMinMaxScaler(TestCase):
+    def test_fit_transform(self):
+        data = np.array([[-1.0, 2.0, 3.0], [-0.5, 6.0, 3.0], [0.0, 10.0, 3.0], [1.0, 18.0, 3.0]])
+        for split in [None, 0]:
+            X = ht.array(data, split=split)
+            scaler = ht.preprocessing.MinMaxScaler(feature_range=(-1, 1)).fit(X)
+            self.assertTrue(np.allclose(scaler.data_min_.numpy(), data.min(axis=0)))
+            self.assertTrue(np.allclose(scaler.data_max_.numpy(), data.max(axis=0)))
+            self.assertTrue(np.allclose(scaler.data_range_.numpy(), [2.0, 16.0, 0.0]))
+
+            Y = scaler.transform(X)
+            expected = np.array(
+                [[-1.0, -1.0, -1.0], [-0.5, -0.5, -1.0], [0.0, 0.0, -1.0], [1.0, 1.0, -1.0]]
+            )
+            self.assertTrue(np.allclose(Y.numpy(), expected))
+            self.assertTrue(np.allclose(scaler.inverse_transform(Y).numpy(), data))
+
+            Z = ht.preprocessing.MinMaxScaler(copy=False).fit_transform(X)
+            self.assertIs(Z, X)
+            self.assertTrue(np.allclose(X.numpy(), (expected + 1.0) / 2.0))
+
+        # integers are transformed to floats
+        Y = ht.preprocessing.MinMaxScaler(copy=False).fit_transform(ht.arange(5, split=0)[:, None])
+        self.assertEqual(Y.dtype, ht.float32)
+        self.assertTrue(np.allclose(Y.numpy().ravel(), np.linspace(0.0, 1.0, 5)))
+
+    def test_partial_fit(self):
+        np.random.seed(3)
+        data = np.random.randn(30, 2)
+        scaler = ht.preprocessing.MinMaxScaler()
+        for start in range(0, 30, 7):
+            scaler.partial_fit(ht.array(data[start : start + 7], split=0))
+        self.assertEqual(scaler.n_samples_seen_, 30)
+        self.assertTrue(np.allclose(scaler.data_min_.numpy(), data.min(axis=0)))
+        self.assertTrue(np.allclose(scaler.data_max_.numpy(), data.max(axis=0)))
+
+    def test_exceptions(self):
+        with self.assertRaises(ValueError):
+            ht.preprocessing.MinMaxScaler(feature_range=(1, 0)).fit(ht.zeros((2, 2)))
+        with self.assertRaises(RuntimeError):
+            ht.preprocessing.MinMaxScaler().transform(ht.zeros((2, 2)))
+        with self.assertRaises(NotImplementedError):
+            ht.preprocessing.MinMaxScaler().fit(ht.zeros((2, 2), split=1))
+
+
+class TestRobustScaler(TestCase):
+    def test_fit_transform(self):
+        np.random.seed(11)
+        data = np.random.randn(41, 3)
+        data[0] = 1e3
+        data[:, 2] = 2.0
+        for split in [None, 0]:
+            X = ht.array(data, split=split)
+            scaler = ht.preprocessing.RobustScaler().fit(X)
+            q_min, median, q_max = np.percentile(data, [25.0, 50.0, 75.0], axis=0)
+            scale = q_max - q_min
+            scale[scale == 0.0] = 1.0
+            self.assertTrue(np.allclose(scaler.center_.numpy(), median))
+            self.assertTrue(np.allclose(scaler.scale_.numpy(), scale))
+
+            Y = scaler.transform(X)
+            self.assertTrue(np.allclose(Y.numpy(), (data - median) / scale))
+            self.assertTrue(np.allclose(scaler.inverse_transform(Y).numpy(), data))
+
+            Z = ht.preprocessing.RobustScaler(copy=False, with_scaling=False).fit_transform(X)
+            self.assertIs(Z, X)
+            self.assertTrue(np.allclose(X.numpy(), data - median))
+
+        # the bounds of the quantile range are inclusive
+        X = ht.array(data, split=0)
+        scaler = ht.preprocessing.RobustScaler(quantile_range=(0.0, 100.0)).fit(X)
+        scale = data.max(axis=0) - data.min(axis=0)
+        scale[scale == 0.0] = 1.0
+        self.assertTrue(np.allclose(scaler.scale_.numpy(), scale))
+        with self.assertRaises(ValueError):
+            ht.preprocessing.RobustScaler(quantile_range=(-1.0, 50.0)).fit(X)
+
+    def test_exceptions(self):
+        with self.assertRaises(ValueError):
+            ht.preprocessing.RobustScaler(quantile_range=(75.0, 25.0)).fit(ht.zeros((2, 2)))
+        with self.assertRaises(RuntimeError):
+            ht.preprocessing.RobustScaler().transform(ht.zeros((2, 2)))
+        with self.assertRaises(TypeError):
+            ht.preprocessing.RobustScaler().fit(torch.zeros(2, 2))
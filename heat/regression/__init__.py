@@ -1 +1,2 @@
 from .lasso import *
+from .linear import *
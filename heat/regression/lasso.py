@@ -1,4 +1,7 @@
 import heat as ht
+import torch
+
+__all__ = ["Lasso", "lasso_path"]
 
 
 class Lasso(ht.RegressionMixin, ht.BaseEstimator):
@@ -6,7 +9,7 @@ class Lasso(ht.RegressionMixin, ht.BaseEstimator):
     ``Least absolute shrinkage and selection operator``(LASSO), a linear model with L1 regularization. The optimization
     objective for Lasso is:
 
-    .. math:: E(w) = (1 / (2 * m)) * ||y - Xw||^2_2 + lam * ||w\\_||_1
+    .. math:: E(w) = (1 / (2 * m)) * ||y - Xw||^2_2 + lam * l1\\_ratio * ||w\\_||_1 + (lam / 2) * (1 - l1\\_ratio) * ||w\\_||^2_2
 
     with
 
@@ -21,6 +24,24 @@ class Lasso(ht.RegressionMixin, ht.BaseEstimator):
         The maximum number of iterations. Default value: 100
     tol : float, optional. Default value: 1e-8
         The tolerance for the optimization.
+    l1_ratio : float, optional
+        Mixing parameter of the elastic net penalty, 0 <= l1_ratio <= 1. Default value: 1.0, i.e. the L1 penalty of
+        the Lasso. ``l1_ratio = 0.`` is a ridge regression.
+    precompute : bool or 'auto', optional
+        Whether to precompute the Gram matrix X^T X, default: 'auto'. With the Gram matrix a sweep over the coordinates
+        is local to every process, it needs O(n_features^2) memory. 'auto' uses it if there are fewer features than
+        samples.
+    block_size : int, optional
+        Number of coordinates whose correlations with the residual are reduced in a single Allreduce if the Gram
+        matrix is not used. Default value: 32
+
+    Notes
+    -----
+    The model is fitted by cyclic coordinate descent. The residual y - Xw is kept on the local samples and updated
+    after every block of coordinates, so a sweep costs O(n_samples * n_features / P) and n_features / block_size
+    global reductions. Within a block the coordinates are updated exactly in sequence with the block of the Gram
+    matrix. The Gram matrices of all blocks are reduced once in a single Allreduce before the sweeps, every block
+    then only reduces its correlations with the residual.
 
     Attributes
     ----------
@@ -37,11 +58,16 @@ class Lasso(ht.RegressionMixin, ht.BaseEstimator):
     # ToDo: example to be added
     """
 
-    def __init__(self, lam=0.1, max_iter=100, tol=1e-6):
+    def __init__(
+        self, lam=0.1, max_iter=100, tol=1e-6, l1_ratio=1.0, precompute="auto", block_size=32
+    ):
         """initialize lasso parameters"""
         self.__lam = lam
         self.max_iter = max_iter
         self.tol = tol
+        self.l1_ratio = l1_ratio
+        self.precompute = precompute
+        self.block_size = block_size
         self.__theta = None
         self.n_iter = None
 
@@ -113,50 +139,45 @@ class Lasso(ht.RegressionMixin, ht.BaseEstimator):
         y : HeAT tensor, shape (n_samples,)
             Labels
         """
-        # Get number of model parameters
-        _, n = X.shape
-
-        if y.ndim > 2:
-            raise ValueError("y.ndim must <= 2, currently: {}".format(y.ndim))
-        if X.ndim != 2:
-            raise ValueError("X.ndim must == 2, currently: {}".format(X.ndim))
-
-        if len(y.shape) == 1:
-            y = ht.expand_dims(y, axis=1)
+        if not 0.0 <= self.l1_ratio <= 1.0:
+            raise ValueError("l1_ratio must be in [0, 1], currently: {}".format(self.l1_ratio))
+        if self.precompute not in [True, False, "auto"]:
+            raise ValueError(
+                "precompute must be True, False or 'auto', currently: {}".format(self.precompute)
+            )
+        if not isinstance(self.block_size, int) or self.block_size < 1:
+            raise ValueError(
+                "block_size must be a positive int, currently: {}".format(self.block_size)
+            )
+        X, y, comm = _sanitize_data(X, y)
+        m, n = X.shape
+        l1, l2 = self.__lam * self.l1_ratio, self.__lam * (1.0 - self.l1_ratio)
 
         # Initialize model parameters
-        theta = ht.zeros((n, 1), dtype=float, device=X.device)
-
-        # Looping until max number of iterations or convergence
-        for i in range(self.max_iter):
-
-            theta_old = theta.copy()
-
-            # Looping through each coordinate
-            for j in range(n):
-
-                X_j = ht.array(X._DNDarray__array[:, j : j + 1], is_split=0)
-
-                y_est = X @ theta
-                theta_j = theta._DNDarray__array[j].item()
-
-                rho = (X_j * (y - y_est + theta_j * X_j)).mean()
-
-                # Intercept parameter theta[0] not be regularized
-                if j == 0:
-                    theta[j] = rho
-                else:
-                    theta[j] = self.soft_threshold(rho)
-
-            diff = self.rmse(theta, theta_old)
-            if self.tol is not None:
-                if diff < self.tol:
-                    self.n_iter = i + 1
-                    self.__theta = theta
-                    break
+        local = X._DNDarray__array
+        theta = torch.zeros(n, dtype=local.dtype, device=local.device)
+        coords = torch.arange(n, device=local.device)
 
-        self.n_iter = i + 1
-        self.__theta = theta
+        if self.precompute is True or (self.precompute == "auto" and n < m):
+            G, c = _gram(local, y, comm)
+            self.n_iter = _gram_descent(G, c, theta, m, l1, l2, self.max_iter, self.tol, coords)
+        else:
+            residual = y.clone()
+            self.n_iter = _residual_descent(
+                local,
+                residual,
+                theta,
+                m,
+                l1,
+                l2,
+                self.max_iter,
+                self.tol,
+                coords,
+                self.block_size,
+                comm,
+            )
+
+        self.__theta = ht.array(theta.unsqueeze(1), device=X.device, comm=X.comm)
 
     def predict(self, X):
         """
@@ -168,3 +189,228 @@ class Lasso(ht.RegressionMixin, ht.BaseEstimator):
             Input data.
         """
         return X @ self.__theta
+
+
+def lasso_path(
+    X, y, lams=None, n_lams=100, eps=1e-3, l1_ratio=1.0, max_iter=100, tol=1e-6, block_size=32
+):
+    """
+    Computes the coefficients of the Lasso (or elastic net) for a decreasing sequence of regularization parameters.
+    The objective and the unregularized intercept in the first column of X are those of ``Lasso``.
+
+    Every fit is warm started from the previous one. Sequential strong rules [1] discard the features that are
+    likely to be inactive before the fit, such that the coordinate descent sweeps only touch the surviving
+    columns. The screening uses the correlations X^T r of the previous solution, which is one distributed product
+    per regularization parameter. Discarded features violating the optimality conditions after the fit are added
+    back and the fit is repeated.
+
+    Parameters
+    ----------
+    X : ht.DNDarray, shape (n_samples, n_features)
+        Input data, the first column is the intercept.
+    y : ht.DNDarray, shape (n_samples,)
+        Labels
+    lams : ht.DNDarray or list of float, optional
+        Regularization parameters. By default n_lams values spaced evenly on a log scale from the smallest value
+        for which all coefficients vanish down to eps times this value.
+    n_lams : int, optional
+        Number of regularization parameters if lams is not given. Default value: 100
+    eps : float, optional
+        Length of the path if lams is not given. Default value: 1e-3
+    l1_ratio : float, optional
+        Mixing parameter of the elastic net penalty, 0 < l1_ratio <= 1. Default value: 1.0
+    max_iter : int, optional
+        The maximum number of coordinate descent sweeps per fit. Default value: 100
+    tol : float, optional
+        The tolerance for the optimization. Default value: 1e-6
+    block_size : int, optional
+        Number of coordinates whose correlations are reduced in a single Allreduce. Default value: 32
+
+    Returns
+    -------
+    lams : ht.DNDarray, shape (n_lams,)
+        The regularization parameters, sorted descending
+    coefs : ht.DNDarray, shape (n_features, n_lams)
+        The coefficients along the path, including the intercept
+
+    References
+    ----------
+    [1] Tibshirani, R., Bien, J., Friedman, J., Hastie, T., Simon, N., Taylor, J., and Tibshirani, R. J., "Strong
+        rules for discarding predictors in lasso-type problems", Journal of the Royal Statistical Society: Series B,
+        74 (2), pp. 245-266, 2012.
+    """
+    if not 0.0 < l1_ratio <= 1.0:
+        raise ValueError("l1_ratio must be in (0, 1], currently: {}".format(l1_ratio))
+    if not isinstance(block_size, int) or block_size < 1:
+        raise ValueError("block_size must be a positive int, currently: {}".format(block_size))
+    X, y, comm = _sanitize_data(X, y)
+    m, n = X.shape
+    local = X._DNDarray__array
+    device = local.device
+
+    def correlations(residual):
+        # X^T r / m of all features with the residual
+        c = torch.mv(local.t(), residual)
+        if comm is not None:
+            comm.Allreduce(ht.communication.MPI.IN_PLACE, c, ht.communication.MPI.SUM)
+        return c / m
+
+    # the intercept is never screened
+    theta = torch.zeros(n, dtype=local.dtype, device=device)
+    residual = y.clone()
+    intercept = torch.zeros(1, dtype=torch.int64, device=device)
+    _residual_descent(local, residual, theta, m, 0.0, 0.0, max_iter, tol, intercept, 1, comm)
+    c = correlations(residual)
+
+    if lams is None:
+        if not isinstance(n_lams, int) or n_lams < 1:
+            raise ValueError("n_lams must be a positive int, currently: {}".format(n_lams))
+        lam_max = c[1:].abs().max().item() / l1_ratio if n > 1 else 0.0
+        lams = torch.logspace(0, torch.log10(torch.tensor(eps)).item(), n_lams, dtype=local.dtype)
+        lams = lams * lam_max
+    else:
+        if isinstance(lams, ht.DNDarray):
+            lams = ht.resplit(lams, None)._DNDarray__array
+        lams = torch.as_tensor(lams, dtype=local.dtype).flatten().sort(descending=True)[0]
+    coefs = torch.empty((n, lams.shape[0]), dtype=local.dtype, device=device)
+
+    previous = lams[0].item()
+    for k in range(lams.shape[0]):
+        lam = lams[k].item()
+        l1, l2 = lam * l1_ratio, lam * (1.0 - l1_ratio)
+        # sequential strong rule, the active features of the previous fit are kept
+        strong = c.abs() >= l1_ratio * (2.0 * lam - previous)
+        strong |= theta != 0
+        strong[0] = True
+        while True:
+            coords = strong.nonzero().flatten()
+            _residual_descent(
+                local, residual, theta, m, l1, l2, max_iter, tol, coords, block_size, comm
+            )
+            c = correlations(residual)
+            # optimality conditions of the discarded features
+            violations = (c.abs() > l1 * (1.0 + 1e-6) + 1e-12) & ~strong
+            if not violations.any():
+                break
+            strong |= violations
+        coefs[:, k] = theta
+        previous = lam
+
+    return (
+        ht.array(lams, device=X.device, comm=X.comm),
+        ht.array(coefs, device=X.device, comm=X.comm),
+    )
+
+
+def _sanitize_data(X, y):
+    """
+    Checks the shapes of the samples X and the targets y and aligns their distribution. Returns X as a floating point
+    array split along the samples or not distributed, the local targets as a 1D torch tensor and the communicator
+    for the reductions over the samples, None if all samples are local.
+    """
+    if y.ndim > 2:
+        raise ValueError("y.ndim must <= 2, currently: {}".format(y.ndim))
+    if X.ndim != 2:
+        raise ValueError("X.ndim must == 2, currently: {}".format(X.ndim))
+    if y.ndim == 2 and y.shape[1] != 1:
+        raise ValueError("y must have a single target, currently: {}".format(y.shape[1]))
+    if y.shape[0] != X.shape[0]:
+        raise ValueError("X and y must have the same number of samples")
+
+    dtype = ht.promote_types(X.dtype, ht.float32)
+    if X.dtype != dtype:
+        X = X.astype(dtype)
+    if X.split is not None and X.split != 0:
+        X = ht.resplit(X, 0)
+    if y.split != X.split:
+        y = ht.resplit(y, X.split)
+    comm = X.comm if X.split == 0 and X.comm.is_distributed() else None
+
+    return X, y._DNDarray__array.reshape(-1).to(dtype.torch_type()), comm
+
+
+def _gram(X, y, comm):
+    """
+    Gram matrix X^T X and correlations X^T y of the local samples, reduced in a single Allreduce.
+    """
+    n = X.shape[1]
+    buf = torch.cat((torch.mm(X.t(), X).flatten(), torch.mv(X.t(), y)))
+    if comm is not None:
+        comm.Allreduce(ht.communication.MPI.IN_PLACE, buf, ht.communication.MPI.SUM)
+    return buf[: n * n].reshape(n, n), buf[n * n :]
+
+
+def _block_update(theta, block, g, G, m, l1, l2):
+    """
+    Updates the coordinates in block of theta in sequence, g are the correlations X_j^T r of the coordinates with the
+    residual and G the Gram matrix of the block. The correlations are updated in-place after every coordinate.
+    Coordinate 0 is the unregularized intercept. Returns the changes of the coordinates.
+    """
+    delta = torch.zeros_like(g)
+    for k in range(block.shape[0]):
+        j = block[k]
+        z = G[k, k] / m
+        if z <= 0:
+            # constant zero feature
+            new = torch.zeros_like(z)
+        else:
+            rho = g[k] / m + theta[j] * z
+            if j == 0:
+                new = rho / z
+            else:
+                new = torch.sign(rho) * torch.clamp(rho.abs() - l1, min=0.0) / (z + l2)
+        delta[k] = new - theta[j]
+        theta[j] = new
+        g -= G[:, k] * delta[k]
+    return delta
+
+
+def _converged(theta, theta_old, tol):
+    """
+    Root mean square change of the parameters below tol.
+    """
+    return tol is not None and (theta - theta_old).pow(2).mean().sqrt().item() < tol
+
+
+def _gram_descent(G, c, theta, m, l1, l2, max_iter, tol, coords):
+    """
+    Coordinate descent with the precomputed Gram matrix G and correlations c = X^T y, no communication is required.
+    Only the coordinates in coords are updated. Returns the number of sweeps.
+    """
+    G_coords = G[coords][:, coords]
+    for i in range(max_iter):
+        theta_old = theta.clone()
+        g = c[coords] - torch.mv(G[coords], theta)
+        _block_update(theta, coords, g, G_coords, m, l1, l2)
+        if _converged(theta, theta_old, tol):
+            break
+    return i + 1
+
+
+def _residual_descent(X, residual, theta, m, l1, l2, max_iter, tol, coords, block_size, comm):
+    """
+    Coordinate descent on the local samples X with the residual y - X theta, which is updated in-place. The Gram
+    matrices of the blocks of coordinates do not depend on the residual, they are reduced once in a single Allreduce
+    before the sweeps, every block then only reduces its correlations with the residual. Only the coordinates in
+    coords are updated. Returns the number of sweeps.
+    """
+    blocks = [coords[start : start + block_size] for start in range(0, coords.shape[0], block_size)]
+    grams = [torch.mm(X[:, block].t(), X[:, block]).flatten() for block in blocks]
+    if comm is not None and blocks:
+        buf = torch.cat(grams)
+        comm.Allreduce(ht.communication.MPI.IN_PLACE, buf, ht.communication.MPI.SUM)
+        grams = torch.split(buf, [gram.shape[0] for gram in grams])
+    grams = [gram.reshape(block.shape[0], block.shape[0]) for gram, block in zip(grams, blocks)]
+
+    for i in range(max_iter):
+        theta_old = theta.clone()
+        for block, G in zip(blocks, grams):
+            X_block = X[:, block]
+            g = torch.mv(X_block.t(), residual)
+            if comm is not None:
+                comm.Allreduce(ht.communication.MPI.IN_PLACE, g, ht.communication.MPI.SUM)
+            delta = _block_update(theta, block, g, G, m, l1, l2)
+            residual -= torch.mv(X_block, delta)
+        if _converged(theta, theta_old, tol):
+            break
+    return i + 1
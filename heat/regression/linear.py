@@ -0,0 +1,566 @@
+import heat as ht
+import torch
+
+from heat.core._operations import _searchsorted
+from .lasso import _sanitize_data
+
+__all__ = ["LinearRegression", "LogisticRegression"]
+
+
+class LinearRegression(ht.RegressionMixin, ht.BaseEstimator):
+    """
+    Linear least squares regression with an optional L2 penalty (ridge regression). The optimization objective is:
+
+    .. math:: E(w, b) = (1 / (2 * m)) * ||y - Xw - b||^2_2 + (lam / 2) * ||w||^2_2
+
+    Parameters
+    ----------
+    lam : float, optional
+        Constant that multiplies the L2 term, the intercept is not penalized. Default value: 0.0
+    fit_intercept : bool, optional
+        Whether to fit the intercept b, otherwise b = 0. Default value: True
+    solver : str, optional
+        "lbfgs" or "newton-cg", default: "lbfgs". Newton-CG reduces the Hessian of size (n_features + 1)^2 in
+        every iteration and is meant for few features.
+    max_iter : int, optional
+        The maximum number of iterations. Default value: 100
+    tol : float, optional
+        The iterations stop if the maximum absolute gradient entry or the relative change of the objective falls
+        below tol. Default value: 1e-6
+    history_size : int, optional
+        Number of correction pairs kept by L-BFGS. Default value: 10
+    warm_start : bool, optional
+        Whether to start from the solution of the previous fit. Default value: False
+
+    Notes
+    -----
+    Each evaluation of the objective computes the loss and the gradient on the local samples and reduces both
+    with a single Allreduce of a packed buffer, Newton-CG packs the Hessian into the same buffer. The line search
+    accepts the unit step in most iterations, which then cost one reduction.
+
+    Attributes
+    ----------
+    coef_ : ht.DNDarray, shape (n_features,)
+        Coefficients w of the features
+    intercept_ : ht.DNDarray, shape (1,)
+        The intercept b
+    n_iter_ : int
+        Number of iterations of the solver
+    converged_ : bool
+        Whether the solver reached the tolerance within max_iter iterations
+    loss_curve_ : list of float
+        The objective after every iteration, the first entry is the objective of the initial parameters
+
+    Examples
+    --------
+    >>> X = ht.array([[0.0], [1.0], [2.0], [3.0]], split=0)
+    >>> y = ht.array([1.0, 3.0, 5.0, 7.0], split=0)
+    >>> ht.regression.LinearRegression().fit(X, y).predict(ht.array([[4.0]]))
+    tensor([9.0000])
+    """
+
+    def __init__(
+        self,
+        lam=0.0,
+        fit_intercept=True,
+        solver="lbfgs",
+        max_iter=100,
+        tol=1e-6,
+        history_size=10,
+        warm_start=False,
+    ):
+        self.lam = lam
+        self.fit_intercept = fit_intercept
+        self.solver = solver
+        self.max_iter = max_iter
+        self.tol = tol
+        self.history_size = history_size
+        self.warm_start = warm_start
+
+        # in-place properties
+        self._theta = None
+        self.n_iter_ = None
+        self.converged_ = None
+        self.loss_curve_ = None
+
+    @property
+    def coef_(self):
+        if self._theta is None:
+            return None
+        return ht.array(self._theta[1:, 0], device=self._device, comm=self._comm)
+
+    @property
+    def intercept_(self):
+        if self._theta is None:
+            return None
+        return ht.array(self._theta[0], device=self._device, comm=self._comm)
+
+    def fit(self, X, y):
+        """
+        Fit the linear model.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            Input data.
+        y : ht.DNDarray, shape (n_samples,)
+            Target values
+
+        Returns
+        -------
+        self : LinearRegression
+        """
+        _check_parameters(self)
+        X, y, comm = _sanitize_data(X, y)
+        local = X._DNDarray__array
+        theta = _initial_theta(self, local, 1)
+
+        evaluate = _evaluator(
+            _squared_loss, local, y, X.shape[0], self.lam, self.fit_intercept, comm
+        )
+        self._theta, self.loss_curve_, self.n_iter_, self.converged_ = _minimize(
+            evaluate, theta, self.solver, self.max_iter, self.tol, self.history_size
+        )
+        self._device, self._comm = X.device, X.comm
+        return self
+
+    def predict(self, X):
+        """
+        Predict the targets of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            Input data.
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples,)
+            Predictions, distributed like the samples of X
+        """
+        if self._theta is None:
+            raise RuntimeError("the model needs to be fitted before predicting")
+        X = _sanitize_samples(X, self._theta.shape[0] - 1)
+        z = _decision(X._DNDarray__array.to(self._theta.dtype), self._theta)
+        return ht.array(z[:, 0], is_split=X.split, device=X.device, comm=X.comm)
+
+
+class LogisticRegression(ht.ClassificationMixin, ht.BaseEstimator):
+    """
+    Multinomial logistic regression with an optional L2 penalty. The optimization objective is the mean
+    cross-entropy of the softmax of the decision function:
+
+    .. math:: E(W, b) = -(1 / m) * \\sum_i \\log(softmax(x_i W + b)_{y_i}) + (lam / 2) * ||W||^2_2
+
+    Parameters
+    ----------
+    lam : float, optional
+        Constant that multiplies the L2 term, the intercept is not penalized. Default value: 1e-4
+    fit_intercept : bool, optional
+        Whether to fit the intercepts b, otherwise b = 0. Default value: True
+    solver : str, optional
+        "lbfgs" or "newton-cg", default: "lbfgs". Newton-CG reduces the Hessian of size
+        ((n_features + 1) * n_classes)^2 in every iteration and is meant for few features and classes.
+    max_iter : int, optional
+        The maximum number of iterations. Default value: 100
+    tol : float, optional
+        The iterations stop if the maximum absolute gradient entry or the relative change of the objective falls
+        below tol. Default value: 1e-6
+    history_size : int, optional
+        Number of correction pairs kept by L-BFGS. Default value: 10
+    warm_start : bool, optional
+        Whether to start from the solution of the previous fit. Default value: False
+
+    Notes
+    -----
+    Each evaluation of the objective computes the loss and the gradient on the local samples and reduces both
+    with a single Allreduce of a packed buffer, Newton-CG packs the Hessian into the same buffer.
+
+    Attributes
+    ----------
+    classes_ : ht.DNDarray, shape (n_classes,)
+        The class labels, sorted
+    coef_ : ht.DNDarray, shape (n_classes, n_features)
+        Coefficients W of the features
+    intercept_ : ht.DNDarray, shape (n_classes,)
+        The intercepts b
+    n_iter_ : int
+        Number of iterations of the solver
+    converged_ : bool
+        Whether the solver reached the tolerance within max_iter iterations
+    loss_curve_ : list of float
+        The objective after every iteration, the first entry is the objective of the initial parameters
+
+    Examples
+    --------
+    >>> X = ht.array([[0.0], [1.0], [4.0], [5.0]], split=0)
+    >>> y = ht.array([0, 0, 1, 1], split=0)
+    >>> ht.regression.LogisticRegression().fit(X, y).predict(ht.array([[0.5], [4.5]]))
+    tensor([0, 1])
+    """
+
+    def __init__(
+        self,
+        lam=1e-4,
+        fit_intercept=True,
+        solver="lbfgs",
+        max_iter=100,
+        tol=1e-6,
+        history_size=10,
+        warm_start=False,
+    ):
+        self.lam = lam
+        self.fit_intercept = fit_intercept
+        self.solver = solver
+        self.max_iter = max_iter
+        self.tol = tol
+        self.history_size = history_size
+        self.warm_start = warm_start
+
+        # in-place properties
+        self._theta = None
+        self.classes_ = None
+        self.n_iter_ = None
+        self.converged_ = None
+        self.loss_curve_ = None
+
+    @property
+    def coef_(self):
+        if self._theta is None:
+            return None
+        return ht.array(self._theta[1:].t(), device=self._device, comm=self._comm)
+
+    @property
+    def intercept_(self):
+        if self._theta is None:
+            return None
+        return ht.array(self._theta[0], device=self._device, comm=self._comm)
+
+    def fit(self, X, y):
+        """
+        Fit the logistic model.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            Input data.
+        y : ht.DNDarray, shape (n_samples,)
+            Class labels
+
+        Returns
+        -------
+        self : LogisticRegression
+        """
+        _check_parameters(self)
+        classes = ht.unique(y, sorted=True)
+        if classes.split is not None:
+            classes = ht.resplit(classes, axis=None)
+        if classes.shape[0] < 2:
+            raise ValueError("y needs at least two classes, but has {}".format(classes.shape[0]))
+        X, y, comm = _sanitize_data(X, y)
+        local = X._DNDarray__array
+        labels = _searchsorted(classes._DNDarray__array.to(y.dtype), y)
+
+        if self.warm_start and self.classes_ is not None and not ht.equal(classes, self.classes_):
+            raise ValueError("the classes {} differ from the previous fit".format(classes))
+        self.classes_ = classes
+        theta = _initial_theta(self, local, classes.shape[0])
+
+        evaluate = _evaluator(
+            _cross_entropy, local, labels, X.shape[0], self.lam, self.fit_intercept, comm
+        )
+        self._theta, self.loss_curve_, self.n_iter_, self.converged_ = _minimize(
+            evaluate, theta, self.solver, self.max_iter, self.tol, self.history_size
+        )
+        self._device, self._comm = X.device, X.comm
+        return self
+
+    def predict_proba(self, X):
+        """
+        Probabilities of the classes for the samples of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            Input data.
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples, n_classes)
+            The columns correspond to the classes in classes_, distributed like the samples of X
+        """
+        if self._theta is None:
+            raise RuntimeError("the model needs to be fitted before predicting")
+        X = _sanitize_samples(X, self._theta.shape[0] - 1)
+        z = _decision(X._DNDarray__array.to(self._theta.dtype), self._theta)
+        return ht.array(torch.softmax(z, dim=1), is_split=X.split, device=X.device, comm=X.comm)
+
+    def predict(self, X):
+        """
+        Predict the class labels of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray, shape (n_samples, n_features)
+            Input data.
+
+        Returns
+        -------
+        ht.DNDarray, shape (n_samples,)
+            The most likely class of each sample, distributed like the samples of X
+        """
+        if self._theta is None:
+            raise RuntimeError("the model needs to be fitted before predicting")
+        X = _sanitize_samples(X, self._theta.shape[0] - 1)
+        z = _decision(X._DNDarray__array.to(self._theta.dtype), self._theta)
+        labels = self.classes_._DNDarray__array[z.argmax(dim=1)]
+        return ht.array(labels, is_split=X.split, device=X.device, comm=X.comm)
+
+
+def _check_parameters(estimator):
+    """
+    Checks the solver parameters of a linear model.
+    """
+    if estimator.solver not in ["lbfgs", "newton-cg"]:
+        raise ValueError(
+            'solver must be "lbfgs" or "newton-cg", currently: {}'.format(estimator.solver)
+        )
+    if not isinstance(estimator.max_iter, int) or estimator.max_iter < 1:
+        raise ValueError(
+            "max_iter must be a positive int, currently: {}".format(estimator.max_iter)
+        )
+    if not isinstance(estimator.history_size, int) or estimator.history_size < 1:
+        raise ValueError(
+            "history_size must be a positive int, currently: {}".format(estimator.history_size)
+        )
+    if estimator.lam < 0:
+        raise ValueError("lam must be non-negative, currently: {}".format(estimator.lam))
+    if estimator.tol < 0:
+        raise ValueError("tol must be non-negative, currently: {}".format(estimator.tol))
+
+
+def _sanitize_samples(X, n_features):
+    """
+    Checks the samples to be predicted, X is returned split along the samples or not distributed.
+    """
+    if not isinstance(X, ht.DNDarray):
+        raise ValueError("X needs to be a ht.DNDarray, but was {}".format(type(X)))
+    if X.ndim != 2 or X.shape[1] != n_features:
+        raise ValueError(
+            "X must have the shape (n_samples, {}), currently: {}".format(n_features, X.shape)
+        )
+    if X.split is not None and X.split != 0:
+        X = ht.resplit(X, 0)
+    return X
+
+
+def _initial_theta(estimator, X, n_outputs):
+    """
+    Parameters of shape (n_features + 1, n_outputs) the solver starts with, the first row holds the intercepts.
+    The solution of the previous fit is reused for warm starts.
+    """
+    shape = (X.shape[1] + 1, n_outputs)
+    if estimator.warm_start and estimator._theta is not None:
+        if tuple(estimator._theta.shape) != shape:
+            raise ValueError(
+                "warm start needs {} parameters, but the previous fit has {}".format(
+                    shape, tuple(estimator._theta.shape)
+                )
+            )
+        return estimator._theta.clone().to(X.dtype)
+    return torch.zeros(shape, dtype=X.dtype, device=X.device)
+
+
+def _decision(X, theta):
+    """
+    Decision function X W + b of the local samples.
+    """
+    return torch.addmm(theta[0], X, theta[1:])
+
+
+def _squared_loss(X, y, theta, hessian):
+    """
+    Sum of the halved squared residuals of the local samples, its gradient and optionally its Hessian with
+    respect to theta, which is the Gram matrix of the samples extended by a column of ones.
+    """
+    residual = _decision(X, theta)[:, 0] - y
+    loss = 0.5 * residual.dot(residual)
+    grad = torch.cat((residual.sum().reshape(1), torch.mv(X.t(), residual))).unsqueeze(1)
+    if not hessian:
+        return loss, grad, None
+    extended = torch.cat((torch.ones_like(X[:, :1]), X), dim=1)
+    return loss, grad, torch.mm(extended.t(), extended)
+
+
+def _cross_entropy(X, labels, theta, hessian):
+    """
+    Sum of the cross-entropies of the softmax of the local samples, its gradient and optionally its Hessian with
+    respect to theta in the row-major order of theta.
+    """
+    z = _decision(X, theta)
+    log_proba = torch.log_softmax(z, dim=1)
+    loss = -log_proba.gather(1, labels.unsqueeze(1)).sum()
+    proba = log_proba.exp()
+    residual = proba.clone()
+    residual[torch.arange(labels.shape[0], device=labels.device), labels] -= 1.0
+    grad = torch.cat((residual.sum(0, keepdim=True), torch.mm(X.t(), residual)))
+    if not hessian:
+        return loss, grad, None
+
+    # H[a, k, b, l] = sum_i x_ia x_ib (p_ik delta_kl - p_ik p_il) of the samples extended by ones
+    extended = torch.cat((torch.ones_like(X[:, :1]), X), dim=1)
+    n, k = extended.shape[1], proba.shape[1]
+    weighted = (extended.unsqueeze(2) * proba.unsqueeze(1)).reshape(-1, n * k)
+    diagonal = torch.einsum("ia,ib,ik->abk", extended, extended, proba)
+    hess = torch.diag_embed(diagonal).permute(0, 2, 1, 3).reshape(n * k, n * k)
+    return loss, grad, hess - torch.mm(weighted.t(), weighted)
+
+
+def _evaluator(loss_function, X, y, m, lam, fit_intercept, comm):
+    """
+    Returns a function evaluating the regularized mean loss, its gradient and optionally its Hessian at theta. The
+    local sums are packed into a single buffer that is reduced in one Allreduce.
+    """
+
+    def evaluate(theta, hessian=False):
+        loss, grad, hess = loss_function(X, y, theta, hessian)
+        parts = [loss.reshape(1), grad.flatten()]
+        if hessian:
+            parts.append(hess.flatten())
+        buf = torch.cat(parts)
+        if comm is not None:
+            comm.Allreduce(ht.communication.MPI.IN_PLACE, buf, ht.communication.MPI.SUM)
+        buf /= m
+
+        size = theta.numel()
+        weights = theta[1:]
+        loss = buf[0].item() + 0.5 * lam * weights.pow(2).sum().item()
+        grad = buf[1 : size + 1].reshape(theta.shape).clone()
+        grad[1:] += lam * weights
+        if not fit_intercept:
+            grad[0] = 0.0
+        if not hessian:
+            return loss, grad, None
+
+        hess = buf[size + 1 :].reshape(size, size)
+        n_outputs = theta.shape[1]
+        penalty = torch.full((size,), lam, dtype=hess.dtype, device=hess.device)
+        penalty[:n_outputs] = 0.0
+        hess += torch.diag(penalty)
+        if not fit_intercept:
+            # the intercepts are fixed, their Newton steps vanish
+            hess[:n_outputs], hess[:, :n_outputs] = 0.0, 0.0
+            hess[range(n_outputs), range(n_outputs)] = 1.0
+        return loss, grad, hess
+
+    return evaluate
+
+
+def _minimize(evaluate, theta, solver, max_iter, tol, history_size):
+    """
+    Minimizes the objective given by evaluate starting from theta with L-BFGS [1] or Newton-CG [2]. The steps are
+    chosen with a backtracking line search satisfying the Armijo condition. Returns the parameters, the objective
+    after every iteration, the number of iterations and whether the tolerance was reached.
+
+    References
+    ----------
+    [1] Liu, D. C., and Nocedal, J., "On the limited memory BFGS method for large scale optimization", Mathematical
+        Programming, 45, pp. 503-528, 1989.
+    [2] Nocedal, J., and Wright, S. J., "Numerical Optimization", 2nd edition, Springer, chapter 7.1, 2006.
+    """
+    newton = solver == "newton-cg"
+    loss, grad, hess = evaluate(theta, newton)
+    losses = [loss]
+    corrections = []
+    converged = False
+
+    n_iter = 0
+    while n_iter < max_iter:
+        if grad.abs().max().item() <= tol:
+            converged = True
+            break
+        if newton:
+            # inexact Newton step, the accuracy grows as the gradient vanishes
+            norm = grad.norm().item()
+            direction = _conjugate_gradient(hess, -grad.flatten(), min(0.5, norm ** 0.5) * norm)
+            direction = direction.reshape(theta.shape)
+        else:
+            direction = -_two_loop(grad, corrections)
+        slope = (grad * direction).sum().item()
+        if slope >= 0:
+            # no descent direction, restart from the steepest descent
+            corrections.clear()
+            direction = -grad
+            slope = -grad.pow(2).sum().item()
+
+        step = 1.0
+        if n_iter == 0 and not newton:
+            step = min(1.0, 1.0 / grad.abs().sum().item())
+        while True:
+            candidate = theta + step * direction
+            new_loss, new_grad, new_hess = evaluate(candidate, newton)
+            if new_loss <= loss + 1e-4 * step * slope or step < 1e-10:
+                break
+            step *= 0.5
+
+        s, y = candidate - theta, new_grad - grad
+        if (s * y).sum().item() > 1e-10:
+            corrections.append((s, y))
+            if len(corrections) > history_size:
+                corrections.pop(0)
+        theta, grad, hess = candidate, new_grad, new_hess
+        losses.append(new_loss)
+        n_iter += 1
+        if abs(loss - new_loss) <= tol * max(abs(loss), abs(new_loss), 1.0):
+            converged = True
+            break
+        loss = new_loss
+
+    return theta, losses, n_iter, converged
+
+
+def _two_loop(grad, corrections):
+    """
+    L-BFGS two-loop recursion, the product of the inverse Hessian approximation given by the correction pairs
+    (s, y) with the gradient.
+    """
+    q = grad.clone()
+    alphas = []
+    for s, y in reversed(corrections):
+        alpha = (s * q).sum() / (s * y).sum()
+        q -= alpha * y
+        alphas.append(alpha)
+    if corrections:
+        s, y = corrections[-1]
+        q *= (s * y).sum() / (y * y).sum()
+    for (s, y), alpha in zip(corrections, reversed(alphas)):
+        beta = (y * q).sum() / (s * y).sum()
+        q += (alpha - beta) * s
+    return q
+
+
+def _conjugate_gradient(A, b, tol):
+    """
+    Solves A x = b approximately for the symmetric positive semi-definite matrix A with conjugate gradients. The
+    iterations stop at the residual norm tol or at a direction of non-positive curvature.
+    """
+    x = torch.zeros_like(b)
+    r = b.clone()
+    p = r.clone()
+    rr = r.dot(r)
+    for _ in range(b.shape[0]):
+        if rr.sqrt().item() <= tol:
+            break
+        Ap = torch.mv(A, p)
+        curvature = p.dot(Ap)
+        if curvature.item() <= 0:
+            if not x.any():
+                x = b.clone()
+            break
+        alpha = rr / curvature
+        x += alpha * p
+        r -= alpha * Ap
+        rr_new = r.dot(r)
+        p = r + (rr_new / rr) * p
+        rr = rr_new
+    return x
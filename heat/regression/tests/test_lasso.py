@@ -17,7 +17,17 @@ class TestLasso(TestCase):
         lasso = ht.regression.Lasso()
         params = lasso.get_params()
 
-        self.assertEqual(params, {"lam": 0.1, "max_iter": 100, "tol": 1e-6})
+        self.assertEqual(
+            params,
+            {
+                "lam": 0.1,
+                "max_iter": 100,
+                "tol": 1e-6,
+                "l1_ratio": 1.0,
+                "precompute": "auto",
+                "block_size": 32,
+            },
+        )
 
         params["max_iter"] = 200
         lasso.set_params(**params)
@@ -27,6 +37,115 @@ class TestLasso(TestCase):
         with self.assertRaises(ValueError):
             ht.regression.Lasso().set_params(foo="bar")
 
+        X, y = ht.ones((10, 3), split=0), ht.ones(10, split=0)
+        with self.assertRaises(ValueError):
+            ht.regression.Lasso(l1_ratio=1.5).fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.Lasso(precompute="always").fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.Lasso(block_size=0).fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.Lasso().fit(X, ht.ones((10, 2), split=0))
+        with self.assertRaises(ValueError):
+            ht.regression.Lasso().fit(X, ht.ones(9, split=0))
+
+    def test_coordinate_descent(self):
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(2)
+        x = rng.randn(size * 20 + 3, 8)
+        x[:, 0] = 1.0
+        x[:, 1:] /= np.sqrt((x[:, 1:] ** 2).mean(axis=0))
+        y = x @ np.array([0.5, 2.0, -1.0, 0.0, 0.0, 0.3, 0.0, 0.0]) + 0.1 * rng.randn(x.shape[0])
+        m = x.shape[0]
+
+        for l1_ratio in [1.0, 0.5]:
+            lam = 0.1
+            l1, l2 = lam * l1_ratio, lam * (1.0 - l1_ratio)
+            fits = []
+            for split in [None, 0]:
+                X, Y = ht.array(x, split=split), ht.array(y, split=split)
+                for precompute, block_size in [(True, 32), (False, 32), (False, 3)]:
+                    lasso = ht.regression.Lasso(
+                        lam=lam,
+                        max_iter=1000,
+                        tol=1e-10,
+                        l1_ratio=l1_ratio,
+                        precompute=precompute,
+                        block_size=block_size,
+                    )
+                    lasso.fit(X, Y)
+                    self.assertLess(lasso.n_iter, 1000)
+                    self.assertEqual(lasso.theta.shape, (8, 1))
+                    fits.append(lasso.theta._DNDarray__array.flatten().double().numpy())
+
+            # optimality conditions of the elastic net
+            theta = fits[0]
+            correlation = x.T @ (y - x @ theta) / m
+            self.assertAlmostEqual(correlation[0], 0.0, places=4)
+            active = theta[1:] != 0
+            self.assertTrue(
+                np.allclose(
+                    correlation[1:][active],
+                    l1 * np.sign(theta[1:][active]) + l2 * theta[1:][active],
+                    atol=1e-4,
+                )
+            )
+            self.assertTrue((np.abs(correlation[1:][~active]) <= l1 + 1e-4).all())
+            self.assertTrue((~active).any())
+            for other in fits[1:]:
+                self.assertTrue(np.allclose(theta, other, atol=1e-4))
+
+    def test_lasso_path(self):
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(4)
+        x = rng.randn(size * 20 + 5, 30)
+        x[:, 0] = 1.0
+        x[:, 1:] /= np.sqrt((x[:, 1:] ** 2).mean(axis=0))
+        y = 2.0 * x[:, 1] - 1.5 * x[:, 7] + x[:, 12] + 0.1 * rng.randn(x.shape[0])
+
+        for split in [None, 0]:
+            X, Y = ht.array(x, split=split), ht.array(y, split=split)
+            lams, coefs = ht.regression.lasso_path(
+                X, Y, n_lams=10, eps=1e-2, tol=1e-10, max_iter=1000
+            )
+            self.assertEqual(lams.shape, (10,))
+            self.assertEqual(coefs.shape, (30, 10))
+            lams, coefs = lams._DNDarray__array, coefs._DNDarray__array
+            self.assertTrue((lams[1:] < lams[:-1]).all())
+            # all features vanish at the start of the path
+            self.assertTrue((coefs[1:, 0] == 0).all())
+            self.assertAlmostEqual(coefs[0, 0].item(), y.mean(), places=6)
+
+            for l1_ratio in [1.0, 0.7]:
+                _, coefs = ht.regression.lasso_path(
+                    X,
+                    Y,
+                    lams=[0.05, 0.5, 0.2],
+                    l1_ratio=l1_ratio,
+                    tol=1e-10,
+                    max_iter=1000,
+                    block_size=4,
+                )
+                for k, lam in enumerate([0.5, 0.2, 0.05]):
+                    lasso = ht.regression.Lasso(
+                        lam=lam, l1_ratio=l1_ratio, tol=1e-10, max_iter=1000, precompute=False
+                    )
+                    lasso.fit(X, Y)
+                    self.assertTrue(
+                        np.allclose(
+                            coefs._DNDarray__array[:, k].numpy(),
+                            lasso.theta._DNDarray__array.flatten().numpy(),
+                            atol=1e-5,
+                        )
+                    )
+
+        with self.assertRaises(ValueError):
+            ht.regression.lasso_path(X, Y, l1_ratio=0.0)
+        with self.assertRaises(ValueError):
+            ht.regression.lasso_path(X, Y, n_lams=0)
+        with self.assertRaises(ValueError):
+            ht.regression.lasso_path(X, Y, block_size=0)
+
     if ht.io.supports_hdf5():
 
         def test_lasso(self):
@@ -0,0 +1,161 @@
+import numpy as np
+import torch
+import heat as ht
+
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+class TestLinearRegression(TestCase):
+    def test_regressor(self):
+        model = ht.regression.LinearRegression()
+        self.assertTrue(ht.is_estimator(model))
+        self.assertTrue(ht.is_regressor(model))
+        self.assertEqual(
+            model.get_params(),
+            {
+                "lam": 0.0,
+                "fit_intercept": True,
+                "solver": "lbfgs",
+                "max_iter": 100,
+                "tol": 1e-6,
+                "history_size": 10,
+                "warm_start": False,
+            },
+        )
+
+    def test_exceptions(self):
+        X, y = ht.ones((10, 3), split=0), ht.ones(10, split=0)
+        with self.assertRaises(ValueError):
+            ht.regression.LinearRegression(solver="sgd").fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.LinearRegression(max_iter=0).fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.LinearRegression(history_size=0).fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.LinearRegression(lam=-1.0).fit(X, y)
+        with self.assertRaises(ValueError):
+            ht.regression.LinearRegression().fit(X, ht.ones(9, split=0))
+        with self.assertRaises(RuntimeError):
+            ht.regression.LinearRegression().predict(X)
+        model = ht.regression.LinearRegression().fit(X, y)
+        with self.assertRaises(ValueError):
+            model.predict(ht.ones((10, 4)))
+        with self.assertRaises(ValueError):
+            model.set_params(warm_start=True).fit(ht.ones((10, 4), split=0), y)
+
+    def test_ridge(self):
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(3)
+        x = rng.randn(size * 25 + 3, 5)
+        y = x @ np.array([1.0, -2.0, 0.5, 0.0, 3.0]) + 1.5 + 0.1 * rng.randn(x.shape[0])
+        m, lam = x.shape[0], 0.1
+
+        # normal equations of the penalized mean squared error with an unpenalized intercept
+        extended = np.hstack((np.ones((m, 1)), x))
+        penalty = lam * m * np.eye(6)
+        penalty[0, 0] = 0.0
+        expected = np.linalg.solve(extended.T @ extended + penalty, extended.T @ y)
+
+        for split in [None, 0]:
+            X, Y = ht.array(x, split=split), ht.array(y, split=split)
+            for solver in ["lbfgs", "newton-cg"]:
+                model = ht.regression.LinearRegression(lam=lam, solver=solver, tol=1e-10)
+                model.fit(X, Y)
+                self.assertTrue(model.converged_)
+                self.assertEqual(len(model.loss_curve_), model.n_iter_ + 1)
+                self.assertTrue(np.allclose(model.intercept_.numpy(), expected[0], atol=1e-5))
+                self.assertTrue(np.allclose(model.coef_.numpy(), expected[1:], atol=1e-5))
+
+                prediction = model.predict(X)
+                self.assertEqual(prediction.shape, (m,))
+                self.assertEqual(prediction.split, split)
+                self.assertTrue(np.allclose(prediction.numpy(), extended @ expected, atol=1e-4))
+
+            # Newton's method needs few iterations on the quadratic problem
+            model = ht.regression.LinearRegression(lam=lam, solver="newton-cg", tol=1e-10)
+            self.assertLessEqual(model.fit(X, Y).n_iter_, 5)
+
+        # without intercept
+        X, Y = ht.array(x, split=0), ht.array(y, split=0)
+        model = ht.regression.LinearRegression(fit_intercept=False, tol=1e-10).fit(X, Y)
+        expected = np.linalg.lstsq(x, y, rcond=None)[0]
+        self.assertEqual(model.intercept_.item(), 0.0)
+        self.assertTrue(np.allclose(model.coef_.numpy(), expected, atol=1e-5))
+
+    def test_warm_start(self):
+        rng = np.random.RandomState(4)
+        x = rng.randn(60, 3)
+        y = x @ np.array([2.0, 0.0, -1.0]) + 0.05 * rng.randn(60)
+        X, Y = ht.array(x, split=0), ht.array(y, split=0)
+
+        model = ht.regression.LinearRegression(warm_start=True, tol=1e-10).fit(X, Y)
+        coef, n_iter = model.coef_.numpy(), model.n_iter_
+        model.fit(X, Y)
+        self.assertLess(model.n_iter_, n_iter)
+        self.assertTrue(np.allclose(model.coef_.numpy(), coef))
+
+
+class TestLogisticRegression(TestCase):
+    def test_classifier(self):
+        model = ht.regression.LogisticRegression()
+        self.assertTrue(ht.is_estimator(model))
+        self.assertTrue(ht.is_classifier(model))
+        self.assertEqual(model.get_params()["lam"], 1e-4)
+
+    def test_exceptions(self):
+        X = ht.ones((10, 3), split=0)
+        with self.assertRaises(ValueError):
+            ht.regression.LogisticRegression().fit(X, ht.ones(10, split=0))
+        with self.assertRaises(ValueError):
+            ht.regression.LogisticRegression(tol=-1.0).fit(X, ht.arange(10, split=0) % 2)
+        with self.assertRaises(RuntimeError):
+            ht.regression.LogisticRegression().predict_proba(X)
+
+    def test_fit(self):
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(5)
+        n = size * 30 + 7
+        centers = np.array([[0.0, 0.0], [3.0, 0.0], [0.0, 3.0]])
+        labels = np.arange(n) % 3
+        x = centers[labels] + 0.7 * rng.randn(n, 2)
+
+        for split in [None, 0]:
+            X = ht.array(x, split=split)
+            y = ht.array(labels * 2 + 1, split=split)
+            fits = []
+            for solver in ["lbfgs", "newton-cg"]:
+                model = ht.regression.LogisticRegression(lam=0.01, solver=solver, tol=1e-9)
+                model.fit(X, y)
+                self.assertTrue(model.converged_)
+                self.assertTrue(ht.equal(model.classes_, ht.array([1, 3, 5])))
+                self.assertEqual(model.coef_.shape, (3, 2))
+                self.assertEqual(model.intercept_.shape, (3,))
+                fits.append(model)
+
+                # the gradient of the objective vanishes at the solution
+                theta = torch.cat(
+                    (
+                        model.intercept_._DNDarray__array.unsqueeze(0),
+                        model.coef_._DNDarray__array.t(),
+                    )
+                )
+                theta = theta.detach().requires_grad_()
+                z = torch.tensor(x) @ theta[1:] + theta[0]
+                loss = torch.nn.functional.cross_entropy(z, torch.tensor(labels))
+                loss = loss + 0.005 * theta[1:].pow(2).sum()
+                loss.backward()
+                self.assertLess(theta.grad.abs().max().item(), 1e-3)
+
+                proba = model.predict_proba(X)
+                self.assertEqual(proba.split, split)
+                self.assertTrue(ht.allclose(proba.sum(axis=1), ht.ones(n, dtype=proba.dtype)))
+                predicted = model.predict(X)
+                self.assertEqual(predicted.split, split)
+                self.assertGreater((predicted == y).sum().item(), 0.9 * n)
+
+            self.assertTrue(ht.allclose(fits[0].coef_, fits[1].coef_, atol=1e-3))
+
+            # a warm start from the solution needs fewer iterations
+            n_iter = fits[0].n_iter_
+            fits[0].set_params(warm_start=True).fit(X, y)
+            self.assertLess(fits[0].n_iter_, n_iter)
@@ -0,0 +1,3 @@
+from .dcsr_matrix import *
+from .factories import *
+from .io import *
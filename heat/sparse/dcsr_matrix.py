@@ -0,0 +1,373 @@
+import torch
+
+from ..core import dndarray
+from ..core import manipulations
+from ..core import types
+from ..core._operations import _searchsorted
+from ..core.communication import MPI, _alltoallv, _exchange
+
+__all__ = ["DCSR_matrix"]
+
+
+class DCSR_matrix:
+    """
+    Distributed sparse matrix in compressed sparse row format. The matrix is split along the rows, every process
+    holds a coalesced sparse torch tensor of its rows with the global column indices. The nonzeros are sorted by
+    row and column, i.e. they are stored in CSR order, the CSR arrays are available as data, indices and indptr.
+
+    Products with dense vectors and matrices only communicate the entries at the columns a process has nonzeros
+    in. The exchange of these entries is planned once for every distribution of the dense operand.
+
+    Parameters
+    ----------
+    array : torch.Tensor
+        Local rows as a sparse COO tensor of shape (local rows, columns)
+    gshape : tuple
+        The global shape of the matrix
+    dtype : ht.type
+        The datatype of the matrix
+    split : None or 0
+        The axis on which the matrix is divided between processes
+    device : ht.device
+        The device of the local rows
+    comm : ht.communication.MPICommunication
+        The communications object for sending and recieving data
+    """
+
+    def __init__(self, array, gshape, dtype, split, device, comm):
+        self.__array = array.coalesce()
+        self.__gshape = tuple(gshape)
+        self.__dtype = dtype
+        self.__split = split
+        self.__device = device
+        self.__comm = comm
+
+        # lazily computed properties
+        self.__offset = None
+        self.__gnnz = None
+        self.__halo = None
+        self.__compressed = None
+        self.__plans = {}
+
+    @property
+    def comm(self):
+        return self.__comm
+
+    @property
+    def device(self):
+        return self.__device
+
+    @property
+    def dtype(self):
+        return self.__dtype
+
+    @property
+    def gshape(self):
+        return self.__gshape
+
+    @property
+    def shape(self):
+        return self.__gshape
+
+    @property
+    def lshape(self):
+        return tuple(self.__array.shape)
+
+    @property
+    def ndim(self):
+        return 2
+
+    @property
+    def split(self):
+        return self.__split
+
+    @property
+    def larray(self):
+        """
+        Returns the local rows as a coalesced sparse COO tensor.
+        """
+        return self.__array
+
+    @property
+    def lnnz(self):
+        """
+        Returns the number of nonzeros of the local rows.
+        """
+        return self.__array._nnz()
+
+    @property
+    def nnz(self):
+        """
+        Returns the global number of nonzeros.
+        """
+        if self.__gnnz is None:
+            self.__gnnz = self.lnnz
+            if self.__split is not None:
+                self.__gnnz = self.__comm.allreduce(self.__gnnz, MPI.SUM)
+        return self.__gnnz
+
+    @property
+    def data(self):
+        """
+        Returns the values of the local nonzeros in CSR order.
+        """
+        return self.__array.values()
+
+    @property
+    def indices(self):
+        """
+        Returns the global column indices of the local nonzeros in CSR order.
+        """
+        return self.__array.indices()[1]
+
+    @property
+    def indptr(self):
+        """
+        Returns the local row pointers, the nonzeros of the i-th local row are data[indptr[i]:indptr[i + 1]].
+        """
+        rows = self.__array.indices()[0]
+        indptr = torch.zeros(self.lshape[0] + 1, dtype=torch.int64, device=rows.device)
+        indptr[1:] = torch.bincount(rows, minlength=self.lshape[0]).cumsum(0)
+        return indptr
+
+    @property
+    def offset(self):
+        """
+        Returns the global index of the first local row.
+        """
+        if self.__offset is None:
+            self.__offset = 0
+            if self.__split is not None and self.__comm.is_distributed():
+                self.__offset = self.__comm.exscan(self.lshape[0], MPI.SUM)
+                self.__offset = 0 if self.__comm.rank == 0 else self.__offset
+        return self.__offset
+
+    def astype(self, dtype):
+        """
+        Returns a copy of the matrix with the values cast to dtype.
+
+        Parameters
+        ----------
+        dtype : ht.dtype
+            The new datatype
+        """
+        dtype = types.canonical_heat_type(dtype)
+        return self.__wrap(self.__array.values().to(dtype.torch_type()))
+
+    def todense(self):
+        """
+        Returns the matrix as a dense ht.DNDarray with the same distribution.
+        """
+        return dndarray.DNDarray(
+            self.__array.to_dense(),
+            self.__gshape,
+            self.__dtype,
+            self.__split,
+            self.__device,
+            self.__comm,
+        )
+
+    def sum(self, axis=None):
+        """
+        Sum of the matrix elements over the given axis.
+
+        Parameters
+        ----------
+        axis : None, 0 or 1, optional
+            Axis along which the sum is computed, the sum of all elements by default
+
+        Returns
+        -------
+        ht.DNDarray
+            The row sums are distributed like the matrix, the column sums and the total are replicated
+        """
+        if axis not in [None, 0, 1, -1, -2]:
+            raise ValueError("axis needs to be None, 0 or 1, but was {}".format(axis))
+        axis = axis % 2 if axis is not None else None
+        rows, cols = self.__array.indices()
+        values = self.__array.values()
+
+        if axis == 1:
+            result = torch.zeros(self.lshape[0], dtype=values.dtype, device=values.device)
+            result.index_add_(0, rows, values)
+            return dndarray.DNDarray(
+                result, (self.__gshape[0],), self.__dtype, self.__split, self.__device, self.__comm
+            )
+
+        if axis == 0:
+            result = torch.zeros(self.__gshape[1], dtype=values.dtype, device=values.device)
+            result.index_add_(0, cols, values)
+            gshape = (self.__gshape[1],)
+        else:
+            result = values.sum().reshape(1)
+            gshape = ()
+        if self.__split is not None and self.__comm.is_distributed():
+            self.__comm.Allreduce(MPI.IN_PLACE, result, MPI.SUM)
+        return dndarray.DNDarray(
+            result.reshape(gshape), gshape, self.__dtype, None, self.__device, self.__comm
+        )
+
+    def matmul(self, other):
+        """
+        Product of the matrix with a dense vector or matrix.
+
+        Parameters
+        ----------
+        other : ht.DNDarray
+            1D vector of length n or 2D matrix with n rows, where n is the number of columns of the matrix, its
+            split can be None or 0
+
+        Returns
+        -------
+        ht.DNDarray
+            Distributed like the rows of the sparse matrix
+        """
+        if not isinstance(other, dndarray.DNDarray):
+            raise TypeError("other needs to be a ht.DNDarray, but was {}".format(type(other)))
+        if other.ndim not in [1, 2] or other.shape[0] != self.__gshape[1]:
+            raise ValueError(
+                "shapes {} and {} are not aligned for matmul".format(self.__gshape, other.shape)
+            )
+        if other.split not in [None, 0]:
+            other = manipulations.resplit(other, 0)
+        if other.comm != self.__comm:
+            raise NotImplementedError("Differing communicators not supported")
+
+        dtype = types.promote_types(self.__dtype, other.dtype)
+        x = other._DNDarray__array.to(dtype.torch_type())
+        gathered = self.__gather(x, other)
+        compressed = self.__compress().to(dtype.torch_type())
+        if x.ndim == 1:
+            result = torch.sparse.mm(compressed, gathered.unsqueeze(1)).squeeze(1)
+        else:
+            result = torch.sparse.mm(compressed, gathered)
+
+        return dndarray.DNDarray(
+            result,
+            (self.__gshape[0],) + tuple(other.shape[1:]),
+            dtype,
+            self.__split,
+            self.__device,
+            self.__comm,
+        )
+
+    def __compress(self):
+        """
+        Local rows with the columns numbered by the halo, the sorted global indices of the nonempty columns.
+        """
+        if self.__compressed is None:
+            rows, cols = self.__array.indices()
+            self.__halo, columns = torch.unique(cols, return_inverse=True)
+            self.__compressed = torch.sparse_coo_tensor(
+                torch.stack((rows, columns)),
+                self.__array.values(),
+                (self.lshape[0], self.__halo.shape[0]),
+            ).coalesce()
+        return self.__compressed
+
+    def __gather(self, x, other):
+        """
+        Rows of the dense operand at the halo columns, received from the processes holding them.
+        """
+        self.__compress()
+        if other.split is None or not self.__comm.is_distributed():
+            return x[self.__halo]
+
+        counts = other.create_lshape_map()[:, 0]
+        key = tuple(counts.tolist())
+        if key not in self.__plans:
+            bounds = counts.to(self.__halo.device).long().cumsum(0)
+            owners = _searchsorted(bounds, self.__halo, right=True)
+            (requested,), order, send_counts, recv_counts = _exchange(
+                self.__comm, owners, self.__halo
+            )
+            requested -= bounds[self.__comm.rank] - counts[self.__comm.rank]
+            self.__plans[key] = (requested, order, send_counts, recv_counts)
+
+        requested, order, send_counts, recv_counts = self.__plans[key]
+        reply = _alltoallv(self.__comm, x[requested], recv_counts, send_counts)
+        gathered = torch.empty_like(reply)
+        gathered[order] = reply
+        return gathered
+
+    def __wrap(self, values):
+        """
+        Matrix with the nonzero pattern of this one and the given values.
+        """
+        array = torch.sparse_coo_tensor(self.__array.indices(), values, self.lshape)
+        return DCSR_matrix(
+            array,
+            self.__gshape,
+            types.canonical_heat_type(values.dtype),
+            self.__split,
+            self.__device,
+            self.__comm,
+        )
+
+    def __binary(self, other, operation):
+        """
+        Elementwise operation with a scalar or a sparse matrix of the same shape and distribution. Operations of two
+        sparse matrices are applied to the union of their nonzeros, the result is sparse.
+        """
+        if isinstance(other, (int, float)):
+            return self.__wrap(operation(self.__array.values(), other))
+        if not isinstance(other, DCSR_matrix):
+            return NotImplemented
+        if other.shape != self.__gshape or other.lshape != self.lshape:
+            raise ValueError(
+                "operands need to have the same shape and distribution, but were {} and {}".format(
+                    self.__gshape, other.shape
+                )
+            )
+        dtype = types.promote_types(self.__dtype, other.dtype).torch_type()
+        # pad both operands with explicit zeros on the union of the nonzeros
+        indices = torch.cat((self.__array.indices(), other.larray.indices()), dim=1)
+        zeros = torch.sparse_coo_tensor(
+            indices, torch.zeros(indices.shape[1], dtype=dtype, device=indices.device), self.lshape
+        ).coalesce()
+        left = (zeros + self.__array.to(dtype)).coalesce().values()
+        right = (zeros + other.larray.to(dtype)).coalesce().values()
+        array = torch.sparse_coo_tensor(zeros.indices(), operation(left, right), self.lshape)
+        return DCSR_matrix(
+            array,
+            self.__gshape,
+            types.canonical_heat_type(dtype),
+            self.__split,
+            self.__device,
+            self.__comm,
+        )
+
+    def __add__(self, other):
+        if not isinstance(other, DCSR_matrix):
+            return NotImplemented
+        return self.__binary(other, torch.add)
+
+    def __sub__(self, other):
+        if not isinstance(other, DCSR_matrix):
+            return NotImplemented
+        return self.__binary(other, torch.sub)
+
+    def __mul__(self, other):
+        return self.__binary(other, torch.mul)
+
+    def __rmul__(self, other):
+        return self.__binary(other, torch.mul)
+
+    def __truediv__(self, other):
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return self.__binary(other, torch.true_divide)
+
+    def __neg__(self):
+        return self.__wrap(-self.__array.values())
+
+    def __abs__(self):
+        return self.__wrap(self.__array.values().abs())
+
+    def __matmul__(self, other):
+        return self.matmul(other)
+
+    def __repr__(self):
+        return "<{}x{} DCSR_matrix with dtype={}, lnnz={}, split={}>".format(
+            self.__gshape[0], self.__gshape[1], self.__dtype.__name__, self.lnnz, self.__split
+        )
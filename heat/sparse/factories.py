@@ -0,0 +1,94 @@
+import torch
+
+from ..core import devices
+from ..core import dndarray
+from ..core import manipulations
+from ..core import types
+from ..core.communication import MPI, sanitize_comm
+from .dcsr_matrix import DCSR_matrix
+
+__all__ = ["sparse_csr_matrix"]
+
+
+def sparse_csr_matrix(obj, dtype=None, split=None, is_split=None, device=None, comm=None):
+    """
+    Creates a distributed sparse matrix in compressed sparse row format.
+
+    Parameters
+    ----------
+    obj : ht.DNDarray, torch.Tensor or array_like
+        2D data, torch tensors may be dense or sparse COO tensors. The zeros of dense data are dropped.
+    dtype : ht.dtype, optional
+        The datatype of the matrix, inferred from obj by default
+    split : None or 0, optional
+        If 0, the rows of obj are distributed among the processes. For a DNDarray, the split of the DNDarray is kept
+        by default, a DNDarray split along the columns is redistributed along the rows.
+    is_split : None or 0, optional
+        If 0, obj holds the local rows of each process, mutually exclusive with split
+    device : str or ht.Device, optional
+        The device of the local rows, ignored for DNDarrays
+    comm : Communication, optional
+        The communicator, ignored for DNDarrays
+
+    Returns
+    -------
+    DCSR_matrix
+
+    Examples
+    --------
+    >>> a = ht.sparse.sparse_csr_matrix(ht.eye(4, split=0))
+    >>> a.nnz
+    4
+    >>> (a @ ht.arange(4, dtype=ht.float32, split=0))
+    tensor([0., 1., 2., 3.])
+    """
+    if split is not None and is_split is not None:
+        raise ValueError("split and is_split are mutually exclusive parameters")
+    if split not in [None, 0] or is_split not in [None, 0]:
+        raise ValueError(
+            "split and is_split need to be None or 0, but were {} and {}".format(split, is_split)
+        )
+
+    if isinstance(obj, dndarray.DNDarray):
+        if is_split is not None:
+            raise ValueError("is_split is not supported for DNDarrays")
+        if obj.ndim != 2:
+            raise ValueError("obj needs to be 2D, but had {} dimensions".format(obj.ndim))
+        if split is None and obj.split is not None:
+            split = 0
+        if obj.split != split:
+            obj = manipulations.resplit(obj, split)
+        dtype = obj.dtype if dtype is None else types.canonical_heat_type(dtype)
+        local = obj._DNDarray__array.to(dtype.torch_type()).to_sparse()
+        return DCSR_matrix(local, obj.shape, dtype, split, obj.device, obj.comm)
+
+    device = devices.sanitize_device(device)
+    comm = sanitize_comm(comm)
+    if not isinstance(obj, torch.Tensor):
+        obj = torch.tensor(obj)
+    if obj.dim() != 2:
+        raise ValueError("obj needs to be 2D, but had {} dimensions".format(obj.dim()))
+    dtype = types.canonical_heat_type(obj.dtype if dtype is None else dtype)
+    obj = obj.to(device=device.torch_device, dtype=dtype.torch_type())
+    gshape = tuple(obj.shape)
+
+    if split == 0:
+        # every process keeps its chunk of the rows
+        offset, lshape, _ = comm.chunk(gshape, 0)
+        if obj.is_sparse:
+            obj = obj.coalesce()
+            rows, cols = obj.indices()
+            local = (rows >= offset) & (rows < offset + lshape[0])
+            indices = torch.stack((rows[local] - offset, cols[local]))
+            obj = torch.sparse_coo_tensor(indices, obj.values()[local], lshape)
+        else:
+            obj = obj[offset : offset + lshape[0]]
+    elif is_split == 0:
+        gshape = (comm.allreduce(gshape[0], MPI.SUM), gshape[1])
+        if comm.allreduce(gshape[1], MPI.MIN) != comm.allreduce(gshape[1], MPI.MAX):
+            raise ValueError("the local rows need to have the same number of columns")
+        split = 0
+
+    if not obj.is_sparse:
+        obj = obj.to_sparse()
+    return DCSR_matrix(obj, gshape, dtype, split, device, comm)
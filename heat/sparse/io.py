@@ -0,0 +1,76 @@
+import torch
+
+from ..core import devices
+from ..core import types
+from ..core.communication import sanitize_comm
+from .dcsr_matrix import DCSR_matrix
+
+__all__ = []
+
+
+try:
+    import h5py
+except ImportError:
+    # HDF5 support is optional
+    pass
+else:
+    # add functions to exports
+    __all__.extend(["load_hdf5"])
+
+    def load_hdf5(path, dataset, dtype=types.float32, split=0, device=None, comm=None):
+        """
+        Loads a sparse matrix in compressed sparse row format from an HDF5 file. The matrix is stored in the group
+        dataset as the datasets 'data', 'indices' and 'indptr' of scipy.sparse.csr_matrix and the attribute 'shape'.
+        Every process only reads the nonzeros of its rows.
+
+        Parameters
+        ----------
+        path : str
+            Path to the HDF5 file to be read.
+        dataset : str
+            Name of the group holding the matrix.
+        dtype : ht.dtype
+            Data type of the resulting matrix; default: ht.float32.
+        split : None or 0, optional
+            If 0, the rows are distributed among the processing cores; default: 0.
+        device : None or str, optional
+            The device id on which to place the data, defaults to globally set default device.
+        comm : Communication, optional
+            The communication to use for the data distribution. defaults to MPI_COMM_WORLD.
+
+        Returns
+        -------
+        out : ht.sparse.DCSR_matrix
+            Matrix read from the HDF5 file.
+
+        Examples
+        --------
+        >>> a = ht.sparse.load_hdf5('graph.h5', dataset='adjacency')
+        >>> a.shape
+        (100, 100)
+        """
+        if not isinstance(path, str):
+            raise TypeError("path must be str, not {}".format(type(path)))
+        if not isinstance(dataset, str):
+            raise TypeError("dataset must be str, not {}".format(type(dataset)))
+        if split not in [None, 0]:
+            raise ValueError("split must be None or 0, not {}".format(split))
+
+        dtype = types.canonical_heat_type(dtype)
+        device = devices.sanitize_device(device)
+        comm = sanitize_comm(comm)
+
+        with h5py.File(path, "r") as handle:
+            group = handle[dataset]
+            gshape = tuple(int(ele) for ele in group.attrs["shape"])
+            offset, lshape, _ = comm.chunk(gshape, split)
+            indptr = group["indptr"][offset : offset + lshape[0] + 1]
+            indptr = torch.tensor(indptr, dtype=torch.int64)
+            start, end = indptr[0].item(), indptr[-1].item()
+            values = torch.tensor(group["data"][start:end], dtype=dtype.torch_type())
+            cols = torch.tensor(group["indices"][start:end], dtype=torch.int64)
+
+        rows = torch.repeat_interleave(torch.arange(lshape[0]), indptr[1:] - indptr[:-1])
+        local = torch.sparse_coo_tensor(torch.stack((rows, cols)), values, lshape)
+
+        return DCSR_matrix(local.to(device.torch_device), gshape, dtype, split, device, comm)
@@ -0,0 +1,124 @@
+import numpy as np
+import torch
+
+import heat as ht
+
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+class TestDCSR_matrix(TestCase):
+    def setUp(self):
+        size = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(3)
+        dense = rng.rand(size * 5 + 2, size * 3 + 1)
+        dense[dense < 0.7] = 0.0
+        self.dense = torch.tensor(dense, dtype=torch.float32)
+
+    def test_attributes(self):
+        for split in [None, 0]:
+            a = ht.sparse.sparse_csr_matrix(ht.array(self.dense, split=split))
+            self.assertIsInstance(a, ht.sparse.DCSR_matrix)
+            self.assertEqual(a.shape, tuple(self.dense.shape))
+            self.assertEqual(a.split, split)
+            self.assertEqual(a.dtype, ht.float32)
+            self.assertEqual(a.ndim, 2)
+            self.assertEqual(a.nnz, (self.dense != 0).sum().item())
+
+            # the local CSR arrays describe the local rows
+            local = self.dense[a.offset : a.offset + a.lshape[0]]
+            indptr = a.indptr
+            self.assertEqual(indptr.shape[0], a.lshape[0] + 1)
+            self.assertEqual(indptr[-1].item(), a.lnnz)
+            for i in range(a.lshape[0]):
+                row = torch.zeros(a.shape[1])
+                row[a.indices[indptr[i] : indptr[i + 1]]] = a.data[indptr[i] : indptr[i + 1]]
+                self.assertTrue(torch.equal(row, local[i]))
+
+            dense = a.todense()
+            self.assertEqual(dense.split, split)
+            self.assertTrue(torch.equal(ht.resplit(dense, None)._DNDarray__array, self.dense))
+            self.assertEqual(a.astype(ht.float64).dtype, ht.float64)
+
+    def test_matmul(self):
+        x = torch.arange(self.dense.shape[1], dtype=torch.float32)
+        y = torch.arange(self.dense.shape[1] * 3, dtype=torch.float32).reshape(-1, 3)
+        for split in [None, 0]:
+            a = ht.sparse.sparse_csr_matrix(self.dense, split=split)
+            for x_split in [None, 0]:
+                # the exchange plan is reused by the second product
+                for _ in range(2):
+                    res = a @ ht.array(x, split=x_split)
+                    self.assertEqual(res.shape, (self.dense.shape[0],))
+                    self.assertEqual(res.split, split)
+                    res = ht.resplit(res, None)._DNDarray__array
+                    self.assertTrue(torch.allclose(res, self.dense @ x))
+
+                res = a.matmul(ht.array(y, split=x_split))
+                self.assertEqual(res.shape, (self.dense.shape[0], 3))
+                res = ht.resplit(res, None)._DNDarray__array
+                self.assertTrue(torch.allclose(res, self.dense @ y))
+
+        with self.assertRaises(TypeError):
+            a @ x
+        with self.assertRaises(ValueError):
+            a @ ht.ones(self.dense.shape[0] + 1)
+
+    def test_elementwise(self):
+        b_dense = self.dense.t().flip(0).t().contiguous()
+        for split in [None, 0]:
+            a = ht.sparse.sparse_csr_matrix(self.dense, split=split)
+            b = ht.sparse.sparse_csr_matrix(b_dense, split=split)
+            for result, expected in [
+                (a + b, self.dense + b_dense),
+                (a - b, self.dense - b_dense),
+                (a * b, self.dense * b_dense),
+                (2 * a, 2 * self.dense),
+                (a * 2, 2 * self.dense),
+                (a / 2, self.dense / 2),
+                (-a, -self.dense),
+                (abs(-a), self.dense),
+            ]:
+                self.assertIsInstance(result, ht.sparse.DCSR_matrix)
+                self.assertEqual(result.split, split)
+                dense = ht.resplit(result.todense(), None)._DNDarray__array
+                self.assertTrue(torch.allclose(dense, expected))
+
+            with self.assertRaises(TypeError):
+                a + 1
+            with self.assertRaises(ValueError):
+                a + ht.sparse.sparse_csr_matrix(self.dense[:, :-1], split=split)
+
+    def test_sum(self):
+        for split in [None, 0]:
+            a = ht.sparse.sparse_csr_matrix(self.dense, split=split)
+            res = a.sum()
+            self.assertEqual(res.shape, ())
+            self.assertAlmostEqual(res.item(), self.dense.sum().item(), places=3)
+
+            res = a.sum(axis=0)
+            self.assertIsNone(res.split)
+            self.assertTrue(torch.allclose(res._DNDarray__array, self.dense.sum(dim=0)))
+
+            res = a.sum(axis=1)
+            self.assertEqual(res.split, split)
+            res = ht.resplit(res, None)._DNDarray__array
+            self.assertTrue(torch.allclose(res, self.dense.sum(dim=1)))
+
+            with self.assertRaises(ValueError):
+                a.sum(axis=2)
+
+    def test_solver(self):
+        size = ht.communication.MPI_WORLD.size
+        n = size * 6
+        # 1D Poisson matrix
+        laplace = 2 * torch.eye(n) - torch.eye(n).roll(1, 0) - torch.eye(n).roll(-1, 0)
+        laplace[0, -1] = laplace[-1, 0] = 0
+        A = ht.sparse.sparse_csr_matrix(laplace, split=0)
+        b = ht.ones(n, split=0)
+
+        x = ht.cg(A, b, ht.zeros(n, split=0), tol=1e-6)
+        self.assertTrue(ht.allclose(A @ x, b, atol=1e-3))
+
+        eigenvalues, _ = ht.linalg.thick_restart_lanczos(A, 2, m=n - 1, largest=True)
+        expected = torch.symeig(laplace)[0].flip(0)[:2]
+        self.assertTrue(torch.allclose(eigenvalues._DNDarray__array, expected, atol=1e-3))
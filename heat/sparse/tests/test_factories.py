@@ -0,0 +1,94 @@
+import os
+import tempfile
+
+import numpy as np
+import torch
+
+import heat as ht
+
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+class TestFactories(TestCase):
+    def test_sparse_csr_matrix(self):
+        size = ht.communication.MPI_WORLD.size
+        rank = ht.communication.MPI_WORLD.rank
+        dense = torch.eye(size * 4, 4)
+
+        for split in [None, 0]:
+            # dense and sparse torch tensors
+            for obj in [dense, dense.to_sparse()]:
+                a = ht.sparse.sparse_csr_matrix(obj, split=split)
+                self.assertEqual(a.shape, (size * 4, 4))
+                self.assertEqual(a.split, split)
+                self.assertEqual(a.nnz, 4)
+                self.assertTrue(torch.equal(ht.resplit(a.todense(), None)._DNDarray__array, dense))
+
+        # the split of DNDarrays is kept, a split along the columns is redistributed
+        self.assertIsNone(ht.sparse.sparse_csr_matrix(ht.array(dense)).split)
+        for split in [0, 1]:
+            a = ht.sparse.sparse_csr_matrix(ht.array(dense, split=split), dtype=ht.float64)
+            self.assertEqual(a.split, 0)
+            self.assertEqual(a.dtype, ht.float64)
+
+        # local rows
+        a = ht.sparse.sparse_csr_matrix(torch.full((2, 3), float(rank)), is_split=0)
+        self.assertEqual(a.shape, (size * 2, 3))
+        self.assertEqual(a.lshape, (2, 3))
+        self.assertEqual(a.nnz, (size - 1) * 6)
+
+        a = ht.sparse.sparse_csr_matrix([[0, 1], [2, 0]])
+        self.assertEqual(a.dtype, ht.int64)
+        self.assertEqual(a.nnz, 2)
+
+        with self.assertRaises(ValueError):
+            ht.sparse.sparse_csr_matrix(dense, split=0, is_split=0)
+        with self.assertRaises(ValueError):
+            ht.sparse.sparse_csr_matrix(dense, split=1)
+        with self.assertRaises(ValueError):
+            ht.sparse.sparse_csr_matrix(ht.array(dense), is_split=0)
+        with self.assertRaises(ValueError):
+            ht.sparse.sparse_csr_matrix(torch.ones(3))
+        with self.assertRaises(ValueError):
+            ht.sparse.sparse_csr_matrix(ht.ones(3))
+
+    def test_load_hdf5(self):
+        if not ht.io.supports_hdf5():
+            return
+
+        import h5py
+
+        path = os.path.join(tempfile.gettempdir(), "test_sparse.h5")
+        rng = np.random.RandomState(7)
+        dense = rng.rand(ht.MPI_WORLD.size * 4 + 1, 5)
+        dense[dense < 0.6] = 0
+        if ht.MPI_WORLD.rank == 0:
+            rows, cols = np.nonzero(dense)
+            with h5py.File(path, "w") as handle:
+                group = handle.create_group("matrix")
+                group.attrs["shape"] = dense.shape
+                group["data"] = dense[rows, cols]
+                group["indices"] = cols
+                indptr = np.bincount(rows, minlength=dense.shape[0]).cumsum()
+                group["indptr"] = np.concatenate(([0], indptr))
+        ht.MPI_WORLD.Barrier()
+
+        for split in [None, 0]:
+            a = ht.sparse.load_hdf5(path, "matrix", dtype=ht.float64, split=split)
+            self.assertEqual(a.shape, dense.shape)
+            self.assertEqual(a.split, split)
+            self.assertEqual(a.dtype, ht.float64)
+            self.assertEqual(a.nnz, np.count_nonzero(dense))
+            res = ht.resplit(a.todense(), None)._DNDarray__array
+            self.assertTrue(np.allclose(res.cpu().numpy(), dense))
+
+        with self.assertRaises(TypeError):
+            ht.sparse.load_hdf5(1, "matrix")
+        with self.assertRaises(TypeError):
+            ht.sparse.load_hdf5(path, 1)
+        with self.assertRaises(ValueError):
+            ht.sparse.load_hdf5(path, "matrix", split=1)
+
+        ht.MPI_WORLD.Barrier()
+        if ht.MPI_WORLD.rank == 0:
+            os.remove(path)
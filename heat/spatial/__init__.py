@@ -1 +1,3 @@
 from .distance import *
+from .neighbors import *
+from .lsh import *
@@ -1,11 +1,13 @@
+import time
+
 import torch
 import numpy as np
-from mpi4py import MPI
 
+from ..core import dndarray
 from ..core import factories
 from ..core import types
 
-__all__ = ["cdist", "manhattan", "rbf"]
+__all__ = ["cdist", "manhattan", "pairwise_reduce", "rbf"]
 
 
 def _euclidian(x, y):
@@ -163,33 +165,34 @@ def _manhattan_fast(x, y):
     return d
 
 
-def cdist(X, Y=None, quadratic_expansion=False):
+def cdist(X, Y=None, quadratic_expansion=False, timings=None):
     if quadratic_expansion:
-        return _dist(X, Y, _euclidian_fast)
+        return _dist(X, Y, _euclidian_fast, timings)
     else:
-        return _dist(X, Y, _euclidian)
+        return _dist(X, Y, _euclidian, timings)
 
 
-def rbf(X, Y=None, sigma=1.0, quadratic_expansion=False):
+def rbf(X, Y=None, sigma=1.0, quadratic_expansion=False, timings=None):
     if quadratic_expansion:
-        return _dist(X, Y, lambda x, y: _gaussian_fast(x, y, sigma))
+        return _dist(X, Y, lambda x, y: _gaussian_fast(x, y, sigma), timings)
     else:
-        return _dist(X, Y, lambda x, y: _gaussian(x, y, sigma))
+        return _dist(X, Y, lambda x, y: _gaussian(x, y, sigma), timings)
 
 
-def manhattan(X, Y=None, expand=False):
+def manhattan(X, Y=None, expand=False, timings=None):
     if expand:
-        return _dist(X, Y, lambda x, y: _manhattan_fast(x, y))
+        return _dist(X, Y, lambda x, y: _manhattan_fast(x, y), timings)
     else:
-        return _dist(X, Y, lambda x, y: _manhattan(x, y))
+        return _dist(X, Y, lambda x, y: _manhattan(x, y), timings)
 
 
-def _dist(X, Y=None, metric=_euclidian):
+def _dist(X, Y=None, metric=_euclidian, timings=None):
     """
     Pairwise distance caclualation between all elements along axis 0 of X and Y
     X.split and Y.split can be distributed among axis 0
     The distance matrix is calculated tile-wise with ring communication between the processes
-    holding each a piece of X and/or Y.
+    holding each a piece of X and/or Y. The tile of the next iteration is exchanged with
+    non-blocking communication while the current tile is calculated.
 
     Parameters
     ----------
@@ -201,6 +204,10 @@ def _dist(X, Y=None, metric=_euclidian):
     metric: function
         the distance to be calculated between X and Y
         if metric requires additional arguments, it must be handed over as a lambda function: lambda x, y: metric(x, y, **args)
+    timings: list, optional
+        if given, one dict per iteration of the ring exchange is appended with the keys "iteration",
+        "compute" (seconds spent calculating tiles) and "wait" (seconds spent waiting for
+        communication that was not hidden behind the calculation)
 
     Returns
     -------
@@ -216,131 +223,22 @@ def _dist(X, Y=None, metric=_euclidian):
         raise NotImplementedError("Only 2D data matrices are currently supported")
 
     if Y is None:
-        if X.dtype == types.float32:
-            torch_type = torch.float32
-            mpi_type = MPI.FLOAT
-        elif X.dtype == types.float64:
-            torch_type = torch.float64
-            mpi_type = MPI.DOUBLE
-        else:
+        if X.dtype not in (types.float32, types.float64):
             promoted_type = types.promote_types(X.dtype, types.float32)
-            X = X.astype(promoted_type)
-            if promoted_type == types.float32:
-                torch_type = torch.float32
-                mpi_type = MPI.FLOAT
-            elif promoted_type == types.float64:
-                torch_type = torch.float64
-                mpi_type = MPI.DOUBLE
-            else:
+            if promoted_type not in (types.float32, types.float64):
                 raise NotImplementedError(
                     "Datatype {} currently not supported as input".format(X.dtype)
                 )
-
-        d = factories.zeros(
-            (X.shape[0], X.shape[0]), dtype=X.dtype, split=X.split, device=X.device, comm=X.comm
-        )
+            X = X.astype(promoted_type)
 
         if X.split is None:
+            d = factories.zeros(
+                (X.shape[0], X.shape[0]), dtype=X.dtype, split=None, device=X.device, comm=X.comm
+            )
             d._DNDarray__array = metric(X._DNDarray__array, X._DNDarray__array)
 
         elif X.split == 0:
-            comm = X.comm
-            rank = comm.Get_rank()
-            size = comm.Get_size()
-            K, f = X.shape
-
-            counts, displ, _ = comm.counts_displs_shape(X.shape, X.split)
-            num_iter = (size + 1) // 2
-
-            stationary = X._DNDarray__array
-            rows = (displ[rank], displ[rank + 1] if (rank + 1) != size else K)
-
-            # 0th iteration, calculate diagonal
-            d_ij = metric(stationary, stationary)
-            d._DNDarray__array[:, rows[0] : rows[1]] = d_ij
-            for iter in range(1, num_iter):
-                # Send rank's part of the matrix to the next process in a circular fashion
-                receiver = (rank + iter) % size
-                sender = (rank - iter) % size
-
-                col1 = displ[sender]
-                col2 = displ[sender + 1] if sender != size - 1 else K
-                columns = (col1, col2)
-                # All but the first iter processes are receiving, then sending
-                if (rank // iter) != 0:
-                    stat = MPI.Status()
-                    comm.handle.Probe(source=sender, tag=iter, status=stat)
-                    count = int(stat.Get_count(mpi_type) / f)
-                    moving = torch.zeros((count, f), dtype=torch_type, device=X.device.torch_device)
-                    comm.Recv(moving, source=sender, tag=iter)
-                # Sending to next Process
-                comm.Send(stationary, dest=receiver, tag=iter)
-                # The first iter processes can now receive after sending
-                if (rank // iter) == 0:
-                    stat = MPI.Status()
-                    comm.handle.Probe(source=sender, tag=iter, status=stat)
-                    count = int(stat.Get_count(mpi_type) / f)
-                    moving = torch.zeros((count, f), dtype=torch_type, device=X.device.torch_device)
-                    comm.Recv(moving, source=sender, tag=iter)
-
-                d_ij = metric(stationary, moving)
-                d._DNDarray__array[:, columns[0] : columns[1]] = d_ij
-
-                # Receive calculated tile
-                scol1 = displ[receiver]
-                scol2 = displ[receiver + 1] if receiver != size - 1 else K
-                scolumns = (scol1, scol2)
-                symmetric = torch.zeros(
-                    scolumns[1] - scolumns[0],
-                    (rows[1] - rows[0]),
-                    dtype=torch_type,
-                    device=X.device.torch_device,
-                )
-                if (rank // iter) != 0:
-                    comm.Recv(symmetric, source=receiver, tag=iter)
-
-                # sending result back to sender of moving matrix (for symmetry)
-                comm.Send(d_ij, dest=sender, tag=iter)
-                if (rank // iter) == 0:
-                    comm.Recv(symmetric, source=receiver, tag=iter)
-                d._DNDarray__array[:, scolumns[0] : scolumns[1]] = symmetric.transpose(0, 1)
-
-            if (size + 1) % 2 != 0:  # we need one mor iteration for the first n/2 processes
-                receiver = (rank + num_iter) % size
-                sender = (rank - num_iter) % size
-                # Case 1: only receiving
-                if rank < (size // 2):
-                    stat = MPI.Status()
-                    comm.handle.Probe(source=sender, tag=num_iter, status=stat)
-                    count = int(stat.Get_count(mpi_type) / f)
-                    moving = torch.zeros((count, f), dtype=torch_type, device=X.device.torch_device)
-                    comm.Recv(moving, source=sender, tag=num_iter)
-
-                    col1 = displ[sender]
-                    col2 = displ[sender + 1] if sender != size - 1 else K
-                    columns = (col1, col2)
-
-                    d_ij = metric(stationary, moving)
-                    d._DNDarray__array[:, columns[0] : columns[1]] = d_ij
-
-                    # sending result back to sender of moving matrix (for symmetry)
-                    comm.Send(d_ij, dest=sender, tag=num_iter)
-
-                # Case 2 : only sending processes
-                else:
-                    comm.Send(stationary, dest=receiver, tag=num_iter)
-
-                    # Receiving back result
-                    scol1 = displ[receiver]
-                    scol2 = displ[receiver + 1] if receiver != size - 1 else K
-                    scolumns = (scol1, scol2)
-                    symmetric = torch.zeros(
-                        (scolumns[1] - scolumns[0], rows[1] - rows[0]),
-                        dtype=torch_type,
-                        device=X.device.torch_device,
-                    )
-                    comm.Recv(symmetric, source=receiver, tag=num_iter)
-                    d._DNDarray__array[:, scolumns[0] : scolumns[1]] = symmetric.transpose(0, 1)
+            d = _symmetric_ring(X, metric, timings)
 
         else:
             raise NotImplementedError(
@@ -383,93 +281,343 @@ def _dist(X, Y=None, metric=_euclidian):
 
         promoted_type = types.promote_types(X.dtype, Y.dtype)
         promoted_type = types.promote_types(promoted_type, types.float32)
+        if promoted_type not in (types.float32, types.float64):
+            raise NotImplementedError(
+                "Datatype {} currently not supported as input".format(X.dtype)
+            )
         X = X.astype(promoted_type)
         Y = Y.astype(promoted_type)
-        if promoted_type == types.float32:
-            torch_type = torch.float32
-            mpi_type = MPI.FLOAT
-        elif promoted_type == types.float64:
-            torch_type = torch.float64
-            mpi_type = MPI.DOUBLE
+
+        if X.split == 0 and Y.split == 0:
+            if X.shape[1] != Y.shape[1]:
+                raise ValueError("Inputs must have same shape[1]")
+            d = _ring(X, Y, metric, timings)
+
         else:
-            raise NotImplementedError(
-                "Datatype {} currently not supported as input".format(X.dtype)
+            d = factories.zeros(
+                (X.shape[0], Y.shape[0]),
+                dtype=promoted_type,
+                split=split,
+                device=X.device,
+                comm=X.comm,
             )
+            d._DNDarray__array = metric(X._DNDarray__array, Y._DNDarray__array)
+
+    return d
 
-        d = factories.zeros(
-            (X.shape[0], Y.shape[0]), dtype=promoted_type, split=split, device=X.device, comm=X.comm
+
+def _ring(X, Y, metric, timings):
+    """
+    Distance matrix of X and Y, both split along axis 0. In iteration i every process sends its
+    piece of Y to the process i ranks ahead and calculates the tile of the piece received from the
+    process i ranks behind. The exchange of iteration i + 1 is posted before the tile of iteration
+    i is calculated.
+    """
+    comm = X.comm
+    rank, size = comm.rank, comm.size
+    x_ = X._DNDarray__array
+    # the communication buffers must not be views with a storage offset
+    stationary = Y._DNDarray__array.clone()
+    ycounts = Y.create_lshape_map()[:, 0].tolist()
+    ydispl = [sum(ycounts[:i]) for i in range(size)]
+
+    def post(iteration):
+        sender = (rank - iteration) % size
+        moving = torch.empty(
+            (ycounts[sender], Y.shape[1]), dtype=stationary.dtype, device=stationary.device
         )
+        requests = [
+            comm.Irecv(moving, source=sender, tag=iteration),
+            comm.Isend(stationary, dest=(rank + iteration) % size, tag=iteration),
+        ]
+        return sender, moving, requests
+
+    d_local = torch.empty((x_.shape[0], Y.shape[0]), dtype=x_.dtype, device=x_.device)
+    pending = post(1) if size > 1 else None
+    # 0th iteration, calculate diagonal
+    start = time.perf_counter()
+    d_local[:, ydispl[rank] : ydispl[rank] + ycounts[rank]] = metric(x_, stationary)
+    _record(timings, 0, time.perf_counter() - start, 0.0)
+
+    for iteration in range(1, size):
+        start = time.perf_counter()
+        sender, moving, requests = pending
+        for request in requests:
+            request.wait()
+        waited = time.perf_counter() - start
+        if iteration + 1 < size:
+            pending = post(iteration + 1)
+
+        start = time.perf_counter()
+        d_local[:, ydispl[sender] : ydispl[sender] + ycounts[sender]] = metric(x_, moving)
+        _record(timings, iteration, time.perf_counter() - start, waited)
+
+    return dndarray.DNDarray(d_local, (X.shape[0], Y.shape[0]), X.dtype, 0, X.device, comm)
+
+
+def _symmetric_ring(X, metric, timings):
+    """
+    Distance matrix of X with itself, X split along axis 0. Only the tiles of one triangle are
+    calculated: in iteration i every process receives the piece of X of the process i ranks behind,
+    calculates the tile and returns it, so that the sender can fill in the transposed tile. For an
+    even number of processes, the last iteration is only performed by the first half of them. The
+    exchange of iteration i + 1 is posted before the tile of iteration i is calculated, returned
+    tiles are collected one iteration later.
+    """
+    comm = X.comm
+    rank, size = comm.rank, comm.size
+    # the communication buffers must not be views with a storage offset
+    stationary = X._DNDarray__array.clone()
+    counts = X.create_lshape_map()[:, 0].tolist()
+    displ = [sum(counts[:i]) for i in range(size)]
+    num_iter = size // 2
+
+    def receives(iteration):
+        return iteration < (size + 1) // 2 or rank < size // 2
+
+    def sends(iteration):
+        return iteration < (size + 1) // 2 or rank >= size // 2
+
+    def post(iteration):
+        sender, moving, requests = (rank - iteration) % size, None, []
+        if receives(iteration):
+            moving = torch.empty(
+                (counts[sender], X.shape[1]), dtype=stationary.dtype, device=stationary.device
+            )
+            requests.append(comm.Irecv(moving, source=sender, tag=iteration))
+        if sends(iteration):
+            requests.append(comm.Isend(stationary, dest=(rank + iteration) % size, tag=iteration))
+        return sender, moving, requests
+
+    def collect(returned):
+        receiver, symmetric, requests, _ = returned
+        for request in requests:
+            request.wait()
+        if symmetric is not None:
+            d_local[:, displ[receiver] : displ[receiver] + counts[receiver]] = symmetric.t()
+
+    d_local = torch.empty(
+        (counts[rank], X.shape[0]), dtype=stationary.dtype, device=stationary.device
+    )
+    pending = post(1) if num_iter > 0 else None
+    # 0th iteration, calculate diagonal
+    start = time.perf_counter()
+    d_local[:, displ[rank] : displ[rank] + counts[rank]] = metric(stationary, stationary)
+    _record(timings, 0, time.perf_counter() - start, 0.0)
+
+    returned = None
+    for iteration in range(1, num_iter + 1):
+        start = time.perf_counter()
+        sender, moving, requests = pending
+        for request in requests:
+            request.wait()
+        waited = time.perf_counter() - start
+        if iteration < num_iter:
+            pending = post(iteration + 1)
+
+        start = time.perf_counter()
+        requests, d_ij, symmetric, receiver = [], None, None, (rank + iteration) % size
+        if moving is not None:
+            d_ij = metric(stationary, moving)
+            d_local[:, displ[sender] : displ[sender] + counts[sender]] = d_ij
+            # return the tile to the sender of moving (for symmetry)
+            requests.append(comm.Isend(d_ij, dest=sender, tag=size + iteration))
+        if sends(iteration):
+            symmetric = torch.empty(
+                (counts[receiver], counts[rank]), dtype=stationary.dtype, device=stationary.device
+            )
+            requests.append(comm.Irecv(symmetric, source=receiver, tag=size + iteration))
+        computed = time.perf_counter() - start
 
-        if X.split is None:
-            d._DNDarray__array = metric(X._DNDarray__array, Y._DNDarray__array)
+        # the tile returned in the previous iteration had the calculation time to arrive
+        if returned is not None:
+            start = time.perf_counter()
+            collect(returned)
+            waited += time.perf_counter() - start
+        # d_ij is kept alive until its return has completed
+        returned = (receiver, symmetric, requests, d_ij)
+        _record(timings, iteration, computed, waited)
 
-        elif X.split == 0:
-            if Y.split is None:
-                d._DNDarray__array = metric(X._DNDarray__array, Y._DNDarray__array)
+    if returned is not None:
+        start = time.perf_counter()
+        collect(returned)
+        if timings is not None:
+            timings[-1]["wait"] += time.perf_counter() - start
 
-            elif Y.split == 0:
-                if X.shape[1] != Y.shape[1]:
-                    raise ValueError("Inputs must have same shape[1]")
-
-                comm = X.comm
-                rank = comm.Get_rank()
-                size = comm.Get_size()
-
-                m, f = X.shape
-                n = Y.shape[0]
-
-                xcounts, xdispl, _ = X.comm.counts_displs_shape(X.shape, X.split)
-                ycounts, ydispl, _ = Y.comm.counts_displs_shape(Y.shape, Y.split)
-                num_iter = size
-
-                x_ = X._DNDarray__array
-                stationary = Y._DNDarray__array
-                # rows = (xdispl[rank], xdispl[rank + 1] if (rank + 1) != size else m)
-                cols = (ydispl[rank], ydispl[rank + 1] if (rank + 1) != size else n)
-
-                # 0th iteration, calculate diagonal
-                d_ij = metric(x_, stationary)
-                d._DNDarray__array[:, cols[0] : cols[1]] = d_ij
-
-                for iter in range(1, num_iter):
-                    # Send rank's part of the matrix to the next process in a circular fashion
-                    receiver = (rank + iter) % size
-                    sender = (rank - iter) % size
-
-                    col1 = ydispl[sender]
-                    col2 = ydispl[sender + 1] if sender != size - 1 else n
-                    columns = (col1, col2)
-
-                    # All but the first iter processes are receiving, then sending
-                    if (rank // iter) != 0:
-                        stat = MPI.Status()
-                        Y.comm.handle.Probe(source=sender, tag=iter, status=stat)
-                        count = int(stat.Get_count(mpi_type) / f)
-                        moving = torch.zeros(
-                            (count, f), dtype=torch_type, device=X.device.torch_device
-                        )
-                        Y.comm.Recv(moving, source=sender, tag=iter)
-
-                    # Sending to next Process
-                    Y.comm.Send(stationary, dest=receiver, tag=iter)
-
-                    # The first iter processes can now receive after sending
-                    if (rank // iter) == 0:
-                        stat = MPI.Status()
-                        Y.comm.handle.Probe(source=sender, tag=iter, status=stat)
-                        count = int(stat.Get_count(mpi_type) / f)
-                        moving = torch.zeros(
-                            (count, f), dtype=torch_type, device=X.device.torch_device
-                        )
-                        Y.comm.Recv(moving, source=sender, tag=iter)
-
-                    d_ij = metric(x_, moving)
-                    d._DNDarray__array[:, columns[0] : columns[1]] = d_ij
+    return dndarray.DNDarray(d_local, (X.shape[0], X.shape[0]), X.dtype, 0, X.device, comm)
 
-            else:
-                raise NotImplementedError(
-                    "Input splits were X.split = {}, Y.split = {}. Splittings other than 0 or None currently not supported.".format(
-                        X.split, Y.split
-                    )
+
+def _record(timings, iteration, compute, wait):
+    """
+    Appends the timings of an iteration of the ring exchange, if requested.
+    """
+    if timings is not None:
+        timings.append({"iteration": iteration, "compute": compute, "wait": wait})
+
+
+_METRICS = {"euclidean": _euclidian, "sqeuclidean": _quadratic_expand, "manhattan": _manhattan}
+
+
+def pairwise_reduce(X, Y, metric="euclidean", reduction="argmin", k=1, block_size=None):
+    """
+    Pairwise distances between all elements along axis 0 of X and Y, reduced along Y on the fly.
+    The full distance matrix is never materialized: tiles of Y are streamed through a ring of the
+    processes holding each a piece of Y, only the running reduction is kept for the local elements
+    of X.
+
+    Parameters
+    ----------
+    X : ht.DNDarray
+        2D array of size m x f, X.split can be None or 0
+    Y : ht.DNDarray
+        2D array of size n x f, Y.split can be None or 0
+    metric : str or function, optional
+        one of "euclidean", "sqeuclidean" or "manhattan", or a function computing the distance
+        matrix of two 2D torch tensors, default: "euclidean"
+    reduction : str, optional
+        reduction along Y, default: "argmin"
+            - "argmin": index of the closest element of Y \n
+            - "min": distance to the closest element of Y \n
+            - "topk": distances and indices of the k closest elements of Y, sorted \n
+            - "sum": sum of the distances to all elements of Y
+    k : int, optional
+        number of neighbours for the "topk" reduction, default: 1
+    block_size : int, optional
+        number of elements of Y per tile, by default a tile of the distance matrix holds at most
+        2**24 entries
+
+    Returns
+    -------
+    ht.DNDarray or tuple of ht.DNDarray
+        array of size m (m x k for "topk", returned as tuple of distances and indices), split like X
+
+    Examples
+    --------
+    >>> X = ht.array([[0.0, 0.0], [4.0, 4.0]], split=0)
+    >>> Y = ht.array([[1.0, 1.0], [5.0, 5.0], [0.0, 1.0]], split=0)
+    >>> ht.spatial.pairwise_reduce(X, Y, reduction="argmin")
+    tensor([2, 1])
+    >>> ht.spatial.pairwise_reduce(X, Y, metric="manhattan", reduction="topk", k=2)
+    (tensor([[1., 2.],
+            [2., 6.]]), tensor([[2, 0],
+            [1, 0]]))
+    """
+    for name, arr in (("X", X), ("Y", Y)):
+        if not isinstance(arr, dndarray.DNDarray):
+            raise TypeError("{} must be a ht.DNDarray, but was {}".format(name, type(arr)))
+        if len(arr.shape) != 2:
+            raise NotImplementedError("Only 2D data matrices are currently supported")
+        if arr.split not in [None, 0]:
+            raise NotImplementedError(
+                "Input split was {}.split = {}. Splittings other than 0 or None currently not "
+                "supported.".format(name, arr.split)
+            )
+    if X.shape[1] != Y.shape[1]:
+        raise ValueError("Inputs must have same shape[1]")
+    if X.comm != Y.comm:
+        raise NotImplementedError("Differing communicators not supported")
+    if reduction not in ["argmin", "min", "topk", "sum"]:
+        raise ValueError(
+            'reduction must be one of "argmin", "min", "topk" or "sum", but was {}'.format(
+                reduction
+            )
+        )
+    if not isinstance(k, int) or not 1 <= k <= Y.shape[0]:
+        raise ValueError("k must be an int between 1 and {}, but was {}".format(Y.shape[0], k))
+    if isinstance(metric, str):
+        if metric not in _METRICS:
+            raise ValueError(
+                "metric must be one of {}, but was {}".format(list(_METRICS.keys()), metric)
+            )
+        metric = _METRICS[metric]
+    elif not callable(metric):
+        raise TypeError("metric must be a str or callable, but was {}".format(type(metric)))
+
+    promoted_type = types.promote_types(types.promote_types(X.dtype, Y.dtype), types.float32)
+    torch_type = promoted_type.torch_type()
+    comm = X.comm
+    distributed = Y.split == 0 and comm.size > 1
+
+    x = X._DNDarray__array
+    if X.split is None and distributed:
+        # the local elements of X are reduced against all of Y, the results are gathered
+        x = x[comm.chunk(X.shape, 0)[2]]
+    x = x.to(torch_type)
+    y = Y._DNDarray__array.to(torch_type)
+    if block_size is None:
+        block_size = max(1, 2 ** 24 // max(1, x.shape[0]))
+
+    state = _pairwise_state(x.shape[0], reduction, k, torch_type, x.device)
+    if not distributed:
+        _pairwise_tiles(x, y, 0, metric, reduction, state, block_size)
+    else:
+        rank, size = comm.rank, comm.size
+        counts = Y.create_lshape_map()[:, 0].tolist()
+        displs = [sum(counts[:i]) for i in range(size)]
+        # the communication buffers must not be views with a storage offset
+        moving, owner = y.clone(), rank
+        for step in range(size):
+            if step < size - 1:
+                # the next tile is exchanged while the current one is reduced
+                source = (owner - 1) % size
+                incoming = torch.empty(
+                    (counts[source], y.shape[1]), dtype=torch_type, device=y.device
                 )
-    return d
+                requests = [
+                    comm.Irecv(incoming, source=(rank - 1) % size, tag=step),
+                    comm.Isend(moving, dest=(rank + 1) % size, tag=step),
+                ]
+            _pairwise_tiles(x, moving, displs[owner], metric, reduction, state, block_size)
+            if step < size - 1:
+                for request in requests:
+                    request.wait()
+                moving, owner = incoming, source
+
+    is_split = 0 if X.split == 0 or distributed else None
+    results = [
+        factories.array(result, is_split=is_split, device=X.device, comm=comm) for result in state
+    ]
+    if X.split is None and distributed:
+        for result in results:
+            result.resplit_(None)
+
+    if reduction == "topk":
+        return tuple(results)
+    return results[1] if reduction == "argmin" else results[0]
+
+
+def _pairwise_state(m, reduction, k, torch_type, device):
+    """
+    Initial running reduction of m elements, a list of the values and, unless summing, indices.
+    """
+    if reduction == "sum":
+        return [torch.zeros(m, dtype=torch_type, device=device)]
+    shape = (m, k) if reduction == "topk" else (m,)
+    return [
+        torch.full(shape, float("inf"), dtype=torch_type, device=device),
+        torch.full(shape, -1, dtype=torch.int64, device=device),
+    ]
+
+
+def _pairwise_tiles(x, y, offset, metric, reduction, state, block_size):
+    """
+    Updates the running reduction state of the elements x with the elements y, whose global
+    indices start at offset, tile by tile.
+    """
+    for start in range(0, y.shape[0], block_size):
+        d = metric(x, y[start : start + block_size])
+        if reduction == "sum":
+            state[0] += d.sum(dim=1)
+        elif reduction == "topk":
+            indices = torch.arange(offset + start, offset + start + d.shape[1], device=d.device)
+            values = torch.cat((state[0], d), dim=1)
+            indices = torch.cat((state[1], indices.expand(d.shape[0], -1)), dim=1)
+            state[0], selection = torch.topk(values, state[0].shape[1], dim=1, largest=False)
+            state[1] = torch.gather(indices, 1, selection)
+        else:
+            values, indices = d.min(dim=1)
+            indices += offset + start
+            # ties are resolved to the lowest global index
+            update = (values < state[0]) | ((values == state[0]) & (indices < state[1]))
+            state[0] = torch.where(update, values, state[0])
+            state[1] = torch.where(update, indices, state[1])
@@ -0,0 +1,335 @@
+import torch
+from mpi4py import MPI
+
+from ..core import base
+from ..core import factories
+from ..core import manipulations
+from ..core import random
+from ..core import statistics
+from ..core import types
+from ..core._operations import _searchsorted
+from ..core.communication import _alltoallv, _exchange
+from .neighbors import _NORMS, _sanitize_samples
+
+__all__ = ["LSHIndex"]
+
+
+class LSHIndex(base.BaseEstimator):
+    """
+    Distributed index for approximate k-nearest-neighbour queries with locality-sensitive hashing.
+    Every hash table assigns a sample the signs of its projections onto n_bits random hyperplanes
+    through the mean of the samples. The buckets of all tables are distributed across the processes
+    by their hash, so that every bucket is held by exactly one process. Queries are sent to the
+    processes holding their buckets, answered there and merged on the process holding the query.
+
+    More tables increase the recall, more bits shrink the buckets and increase the throughput.
+    Probing the buckets of the least certain bits in addition recovers recall lost to more bits.
+    Every process stores n_tables copies of its share of the samples.
+
+    Parameters
+    ----------
+    n_neighbors : int, optional
+        Default number of neighbours returned by kneighbors, default: 5
+    n_tables : int, optional
+        Number of hash tables, default: 8
+    n_bits : int, optional
+        Number of hyperplanes per table, between 1 and 62, default: 12
+    n_probes : int, optional
+        Number of additional buckets probed per table, each differing from the bucket of the query
+        in one of its least certain bits, default: 0
+    metric : str, optional
+        "euclidean" or "manhattan", default: "euclidean"
+    batch_size : int, optional
+        Number of queries of every process answered at once, default: 1024
+
+    Attributes
+    ----------
+    n_samples_fit_ : int
+        Number of samples in the fitted data
+
+    Examples
+    --------
+    >>> X = ht.array([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0], [6.0, 5.0]], split=0)
+    >>> index = ht.spatial.LSHIndex(n_neighbors=2, n_tables=1, n_bits=1, n_probes=1).fit(X)
+    >>> distances, indices = index.kneighbors(ht.array([[0.2, 0.0], [5.0, 4.0]], split=0))
+    >>> indices
+    tensor([[0, 1],
+            [2, 3]])
+    """
+
+    def __init__(
+        self, n_neighbors=5, n_tables=8, n_bits=12, n_probes=0, metric="euclidean", batch_size=1024
+    ):
+        self.n_neighbors = n_neighbors
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+        self.metric = metric
+        self.batch_size = batch_size
+
+        # in-place properties
+        self._fit_X = None
+        self._center = None
+        self._planes = None
+        self._weights = None
+        self._distributed = False
+        self._codes = None
+        self._indices = None
+        self._points = None
+
+    @property
+    def n_samples_fit_(self):
+        """
+        Returns the number of samples in the fitted data.
+        """
+        return None if self._fit_X is None else self._fit_X.shape[0]
+
+    def fit(self, X):
+        """
+        Hashes the samples of X and distributes the buckets of all tables across the processes.
+
+        Parameters
+        ----------
+        X : ht.DNDarray
+            Samples of shape (n_samples, n_features), X.split can be None or 0
+
+        Returns
+        -------
+        self : LSHIndex
+        """
+        if not isinstance(self.n_tables, int) or self.n_tables < 1:
+            raise ValueError(
+                "n_tables needs to be a positive int, but was {}".format(self.n_tables)
+            )
+        if not isinstance(self.n_bits, int) or not 1 <= self.n_bits <= 62:
+            raise ValueError(
+                "n_bits needs to be an int between 1 and 62, but was {}".format(self.n_bits)
+            )
+        if not isinstance(self.n_probes, int) or not 0 <= self.n_probes <= self.n_bits:
+            raise ValueError(
+                "n_probes needs to be an int between 0 and n_bits, but was {}".format(self.n_probes)
+            )
+        if self.metric not in _NORMS:
+            raise ValueError(
+                'metric needs to be "euclidean" or "manhattan", but was {}'.format(self.metric)
+            )
+        if not isinstance(self.batch_size, int) or self.batch_size < 1:
+            raise ValueError(
+                "batch_size needs to be a positive int, but was {}".format(self.batch_size)
+            )
+        _sanitize_samples(X, "X")
+
+        self._fit_X = X
+        comm = X.comm
+        dtype = types.promote_types(X.dtype, types.float32)
+        points = X._DNDarray__array.to(dtype.torch_type())
+        device = points.device
+
+        # hyperplanes through the mean of the samples, identical on all processes
+        self._center = statistics.mean(X, axis=0)._DNDarray__array.to(dtype.torch_type())
+        self._planes = random.randn(
+            self.n_tables * self.n_bits, X.shape[1], dtype=dtype, device=X.device, comm=comm
+        )._DNDarray__array
+        self._weights = 2 ** torch.arange(self.n_bits, dtype=torch.int64, device=device)
+
+        self._distributed = X.split == 0 and comm.is_distributed()
+        offset = 0
+        if self._distributed:
+            offset = X.create_lshape_map()[: comm.rank, 0].sum().item()
+        indices = torch.arange(offset, offset + points.shape[0], device=device)
+
+        codes = self.__hash(points)[0]
+        self._codes, self._indices, self._points = [], [], []
+        for table in range(self.n_tables):
+            table_points, table_indices, table_codes = points, indices, codes[:, table]
+            if self._distributed:
+                owners = _owners(table_codes, table, comm.size)
+                (table_points, table_indices, table_codes), _, _, _ = _exchange(
+                    comm, owners, table_points, table_indices, table_codes
+                )
+            # the buckets are contiguous ranges of the samples sorted by their codes
+            order = table_codes.argsort()
+            self._codes.append(table_codes[order])
+            self._indices.append(table_indices[order])
+            self._points.append(table_points[order])
+
+        return self
+
+    def kneighbors(self, X, n_neighbors=None, return_distance=True):
+        """
+        Finds approximate k nearest neighbours of the samples in X among the fitted samples. Only
+        the samples sharing a probed bucket with a query in at least one table are considered.
+        Missing neighbours have the distance inf and the index -1.
+
+        Parameters
+        ----------
+        X : ht.DNDarray
+            Queries of shape (n_queries, n_features), X.split can be None or 0
+        n_neighbors : int, optional
+            Number of neighbours, default: the n_neighbors of the estimator
+        return_distance : bool, optional
+            Whether to return the distances next to the indices, default: True
+
+        Returns
+        -------
+        distances : ht.DNDarray
+            Sorted distances of shape (n_queries, n_neighbors), split like X, only if return_distance
+        indices : ht.DNDarray
+            Global indices of the neighbours in the fitted samples, shape (n_queries, n_neighbors)
+        """
+        if self._codes is None:
+            raise RuntimeError("the index needs to be fitted before querying it")
+        _sanitize_samples(X, "X")
+        if X.shape[1] != self._fit_X.shape[1]:
+            raise ValueError(
+                "X needs to have {} features, but has {}".format(self._fit_X.shape[1], X.shape[1])
+            )
+        k = self.n_neighbors if n_neighbors is None else n_neighbors
+        if not isinstance(k, int) or not 1 <= k <= self.n_samples_fit_:
+            raise ValueError(
+                "n_neighbors needs to be an int between 1 and {}, but was {}".format(
+                    self.n_samples_fit_, k
+                )
+            )
+        if X.comm != self._fit_X.comm:
+            raise NotImplementedError("Differing communicators not supported")
+
+        comm = X.comm
+        split = X.split
+        queries = X._DNDarray__array.to(self._center.dtype)
+        if self._distributed and split is None:
+            # every process answers its share of the replicated queries
+            _, _, slices = comm.chunk(X.shape, 0)
+            queries, split = queries[slices], 0
+
+        m, device = queries.shape[0], queries.device
+        distances = torch.empty((m, k), dtype=queries.dtype, device=device)
+        indices = torch.empty((m, k), dtype=torch.int64, device=device)
+        n_batches = (m + self.batch_size - 1) // self.batch_size
+        if self._distributed:
+            # the exchanges are collective, processes with fewer queries send empty batches
+            n_batches = comm.allreduce(n_batches, MPI.MAX)
+
+        probes = self.n_probes + 1
+        for start in range(0, n_batches * self.batch_size, self.batch_size):
+            batch = queries[start : start + self.batch_size]
+            codes, projections = self.__hash(batch)
+            if self.n_probes > 0:
+                # flipping the bits with the smallest projections yields the next likely buckets
+                flips = projections.abs().argsort(dim=2)[:, :, : self.n_probes]
+                probed = torch.bitwise_xor(codes.unsqueeze(2), self._weights[flips])
+                codes = torch.cat((codes.unsqueeze(2), probed), dim=2)
+            else:
+                codes = codes.unsqueeze(2)
+            rows = batch.repeat_interleave(probes, dim=0)
+
+            candidate_d, candidate_i = [], []
+            for table in range(self.n_tables):
+                table_codes = codes[:, table].flatten()
+                if self._distributed:
+                    owners = _owners(table_codes, table, comm.size)
+                    (received, received_codes), order, send_counts, recv_counts = _exchange(
+                        comm, owners, rows, table_codes
+                    )
+                    answer_d, answer_i = self.__probe(table, received, received_codes, k)
+                    # the answers arrive in the order the probes were sent
+                    answer_d = _alltoallv(comm, answer_d, recv_counts, send_counts)
+                    answer_i = _alltoallv(comm, answer_i, recv_counts, send_counts)
+                    found_d, found_i = torch.empty_like(answer_d), torch.empty_like(answer_i)
+                    found_d[order], found_i[order] = answer_d, answer_i
+                else:
+                    found_d, found_i = self.__probe(table, rows, table_codes, k)
+                candidate_d.append(found_d.reshape(batch.shape[0], probes * k))
+                candidate_i.append(found_i.reshape(batch.shape[0], probes * k))
+
+            end = start + batch.shape[0]
+            distances[start:end], indices[start:end] = _merge_candidates(
+                torch.cat(candidate_d, dim=1), torch.cat(candidate_i, dim=1), k
+            )
+
+        distances = factories.array(distances, is_split=split, device=X.device, comm=comm)
+        indices = factories.array(indices, is_split=split, device=X.device, comm=comm)
+        if split != X.split:
+            distances = manipulations.resplit(distances, X.split)
+            indices = manipulations.resplit(indices, X.split)
+        if not return_distance:
+            return indices
+        return distances, indices
+
+    def __hash(self, points):
+        """
+        Codes of the buckets of the points in every table, shape (n, n_tables), and the projections
+        of the points onto the hyperplanes, shape (n, n_tables, n_bits).
+        """
+        projections = torch.matmul(points - self._center, self._planes.t())
+        projections = projections.reshape(points.shape[0], self.n_tables, self.n_bits)
+        codes = ((projections > 0).long() * self._weights).sum(dim=2)
+        return codes, projections
+
+    def __probe(self, table, queries, codes, k):
+        """
+        Distances and global indices of the k nearest locally stored samples in the given bucket of
+        each query, padded with inf and -1.
+        """
+        stored = self._codes[table]
+        start = _searchsorted(stored, codes)
+        end = _searchsorted(stored, codes, right=True)
+        return _bucket_neighbors(
+            queries, start, end, self._points[table], self._indices[table], k, _NORMS[self.metric]
+        )
+
+
+def _bucket_neighbors(queries, start, end, points, indices, k, p):
+    """
+    Distances and indices of the k nearest of the samples in points[start:end] for each query,
+    padded with inf and -1.
+    """
+    m, device = queries.shape[0], queries.device
+    distances = torch.full((m, k), float("inf"), dtype=queries.dtype, device=device)
+    neighbors = torch.full((m, k), -1, dtype=torch.int64, device=device)
+    width = (end - start).max().item() if m > 0 else 0
+    if width == 0:
+        return distances, neighbors
+
+    # the pairwise differences are calculated in chunks of bounded memory
+    step = max(1, 2 ** 24 // (width * queries.shape[1]))
+    n = min(k, width)
+    for chunk in range(0, m, step):
+        rows = slice(chunk, chunk + step)
+        positions = start[rows].unsqueeze(1) + torch.arange(width, device=device)
+        valid = positions < end[rows].unsqueeze(1)
+        positions = positions.clamp(max=points.shape[0] - 1)
+        found = (queries[rows].unsqueeze(1) - points[positions]).norm(p=p, dim=2)
+        found.masked_fill_(~valid, float("inf"))
+        found, order = found.topk(n, dim=1, largest=False)
+        found_indices = indices[positions.gather(1, order)]
+        distances[rows, :n] = found
+        neighbors[rows, :n] = found_indices.masked_fill(found == float("inf"), -1)
+    return distances, neighbors
+
+
+def _merge_candidates(distances, indices, k):
+    """
+    Removes the neighbours found in several tables or buckets and selects the k nearest.
+    """
+    indices, order = indices.sort(dim=1)
+    distances = distances.gather(1, order)
+    duplicate = torch.zeros_like(indices, dtype=torch.bool)
+    duplicate[:, 1:] = indices[:, 1:] == indices[:, :-1]
+    distances = distances.masked_fill(duplicate | (indices < 0), float("inf"))
+    distances, order = distances.topk(k, dim=1, largest=False)
+    indices = indices.gather(1, order).masked_fill(distances == float("inf"), -1)
+    return distances, indices
+
+
+def _owners(codes, table, size):
+    """
+    Processes holding the buckets with the given codes of a table.
+    """
+    # multiplicative hashing, the high bits of the product are spread evenly
+    hashes = (codes * _GOLDEN + table) * _GOLDEN
+    return (hashes >> 32) % size
+
+
+# 0x9E3779B97F4A7C15 as a signed 64 bit integer, products wrap around
+_GOLDEN = -7046029254386353131
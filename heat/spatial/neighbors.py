@@ -0,0 +1,467 @@
+import torch
+from mpi4py import MPI
+
+from ..core import base
+from ..core import dndarray
+from ..core import factories
+from ..core import types
+from ..core.manipulations import MPI_TOPK
+
+__all__ = ["NearestNeighbors"]
+
+
+class NearestNeighbors(base.BaseEstimator):
+    """
+    Distributed index for k-nearest-neighbour queries. During fit, every process builds a tree over its
+    local samples, a KD-tree of axis-aligned bounding boxes or a ball tree of bounding spheres. Queries
+    are broadcast in batches by the process holding them, answered by every process with its local
+    tree and merged with a distributed top-k. The process holding a query answers it first, processes
+    whose bounding box is farther away than its k-th neighbour skip the query.
+
+    Parameters
+    ----------
+    n_neighbors : int, optional
+        Default number of neighbours returned by kneighbors, default: 5
+    algorithm : str, optional
+        "kd_tree", "ball_tree" or "brute", default: "kd_tree"
+    leaf_size : int, optional
+        Maximum number of samples per leaf of the local trees, default: 40
+    metric : str, optional
+        "euclidean" or "manhattan", default: "euclidean"
+    batch_size : int, optional
+        Number of queries broadcast at once, default: 1024
+
+    Attributes
+    ----------
+    n_samples_fit_ : int
+        Number of samples in the fitted data
+
+    Examples
+    --------
+    >>> X = ht.array([[0.0, 0.0], [1.0, 0.0], [5.0, 5.0], [6.0, 5.0]], split=0)
+    >>> nn = ht.spatial.NearestNeighbors(n_neighbors=2).fit(X)
+    >>> distances, indices = nn.kneighbors(ht.array([[0.2, 0.0], [5.0, 4.0]], split=0))
+    >>> distances
+    tensor([[0.2000, 0.8000],
+            [1.0000, 1.4142]])
+    >>> indices
+    tensor([[0, 1],
+            [2, 3]])
+    """
+
+    def __init__(
+        self, n_neighbors=5, algorithm="kd_tree", leaf_size=40, metric="euclidean", batch_size=1024
+    ):
+        self.n_neighbors = n_neighbors
+        self.algorithm = algorithm
+        self.leaf_size = leaf_size
+        self.metric = metric
+        self.batch_size = batch_size
+
+        # in-place properties
+        self._fit_X = None
+        self._tree = None
+        self._boxes = None
+        self._offset = None
+
+    @property
+    def n_samples_fit_(self):
+        """
+        Returns the number of samples in the fitted data.
+        """
+        return None if self._fit_X is None else self._fit_X.shape[0]
+
+    def fit(self, X):
+        """
+        Builds the local trees over the samples of X.
+
+        Parameters
+        ----------
+        X : ht.DNDarray
+            Samples of shape (n_samples, n_features), X.split can be None or 0
+
+        Returns
+        -------
+        self : NearestNeighbors
+        """
+        if self.algorithm not in ["kd_tree", "ball_tree", "brute"]:
+            raise ValueError(
+                'algorithm needs to be one of "kd_tree", "ball_tree" or "brute", but was {}'.format(
+                    self.algorithm
+                )
+            )
+        if self.metric not in _NORMS:
+            raise ValueError(
+                'metric needs to be "euclidean" or "manhattan", but was {}'.format(self.metric)
+            )
+        if not isinstance(self.leaf_size, int) or self.leaf_size < 1:
+            raise ValueError(
+                "leaf_size needs to be a positive int, but was {}".format(self.leaf_size)
+            )
+        if not isinstance(self.batch_size, int) or self.batch_size < 1:
+            raise ValueError(
+                "batch_size needs to be a positive int, but was {}".format(self.batch_size)
+            )
+        _sanitize_samples(X, "X")
+
+        self._fit_X = X
+        dtype = types.promote_types(X.dtype, types.float32).torch_type()
+        points = X._DNDarray__array.to(dtype)
+        leaf_size = points.shape[0] if self.algorithm == "brute" else self.leaf_size
+        self._tree = _Tree(points, leaf_size, self.algorithm == "ball_tree", _NORMS[self.metric])
+
+        self._offset, self._boxes = 0, None
+        if X.split == 0 and X.comm.is_distributed():
+            counts = X.create_lshape_map()[:, 0]
+            self._offset = counts[: X.comm.rank].sum().item()
+            # bounding boxes of all processes, empty processes get an empty box that is never searched
+            box = torch.full((2, X.shape[1]), float("inf"), dtype=dtype, device=points.device)
+            box[1] *= -1
+            if points.shape[0] > 0:
+                box[0], box[1] = points.min(dim=0)[0], points.max(dim=0)[0]
+            self._boxes = torch.empty(
+                (X.comm.size * 2, X.shape[1]), dtype=dtype, device=points.device
+            )
+            X.comm.Allgather(box, self._boxes)
+            self._boxes = self._boxes.reshape(X.comm.size, 2, X.shape[1])
+
+        return self
+
+    def kneighbors(self, X, n_neighbors=None, radius=None, return_distance=True):
+        """
+        Finds the k nearest neighbours of the samples in X among the fitted samples. Querying the fitted
+        samples themselves returns every sample as its own first neighbour.
+
+        Parameters
+        ----------
+        X : ht.DNDarray
+            Queries of shape (n_queries, n_features), X.split can be None or 0
+        n_neighbors : int, optional
+            Number of neighbours, default: the n_neighbors of the estimator
+        radius : float, optional
+            Only neighbours within radius are returned, missing neighbours have the distance inf and
+            the index -1. The radius is used to prune the search.
+        return_distance : bool, optional
+            Whether to return the distances next to the indices, default: True
+
+        Returns
+        -------
+        distances : ht.DNDarray
+            Sorted distances of shape (n_queries, n_neighbors), split like X, only if return_distance
+        indices : ht.DNDarray
+            Global indices of the neighbours in the fitted samples, shape (n_queries, n_neighbors)
+        """
+        if self._tree is None:
+            raise RuntimeError("the index needs to be fitted before querying it")
+        _sanitize_samples(X, "X")
+        if X.shape[1] != self._fit_X.shape[1]:
+            raise ValueError(
+                "X needs to have {} features, but has {}".format(self._fit_X.shape[1], X.shape[1])
+            )
+        k = self.n_neighbors if n_neighbors is None else n_neighbors
+        if not isinstance(k, int) or not 1 <= k <= self.n_samples_fit_:
+            raise ValueError(
+                "n_neighbors needs to be an int between 1 and {}, but was {}".format(
+                    self.n_samples_fit_, k
+                )
+            )
+        if X.comm != self._fit_X.comm:
+            raise NotImplementedError("Differing communicators not supported")
+
+        comm = X.comm
+        tree = self._tree
+        bound = float("inf") if radius is None else float(radius)
+        queries = X._DNDarray__array.to(tree.dtype)
+
+        if self._boxes is None:
+            # every process holds all fitted samples
+            distances, indices = tree.query(queries, k, torch.full_like(queries[:, 0], bound))
+        elif X.split is None:
+            # every process holds all queries, no broadcast required
+            bounds = torch.full_like(queries[:, 0], bound)
+            distances, indices = self.__search(queries, k, bounds)
+            self.__merge(distances, indices, root=None)
+        else:
+            counts = X.create_lshape_map()[:, 0].tolist()
+            distances = torch.empty((queries.shape[0], k), dtype=tree.dtype, device=queries.device)
+            indices = torch.empty((queries.shape[0], k), dtype=torch.int64, device=queries.device)
+            for owner in range(comm.size):
+                for start in range(0, counts[owner], self.batch_size):
+                    end = min(start + self.batch_size, counts[owner])
+                    batch = torch.empty(
+                        (end - start, X.shape[1] + 1), dtype=tree.dtype, device=queries.device
+                    )
+                    if comm.rank == owner:
+                        # the k-th local neighbour bounds the search of the other processes
+                        batch_d, batch_i = self.__search(
+                            queries[start:end], k, torch.full_like(batch[:, 0], bound), own=True
+                        )
+                        batch[:, :-1] = queries[start:end]
+                        batch[:, -1] = batch_d[:, -1].clamp(max=bound)
+                    comm.Bcast(batch, root=owner)
+                    if comm.rank != owner:
+                        batch_d, batch_i = self.__search(batch[:, :-1], k, batch[:, -1])
+                    self.__merge(batch_d, batch_i, root=owner)
+                    if comm.rank == owner:
+                        distances[start:end], indices[start:end] = batch_d, batch_i
+
+        if radius is not None:
+            outside = distances > bound
+            distances[outside] = float("inf")
+            indices[outside] = -1
+
+        indices = factories.array(indices, is_split=X.split, device=X.device, comm=comm)
+        if not return_distance:
+            return indices
+        distances = factories.array(distances, is_split=X.split, device=X.device, comm=comm)
+        return distances, indices
+
+    def __search(self, queries, k, bounds, own=False):
+        """
+        Answers the queries with the local tree. Queries farther away from the local bounding box than
+        their bound are skipped, unless they are answered by the process holding them.
+        """
+        distances = torch.full(
+            (queries.shape[0], k), float("inf"), dtype=queries.dtype, device=queries.device
+        )
+        indices = torch.full((queries.shape[0], k), -1, dtype=torch.int64, device=queries.device)
+        if own:
+            active = torch.ones(queries.shape[0], dtype=torch.bool, device=queries.device)
+        else:
+            box = self._boxes[self._fit_X.comm.rank]
+            lower, upper = box[0].expand_as(queries), box[1].expand_as(queries)
+            active = _box_distance(queries, lower, upper, self._tree.p) <= bounds
+        if active.any():
+            found_d, found_i = self._tree.query(queries[active], k, bounds[active])
+            distances[active], indices[active] = found_d, found_i + self._offset
+            indices[distances == float("inf")] = -1
+        return distances, indices
+
+    def __merge(self, distances, indices, root):
+        """
+        Merges the local neighbours of all processes in place with a distributed top-k, the result is
+        available on root, or on all processes if root is None.
+        """
+        comm = self._fit_X.comm
+        shape = list(distances.shape)
+        metadata = torch.tensor([shape[1], 1, False, True, 2, *shape], dtype=torch.float64)
+        packed = torch.cat(
+            (metadata, distances.double().flatten().cpu(), indices.double().flatten().cpu())
+        )
+        # the packed neighbours are a single element, MPI must not split them into segments
+        packed_type = MPI.DOUBLE.Create_contiguous(packed.numel()).Commit()
+        buffer = [comm.as_mpi_memory(packed), 1, packed_type]
+        if root is None:
+            comm.handle.Allreduce(MPI.IN_PLACE, buffer, MPI_TOPK)
+        elif comm.rank == root:
+            comm.handle.Reduce(MPI.IN_PLACE, buffer, MPI_TOPK, root=root)
+        else:
+            comm.handle.Reduce(buffer, None, MPI_TOPK, root=root)
+        packed_type.Free()
+        if root is None or comm.rank == root:
+            merged_d, merged_i = packed[metadata.numel() :].chunk(2)
+            distances.copy_(merged_d.reshape(shape))
+            indices.copy_(merged_i.reshape(shape))
+
+
+class _Tree:
+    """
+    Local search tree over the rows of points. Nodes are recursively split at the median of the
+    feature with the largest spread until they hold at most leaf_size samples, every node covers a
+    contiguous range of the permuted samples and is bounded by an axis-aligned box (KD-tree) or a
+    sphere (ball tree). All queries of a batch are processed together: a greedy descent bounds the
+    k-th neighbour, the tree is then expanded level by level keeping only (query, node) pairs whose
+    lower bound does not exceed it, and the samples of the remaining leaves are merged with a
+    segmented top-k.
+    """
+
+    def __init__(self, points, leaf_size, ball, p):
+        self.dtype = points.dtype
+        self.ball = ball
+        self.p = p
+
+        n = points.shape[0]
+        perm = torch.arange(n, device=points.device)
+        start, end, left, right = [0], [n], [-1], [-1]
+        node = 0
+        while node < len(start):
+            s, e = start[node], end[node]
+            if e - s > leaf_size:
+                values = points[perm[s:e]]
+                dim = (values.max(dim=0)[0] - values.min(dim=0)[0]).argmax()
+                perm[s:e] = perm[s:e][values[:, dim].argsort()]
+                middle = (s + e) // 2
+                left[node], right[node] = len(start), len(start) + 1
+                start.extend((s, middle))
+                end.extend((middle, e))
+                left.extend((-1, -1))
+                right.extend((-1, -1))
+            node += 1
+
+        self.index = perm
+        self.points = points[perm]
+        self.start = torch.tensor(start, device=points.device)
+        self.end = torch.tensor(end, device=points.device)
+        self.left = torch.tensor(left, device=points.device)
+        self.right = torch.tensor(right, device=points.device)
+        self.width = (self.end - self.start)[self.left < 0].max().item() if n > 0 else 0
+
+        # bounds of the nodes, children are always created after their parents
+        f = points.shape[1]
+        if ball:
+            cumulative = torch.cat(
+                (torch.zeros((1, f), dtype=self.dtype, device=points.device), self.points.cumsum(0))
+            )
+            counts = (self.end - self.start).clamp(min=1).unsqueeze(1).to(self.dtype)
+            self.centers = (cumulative[self.end] - cumulative[self.start]) / counts
+            self.radii = torch.zeros(len(start), dtype=self.dtype, device=points.device)
+            for node in range(len(start)):
+                if end[node] > start[node]:
+                    offsets = self.points[start[node] : end[node]] - self.centers[node]
+                    self.radii[node] = offsets.norm(p=p, dim=1).max()
+        else:
+            self.lower = torch.empty((len(start), f), dtype=self.dtype, device=points.device)
+            self.upper = torch.empty_like(self.lower)
+            for node in reversed(range(len(start))):
+                if left[node] < 0:
+                    values = self.points[start[node] : end[node]]
+                    self.lower[node] = values.min(dim=0)[0] if values.numel() else float("inf")
+                    self.upper[node] = values.max(dim=0)[0] if values.numel() else -float("inf")
+                else:
+                    children = [left[node], right[node]]
+                    self.lower[node] = self.lower[children].min(dim=0)[0]
+                    self.upper[node] = self.upper[children].max(dim=0)[0]
+
+    def bounds(self, queries, nodes):
+        """
+        Lower bounds of the distances between each query and the samples of its node.
+        """
+        if self.ball:
+            distance = (queries - self.centers[nodes]).norm(p=self.p, dim=1)
+            return (distance - self.radii[nodes]).clamp(min=0)
+        return _box_distance(queries, self.lower[nodes], self.upper[nodes], self.p)
+
+    def __proximity(self, queries, nodes):
+        """
+        Proximity of each query to its node guiding the greedy descent, overlapping spheres are
+        told apart by their centers.
+        """
+        if self.ball:
+            return (queries - self.centers[nodes]).norm(p=self.p, dim=1)
+        return self.bounds(queries, nodes)
+
+    def distances(self, queries, nodes):
+        """
+        Distances between each query and the samples of its node, padded with inf, and the local
+        indices of the samples, padded with -1.
+        """
+        width = (self.end[nodes] - self.start[nodes]).max().item() if nodes.numel() else 0
+        positions = self.start[nodes].unsqueeze(1) + torch.arange(width, device=nodes.device)
+        valid = positions < self.end[nodes].unsqueeze(1)
+        positions = positions.clamp(max=self.points.shape[0] - 1)
+        distances = torch.empty(positions.shape, dtype=self.dtype, device=nodes.device)
+        # the pairwise differences are calculated in chunks of bounded memory
+        step = max(1, 2 ** 24 // max(1, width * queries.shape[1]))
+        for chunk in range(0, nodes.numel(), step):
+            rows = slice(chunk, chunk + step)
+            differences = queries[rows].unsqueeze(1) - self.points[positions[rows]]
+            distances[rows] = differences.norm(p=self.p, dim=2)
+        distances.masked_fill_(~valid, float("inf"))
+        return distances, torch.where(valid, self.index[positions], torch.full_like(positions, -1))
+
+    def query(self, queries, k, bounds):
+        """
+        Local indices and distances of the k nearest samples of each query within its bound.
+        """
+        m, device = queries.shape[0], queries.device
+        distances = torch.full((m, k), float("inf"), dtype=self.dtype, device=device)
+        indices = torch.full((m, k), -1, dtype=torch.int64, device=device)
+        if self.points.shape[0] == 0 or m == 0:
+            return distances, indices
+
+        # greedy descent to the smallest node with at least k samples bounds the k-th neighbour
+        counts = self.end - self.start
+        nodes = torch.zeros(m, dtype=torch.int64, device=device)
+        while True:
+            left, right = self.left[nodes], self.right[nodes]
+            inner = left >= 0
+            if not inner.any():
+                break
+            closer = self.__proximity(queries, left.clamp(min=0)) <= self.__proximity(
+                queries, right.clamp(min=0)
+            )
+            child = torch.where(closer, left, right)
+            descend = inner & (counts[child.clamp(min=0)] >= k)
+            if not descend.any():
+                break
+            nodes = torch.where(descend, child, nodes)
+        greedy, _ = self.distances(queries, nodes)
+        if greedy.shape[1] >= k:
+            bounds = torch.min(bounds, greedy.topk(k, dim=1, largest=False)[0][:, -1])
+        # slack for the rounding of the bounds
+        bounds = bounds + bounds.abs() * 1e-4
+
+        # expansion of the tree, keeping the (query, node) pairs that can hold a neighbour
+        rows, nodes = (
+            torch.arange(m, device=device),
+            torch.zeros(m, dtype=torch.int64, device=device),
+        )
+        leaf_rows, leaf_nodes = [], []
+        while rows.numel() > 0:
+            keep = self.bounds(queries[rows], nodes) <= bounds[rows]
+            rows, nodes = rows[keep], nodes[keep]
+            leaf = self.left[nodes] < 0
+            leaf_rows.append(rows[leaf])
+            leaf_nodes.append(nodes[leaf])
+            rows, nodes = rows[~leaf].repeat(2), nodes[~leaf]
+            nodes = torch.cat((self.left[nodes], self.right[nodes]))
+        rows, nodes = torch.cat(leaf_rows), torch.cat(leaf_nodes)
+
+        # segmented top-k over the samples of the remaining leaves
+        candidates, candidate_indices = self.distances(queries[rows], nodes)
+        rows = rows.unsqueeze(1).expand_as(candidates).flatten()
+        candidates, candidate_indices = candidates.flatten(), candidate_indices.flatten()
+        valid = candidates <= bounds[rows]
+        rows, candidates = rows[valid], candidates[valid]
+        candidate_indices = candidate_indices[valid]
+        # group by rows in the order of the distances, the positions break ties between equal rows
+        order = candidates.argsort()
+        positions = torch.arange(order.numel(), device=device)
+        order = order[(rows[order] * order.numel() + positions).argsort()]
+        rows, candidates, candidate_indices = (
+            rows[order],
+            candidates[order],
+            candidate_indices[order],
+        )
+        offsets = torch.zeros(m + 1, dtype=torch.int64, device=device)
+        offsets[1:] = torch.bincount(rows, minlength=m).cumsum(0)
+        rank = torch.arange(rows.numel(), device=device) - offsets[rows]
+        selected = rank < k
+        distances[rows[selected], rank[selected]] = candidates[selected]
+        indices[rows[selected], rank[selected]] = candidate_indices[selected]
+        return distances, indices
+
+
+def _box_distance(queries, lower, upper, p):
+    """
+    Distances between each query and its axis-aligned box given by the lower and upper corners.
+    """
+    gap = (lower - queries).clamp(min=0) + (queries - upper).clamp(min=0)
+    return gap.norm(p=p, dim=1)
+
+
+def _sanitize_samples(X, name):
+    """
+    Checks that X is a 2D ht.DNDarray split along None or 0.
+    """
+    if not isinstance(X, dndarray.DNDarray):
+        raise TypeError("{} needs to be a ht.DNDarray, but was {}".format(name, type(X)))
+    if len(X.shape) != 2:
+        raise ValueError("{} needs to be 2D, but has the shape {}".format(name, X.shape))
+    if X.split not in [None, 0]:
+        raise NotImplementedError(
+            "{}.split needs to be None or 0, but was {}".format(name, X.split)
+        )
+
+
+_NORMS = {"euclidean": 2, "manhattan": 1}
@@ -261,3 +261,111 @@ class TestDistances(TestCase):
         d = ht.spatial.cdist(B, quadratic_expansion=False)
         result = ht.array(res, dtype=ht.float64, split=0)
         self.assertTrue(ht.allclose(d, result, atol=1e-8))
+
+    def test_cdist_ring(self):
+        n = ht.communication.MPI_WORLD.size
+        rank = ht.communication.MPI_WORLD.rank
+        rng = np.random.RandomState(7)
+        x_torch = torch.tensor(rng.rand(n * (n + 1) // 2, 3))
+        y_torch = torch.tensor(rng.rand(n * 2 + 1, 3))
+        # unbalanced distribution, rank r holds r + 1 rows
+        offset = rank * (rank + 1) // 2
+        X = ht.array(x_torch[offset : offset + rank + 1], is_split=0)
+        Y = ht.array(y_torch, split=0)
+
+        timings = []
+        d = ht.spatial.cdist(X, timings=timings)
+        self.assertEqual(d.split, 0)
+        self.assertEqual(d.lshape, (rank + 1, X.shape[0]))
+        expected = torch.cdist(x_torch[offset : offset + rank + 1], x_torch)
+        self.assertTrue(torch.allclose(d._DNDarray__array, expected))
+        self.assertEqual([t["iteration"] for t in timings], list(range(n // 2 + 1)))
+        for t in timings:
+            self.assertGreaterEqual(t["compute"], 0.0)
+            self.assertGreaterEqual(t["wait"], 0.0)
+
+        timings = []
+        d = ht.spatial.manhattan(X, Y, timings=timings)
+        self.assertEqual(d.split, 0)
+        expected = torch.cdist(x_torch[offset : offset + rank + 1], y_torch, p=1)
+        self.assertTrue(torch.allclose(d._DNDarray__array, expected))
+        self.assertEqual([t["iteration"] for t in timings], list(range(n)))
+
+        d = ht.spatial.rbf(Y, X, sigma=2.0, quadratic_expansion=True)
+        self.assertEqual(d.split, 0)
+        d = ht.resplit(d, None)._DNDarray__array
+        expected = torch.exp(-torch.cdist(y_torch, x_torch) ** 2 / 8.0)
+        self.assertTrue(torch.allclose(d, expected))
+
+    def test_pairwise_reduce(self):
+        n = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(42)
+        x_torch = torch.tensor(rng.rand(n * 5 + 1, 3))
+        y_torch = torch.tensor(rng.rand(n * 3 + 2, 3))
+        d_euclidean = torch.cdist(x_torch, y_torch)
+        d_manhattan = torch.cdist(x_torch, y_torch, p=1)
+        topk_values, topk_indices = torch.topk(d_euclidean, 3, dim=1, largest=False)
+
+        for x_split in [None, 0]:
+            for y_split in [None, 0]:
+                X = ht.array(x_torch, split=x_split)
+                Y = ht.array(y_torch, split=y_split)
+                for block_size in [None, 2]:
+                    idx = ht.spatial.pairwise_reduce(X, Y, block_size=block_size)
+                    self.assertEqual(idx.shape, (X.shape[0],))
+                    self.assertEqual(idx.split, x_split)
+                    self.assertEqual(idx.dtype, ht.int64)
+                    idx = ht.resplit(idx, None)._DNDarray__array
+                    self.assertTrue(torch.equal(idx, d_euclidean.argmin(dim=1)))
+
+                    d = ht.spatial.pairwise_reduce(
+                        X, Y, "manhattan", reduction="min", block_size=block_size
+                    )
+                    self.assertEqual(d.split, x_split)
+                    d = ht.resplit(d, None)._DNDarray__array
+                    self.assertTrue(torch.allclose(d, d_manhattan.min(dim=1)[0]))
+
+                    d = ht.spatial.pairwise_reduce(X, Y, reduction="sum", block_size=block_size)
+                    d = ht.resplit(d, None)._DNDarray__array
+                    self.assertTrue(torch.allclose(d, d_euclidean.sum(dim=1)))
+
+                    values, indices = ht.spatial.pairwise_reduce(
+                        X, Y, reduction="topk", k=3, block_size=block_size
+                    )
+                    self.assertEqual(values.shape, (X.shape[0], 3))
+                    self.assertEqual(indices.split, x_split)
+                    values = ht.resplit(values, None)._DNDarray__array
+                    indices = ht.resplit(indices, None)._DNDarray__array
+                    self.assertTrue(torch.allclose(values, topk_values))
+                    self.assertTrue(torch.equal(indices, topk_indices))
+
+        # custom metrics on torch tensors and type promotion
+        X = ht.array(x_torch, split=0)
+        Y = ht.array(y_torch, split=0)
+        d = ht.spatial.pairwise_reduce(
+            X, Y.astype(ht.float32), lambda x, y: torch.cdist(x, y) ** 2, reduction="min"
+        )
+        self.assertEqual(d.dtype, ht.float64)
+        d = ht.resplit(d, None)._DNDarray__array
+        self.assertTrue(torch.allclose(d, (d_euclidean ** 2).min(dim=1)[0]))
+        d = ht.spatial.pairwise_reduce(
+            ht.ones((4, 2), dtype=ht.int32), ht.ones((2, 2)), reduction="min"
+        )
+        self.assertEqual(d.dtype, ht.float32)
+
+        with self.assertRaises(TypeError):
+            ht.spatial.pairwise_reduce(x_torch, Y)
+        with self.assertRaises(TypeError):
+            ht.spatial.pairwise_reduce(X, Y, metric=2)
+        with self.assertRaises(ValueError):
+            ht.spatial.pairwise_reduce(X, Y, metric="cosine")
+        with self.assertRaises(ValueError):
+            ht.spatial.pairwise_reduce(X, Y, reduction="max")
+        with self.assertRaises(ValueError):
+            ht.spatial.pairwise_reduce(X, Y, reduction="topk", k=Y.shape[0] + 1)
+        with self.assertRaises(ValueError):
+            ht.spatial.pairwise_reduce(X, ht.ones((2, 4)))
+        with self.assertRaises(NotImplementedError):
+            ht.spatial.pairwise_reduce(ht.array(x_torch, split=1), Y)
+        with self.assertRaises(NotImplementedError):
+            ht.spatial.pairwise_reduce(ht.ones(4), Y)
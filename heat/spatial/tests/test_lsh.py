@@ -0,0 +1,83 @@
+import numpy as np
+import torch
+
+import heat as ht
+
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+class TestLSHIndex(TestCase):
+    def test_kneighbors(self):
+        ht.random.seed(1)
+        n = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(5)
+        x_torch = torch.tensor(rng.rand(n * 40 + 3, 3))
+        q_torch = torch.tensor(rng.rand(n * 10 + 1, 3))
+
+        for metric, p in [("euclidean", 2), ("manhattan", 1)]:
+            expected_d, expected_i = torch.cdist(q_torch, x_torch, p=p).topk(
+                4, dim=1, largest=False
+            )
+            for x_split in [None, 0]:
+                # a single bit probed in both directions covers all samples, the search is exact
+                index = ht.spatial.LSHIndex(
+                    4, n_tables=2, n_bits=1, n_probes=1, metric=metric, batch_size=7
+                )
+                self.assertIs(index.fit(ht.array(x_torch, split=x_split)), index)
+                self.assertEqual(index.n_samples_fit_, x_torch.shape[0])
+                for q_split in [None, 0]:
+                    Q = ht.array(q_torch, split=q_split)
+                    distances, indices = index.kneighbors(Q)
+                    self.assertEqual(distances.shape, (Q.shape[0], 4))
+                    self.assertEqual(distances.split, q_split)
+                    self.assertEqual(indices.split, q_split)
+                    self.assertEqual(indices.dtype, ht.int64)
+                    distances = ht.resplit(distances, None)._DNDarray__array
+                    indices = ht.resplit(indices, None)._DNDarray__array
+                    self.assertTrue(torch.allclose(distances, expected_d))
+                    self.assertTrue(torch.equal(indices, expected_i))
+
+        # approximate neighbours are sorted, unique and at least as far as the exact ones
+        X = ht.array(x_torch, split=0)
+        Q = ht.array(q_torch, split=0)
+        index = ht.spatial.LSHIndex(3, n_tables=4, n_bits=4, n_probes=2).fit(X)
+        distances, indices = index.kneighbors(Q)
+        distances = ht.resplit(distances, None)._DNDarray__array
+        indices = ht.resplit(indices, None)._DNDarray__array
+        expected_d = torch.cdist(q_torch, x_torch).topk(3, dim=1, largest=False)[0]
+        found = indices >= 0
+        self.assertTrue(found[:, 0].all())
+        self.assertTrue((distances[:, 1:] >= distances[:, :-1]).all())
+        self.assertTrue((distances[found] >= expected_d[found] - 1e-6).all())
+        exact = torch.cdist(q_torch, x_torch).gather(1, indices.clamp(min=0))
+        self.assertTrue(torch.allclose(distances[found], exact[found]))
+        for row in indices:
+            row = row[row >= 0]
+            self.assertEqual(row.unique().numel(), row.numel())
+
+        # the fitted samples are their own first neighbours
+        indices = ht.spatial.LSHIndex(1, n_bits=6).fit(X).kneighbors(X, return_distance=False)
+        self.assertTrue(ht.equal(indices, ht.arange(X.shape[0], split=0).expand_dims(1)))
+
+        index = ht.spatial.LSHIndex()
+        with self.assertRaises(RuntimeError):
+            index.kneighbors(X)
+        with self.assertRaises(TypeError):
+            index.fit(x_torch)
+        with self.assertRaises(NotImplementedError):
+            index.fit(ht.ones((5, 2), split=1))
+        with self.assertRaises(ValueError):
+            ht.spatial.LSHIndex(n_tables=0).fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.LSHIndex(n_bits=63).fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.LSHIndex(n_bits=2, n_probes=3).fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.LSHIndex(metric="cosine").fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.LSHIndex(batch_size=0).fit(X)
+        index.fit(X)
+        with self.assertRaises(ValueError):
+            index.kneighbors(ht.ones((2, 4)))
+        with self.assertRaises(ValueError):
+            index.kneighbors(X, n_neighbors=X.shape[0] + 1)
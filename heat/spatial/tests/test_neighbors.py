@@ -0,0 +1,71 @@
+import numpy as np
+import torch
+
+import heat as ht
+
+from heat.core.tests.test_suites.basic_test import TestCase
+
+
+class TestNearestNeighbors(TestCase):
+    def test_kneighbors(self):
+        n = ht.communication.MPI_WORLD.size
+        rng = np.random.RandomState(3)
+        x_torch = torch.tensor(rng.rand(n * 40 + 3, 3))
+        q_torch = torch.tensor(rng.rand(n * 10 + 1, 3))
+
+        for metric, p in [("euclidean", 2), ("manhattan", 1)]:
+            expected_d, expected_i = torch.cdist(q_torch, x_torch, p=p).topk(
+                4, dim=1, largest=False
+            )
+            for algorithm in ["kd_tree", "ball_tree", "brute"]:
+                for x_split in [None, 0]:
+                    nn = ht.spatial.NearestNeighbors(
+                        4, algorithm=algorithm, leaf_size=5, metric=metric, batch_size=7
+                    )
+                    self.assertIs(nn.fit(ht.array(x_torch, split=x_split)), nn)
+                    self.assertEqual(nn.n_samples_fit_, x_torch.shape[0])
+                    for q_split in [None, 0]:
+                        Q = ht.array(q_torch, split=q_split)
+                        distances, indices = nn.kneighbors(Q)
+                        self.assertEqual(distances.shape, (Q.shape[0], 4))
+                        self.assertEqual(distances.split, q_split)
+                        self.assertEqual(indices.dtype, ht.int64)
+                        distances = ht.resplit(distances, None)._DNDarray__array
+                        indices = ht.resplit(indices, None)._DNDarray__array
+                        self.assertTrue(torch.allclose(distances, expected_d))
+                        self.assertTrue(torch.equal(indices, expected_i))
+
+                        # neighbours outside of the radius are missing
+                        indices = nn.kneighbors(Q, 2, radius=0.2, return_distance=False)
+                        indices = ht.resplit(indices, None)._DNDarray__array
+                        inside = expected_d[:, :2] <= 0.2
+                        self.assertTrue(torch.equal(indices[inside], expected_i[:, :2][inside]))
+                        self.assertTrue((indices[~inside] == -1).all())
+
+        # the fitted samples are their own first neighbours
+        X = ht.array(x_torch, split=0)
+        indices = ht.spatial.NearestNeighbors(1).fit(X).kneighbors(X, return_distance=False)
+        self.assertTrue(ht.equal(indices, ht.arange(X.shape[0], split=0).expand_dims(1)))
+
+        nn = ht.spatial.NearestNeighbors()
+        with self.assertRaises(RuntimeError):
+            nn.kneighbors(X)
+        with self.assertRaises(TypeError):
+            nn.fit(x_torch)
+        with self.assertRaises(ValueError):
+            nn.fit(ht.ones(5))
+        with self.assertRaises(NotImplementedError):
+            nn.fit(ht.ones((5, 2), split=1))
+        with self.assertRaises(ValueError):
+            ht.spatial.NearestNeighbors(algorithm="cover_tree").fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.NearestNeighbors(metric="cosine").fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.NearestNeighbors(leaf_size=0).fit(X)
+        with self.assertRaises(ValueError):
+            ht.spatial.NearestNeighbors(batch_size=0).fit(X)
+        nn.fit(X)
+        with self.assertRaises(ValueError):
+            nn.kneighbors(ht.ones((2, 4)))
+        with self.assertRaises(ValueError):
+            nn.kneighbors(X, n_neighbors=X.shape[0] + 1)